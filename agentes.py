@@ -0,0 +1,321 @@
+# --- Agentes que Aprendem a Jogar o Dilema ---
+# Três regras de aprendizado, treinadas umas contra as outras em milhares de
+# partidas simultâneas (todas andam juntas, rodada a rodada, em arrays NumPy):
+#   QLearningAgent:      Q-learning tabular com exploração epsilon-greedy
+#   FictitiousPlayAgent: melhor resposta à frequência observada das ações do adversário
+#   RegretMatchingAgent: regret matching (Hart e Mas-Colell); a política é a estratégia média
+#
+# O estado de cada agente é o resultado da rodada anterior na sua perspectiva
+# (0 = primeira rodada; 1 + minha_ação * 2 + ação_do_adversário), e a
+# recompensa é menos os anos de prisão de regras.PAYOFF (a matriz de
+# Game.calculate_result). Por isso agent.policy() devolve uma tupla
+# (primeira, após CC, após CN, após NC, após NN) com a probabilidade de
+# confessar: o mesmo formato das estratégias de memória um de motor.py, que
+# pode ser registrada com motor.register_strategy(nome, *agent.policy()).
+#
+# Uma política treinada joga no Game como equipe automática (PolicyChooser).
+#
+# Uso: python agentes.py train --cap q --gar regret --save-cap cap.npz --save-gar gar.npz
+#      python agentes.py play --gar gar.npz
+
+import argparse
+import json
+import random
+
+import numpy as np
+
+from regras import ACTION_CODES, ACTIONS, CONFESSAR, NEGAR, PAYOFF
+
+N_STATES = 5  # Primeira rodada + 4 resultados da rodada anterior
+START = 0
+
+
+def reward_matrix(team):
+    """rewards[minha_ação, ação_do_adversário] = -anos de prisão da equipe ("cap" ou "gar")."""
+    years = np.array(PAYOFF, dtype=np.float64)
+    if team == "cap":
+        return -years[:, :, 0]
+    if team == "gar":
+        return -years[:, :, 1].T
+    raise ValueError(f"Equipe desconhecida: {team!r}")
+
+
+def next_state(mine, theirs):
+    return 1 + mine * 2 + theirs
+
+
+class Agent:
+    """Base: sorteio das ações a partir de P(confessar) por estado e salvamento."""
+
+    KIND = None
+    TABLES = ()
+
+    def __init__(self, team="cap"):
+        self.team = team
+        self.rewards = reward_matrix(team)
+
+    def probabilities(self, states):
+        """P(confessar) em cada estado do lote (durante o treino)."""
+        raise NotImplementedError
+
+    def act(self, states, rng):
+        confess = rng.random(len(states)) < self.probabilities(states)
+        return np.where(confess, CONFESSAR, NEGAR).astype(np.intp)
+
+    def learn(self, states, actions, opponent_actions, rewards, next_states, done):
+        raise NotImplementedError
+
+    def end_episode(self):
+        pass
+
+    def policy(self):
+        """Política aprendida: P(confessar) nos 5 estados, no formato de motor.STRATEGIES."""
+        return tuple(float(p) for p in self.probabilities(np.arange(N_STATES)))
+
+    def params(self):
+        return {}
+
+    def _best_response(self, opponent_confess):
+        """P(confessar) da melhor resposta a um adversário que confessa com essa probabilidade."""
+        expected = (self.rewards[:, CONFESSAR][:, None] * opponent_confess
+                    + self.rewards[:, NEGAR][:, None] * (1.0 - opponent_confess))
+        return np.where(expected[CONFESSAR] > expected[NEGAR], 1.0,
+                        np.where(expected[CONFESSAR] < expected[NEGAR], 0.0, 0.5))
+
+
+class QLearningAgent(Agent):
+    """Q-learning tabular. As atualizações de todas as partidas do lote são
+    agrupadas por (estado, ação) e aplicadas pela média."""
+
+    KIND = "q"
+    TABLES = ("q",)
+
+    def __init__(self, team="cap", alpha=0.1, gamma=0.9, epsilon=0.2, epsilon_decay=0.995, min_epsilon=0.01):
+        super().__init__(team)
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.epsilon_decay = epsilon_decay
+        self.min_epsilon = min_epsilon
+        self.q = np.zeros((N_STATES, 2))
+
+    def _greedy(self, states):
+        q = self.q[states]
+        return np.where(q[:, CONFESSAR] > q[:, NEGAR], 1.0, np.where(q[:, CONFESSAR] < q[:, NEGAR], 0.0, 0.5))
+
+    def probabilities(self, states):
+        return self.epsilon / 2 + (1.0 - self.epsilon) * self._greedy(states)
+
+    def policy(self):
+        return tuple(float(p) for p in self._greedy(np.arange(N_STATES)))
+
+    def learn(self, states, actions, opponent_actions, rewards, next_states, done):
+        future = 0.0 if done else self.gamma * self.q[next_states].max(axis=1)
+        errors = rewards + future - self.q[states, actions]
+        index = states * 2 + actions
+        sums = np.bincount(index, errors, minlength=N_STATES * 2)
+        counts = np.bincount(index, minlength=N_STATES * 2)
+        self.q += self.alpha * (sums / np.maximum(counts, 1)).reshape(N_STATES, 2)
+
+    def end_episode(self):
+        self.epsilon = max(self.min_epsilon, self.epsilon * self.epsilon_decay)
+
+    def params(self):
+        return {"alpha": self.alpha, "gamma": self.gamma, "epsilon": self.epsilon,
+                "epsilon_decay": self.epsilon_decay, "min_epsilon": self.min_epsilon}
+
+
+class FictitiousPlayAgent(Agent):
+    """Fictitious play por estado: conta as ações do adversário após cada
+    resultado e joga a melhor resposta à frequência observada."""
+
+    KIND = "fictitious"
+    TABLES = ("counts",)
+
+    def __init__(self, team="cap", prior=1.0):
+        super().__init__(team)
+        self.prior = prior
+        self.counts = np.full((N_STATES, 2), prior)
+
+    def probabilities(self, states):
+        counts = self.counts[states]
+        return self._best_response(counts[:, CONFESSAR] / counts.sum(axis=1))
+
+    def learn(self, states, actions, opponent_actions, rewards, next_states, done):
+        self.counts += np.bincount(states * 2 + opponent_actions, minlength=N_STATES * 2).reshape(N_STATES, 2)
+
+    def params(self):
+        return {"prior": self.prior}
+
+
+class RegretMatchingAgent(Agent):
+    """Regret matching por estado: joga cada ação com probabilidade proporcional
+    ao arrependimento positivo acumulado; a política final é a estratégia média."""
+
+    KIND = "regret"
+    TABLES = ("regrets", "strategy_sum")
+
+    def __init__(self, team="cap"):
+        super().__init__(team)
+        self.regrets = np.zeros((N_STATES, 2))
+        self.strategy_sum = np.zeros((N_STATES, 2))
+
+    def _current(self, states):
+        positive = np.maximum(self.regrets[states], 0.0)
+        total = positive.sum(axis=1)
+        return np.where(total > 0, positive[:, CONFESSAR] / np.where(total > 0, total, 1.0), 0.5)
+
+    def probabilities(self, states):
+        return self._current(states)
+
+    def policy(self):
+        total = self.strategy_sum.sum(axis=1)
+        average = np.where(total > 0, self.strategy_sum[:, CONFESSAR] / np.where(total > 0, total, 1.0), 0.5)
+        return tuple(float(p) for p in average)
+
+    def learn(self, states, actions, opponent_actions, rewards, next_states, done):
+        # A estratégia média soma a estratégia com que as ações foram jogadas,
+        # antes de os arrependimentos desta rodada a alterarem
+        confess = self._current(states)
+        self.strategy_sum[:, CONFESSAR] += np.bincount(states, confess, minlength=N_STATES)
+        self.strategy_sum[:, NEGAR] += np.bincount(states, 1.0 - confess, minlength=N_STATES)
+        alternatives = self.rewards[:, opponent_actions].T  # (lote, minhas ações)
+        regrets = alternatives - rewards[:, None]
+        for action in (CONFESSAR, NEGAR):
+            self.regrets[:, action] += np.bincount(states, regrets[:, action], minlength=N_STATES)
+
+
+AGENTS = {cls.KIND: cls for cls in (QLearningAgent, FictitiousPlayAgent, RegretMatchingAgent)}
+
+
+def make_agent(kind, team="cap", **params):
+    try:
+        return AGENTS[kind](team, **params)
+    except KeyError:
+        raise ValueError(f"Agente desconhecido: {kind!r} (use um de {sorted(AGENTS)})") from None
+
+
+# --- Treino em lote ---
+def train(cap_agent, gar_agent, episodes=500, n_envs=4096, max_rounds=20, rng=None):
+    """Treina os dois agentes um contra o outro em n_envs partidas simultâneas.
+
+    Cada episódio é uma partida de max_rounds rodadas em todas as partidas do
+    lote. Retorna um array (episódios, 2) com os anos médios por partida de
+    Caprichoso e Garantido em cada episódio.
+    """
+    rng = np.random.default_rng(rng)
+    history = np.empty((episodes, 2))
+    for episode in range(episodes):
+        cap_states = np.full(n_envs, START, dtype=np.intp)
+        gar_states = np.full(n_envs, START, dtype=np.intp)
+        cap_total = gar_total = 0.0
+        for round_number in range(max_rounds):
+            cap_actions = cap_agent.act(cap_states, rng)
+            gar_actions = gar_agent.act(gar_states, rng)
+            cap_rewards = cap_agent.rewards[cap_actions, gar_actions]
+            gar_rewards = gar_agent.rewards[gar_actions, cap_actions]
+            cap_next = next_state(cap_actions, gar_actions)
+            gar_next = next_state(gar_actions, cap_actions)
+            done = round_number == max_rounds - 1
+            cap_agent.learn(cap_states, cap_actions, gar_actions, cap_rewards, cap_next, done)
+            gar_agent.learn(gar_states, gar_actions, cap_actions, gar_rewards, gar_next, done)
+            cap_total += cap_rewards.sum()
+            gar_total += gar_rewards.sum()
+            cap_states, gar_states = cap_next, gar_next
+        cap_agent.end_episode()
+        gar_agent.end_episode()
+        history[episode] = (-cap_total / n_envs, -gar_total / n_envs)
+    return history
+
+
+# --- Salvar e carregar ---
+def save_agent(agent, path):
+    """Grava o agente num arquivo .npz (tipo, equipe, parâmetros e tabelas)."""
+    tables = {name: getattr(agent, name) for name in agent.TABLES}
+    np.savez(path, kind=agent.KIND, team=agent.team, params=json.dumps(agent.params()), **tables)
+
+
+def load_agent(path):
+    with np.load(path) as data:
+        agent = make_agent(str(data["kind"]), str(data["team"]), **json.loads(str(data["params"])))
+        for name in agent.TABLES:
+            setattr(agent, name, data[name].copy())
+    return agent
+
+
+# --- Equipe automática no Game ---
+class PolicyChooser:
+    """Escolhe por uma equipe no Game a partir de uma política de memória um.
+
+    Uso: Game(choosers={"gar": PolicyChooser(agent.policy())}).
+    """
+
+    def __init__(self, policy, seed=None):
+        if len(policy) != N_STATES:
+            raise ValueError(f"A política precisa de {N_STATES} probabilidades")
+        self.policy = tuple(policy)
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def from_file(cls, path, seed=None):
+        return cls(load_agent(path).policy(), seed)
+
+    def __call__(self, game, team):
+        state = START
+        if len(game.history):
+            last = game.history[-1]
+            mine, theirs = (last["cap_choice"], last["gar_choice"]) if team == "cap" else \
+                (last["gar_choice"], last["cap_choice"])
+            state = next_state(ACTION_CODES[mine], ACTION_CODES[theirs])
+        return ACTIONS[CONFESSAR] if self.rng.random() < self.policy[state] else ACTIONS[NEGAR]
+
+
+def format_policy(policy):
+    labels = ("1ª rodada", "após CC", "após CN", "após NC", "após NN")
+    return "  ".join(f"{label}: {p:.2f}" for label, p in zip(labels, policy))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Agentes que aprendem a jogar o dilema.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="treina dois agentes um contra o outro")
+    train_parser.add_argument("--cap", choices=sorted(AGENTS), default="q")
+    train_parser.add_argument("--gar", choices=sorted(AGENTS), default="q")
+    train_parser.add_argument("--episodes", type=int, default=500)
+    train_parser.add_argument("--envs", type=int, default=4096, help="partidas simultâneas")
+    train_parser.add_argument("--rounds", type=int, default=20, help="rodadas por partida")
+    train_parser.add_argument("--seed", type=int, default=None)
+    train_parser.add_argument("--save-cap", default=None, help="arquivo .npz do agente de Caprichoso")
+    train_parser.add_argument("--save-gar", default=None, help="arquivo .npz do agente de Garantido")
+
+    play_parser = commands.add_parser("play", help="abre o jogo com uma ou duas equipes automáticas")
+    play_parser.add_argument("--cap", default=None, help="agente (.npz) que joga por Caprichoso")
+    play_parser.add_argument("--gar", default=None, help="agente (.npz) que joga por Garantido")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        cap_agent = make_agent(args.cap, "cap")
+        gar_agent = make_agent(args.gar, "gar")
+        history = train(cap_agent, gar_agent, args.episodes, args.envs, args.rounds, args.seed)
+        last = history[-max(1, len(history) // 10):].mean(axis=0)
+        print(f"Anos médios por partida (últimos episódios): Caprichoso {last[0]:.2f}, Garantido {last[1]:.2f}")
+        print(f"Caprichoso ({args.cap}): {format_policy(cap_agent.policy())}")
+        print(f"Garantido ({args.gar}): {format_policy(gar_agent.policy())}")
+        if args.save_cap:
+            save_agent(cap_agent, args.save_cap)
+        if args.save_gar:
+            save_agent(gar_agent, args.save_gar)
+        return
+
+    from dilema import Game
+    choosers = {}
+    if args.cap:
+        choosers["cap"] = PolicyChooser.from_file(args.cap)
+    if args.gar:
+        choosers["gar"] = PolicyChooser.from_file(args.gar)
+    Game(choosers=choosers).run()
+
+
+if __name__ == "__main__":
+    main()
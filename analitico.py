@@ -0,0 +1,172 @@
+# --- Solução Exata para Estratégias de Memória n ---
+# Duas estratégias de memória n formam uma cadeia de Markov cujo estado são os
+# últimos resultados conjuntos. A pena esperada (com a matriz de
+# Game.calculate_result) sai então de contas com matrizes pequenas, sem jogar
+# rodada por rodada, e o resultado fica em cache por parâmetros das estratégias.
+#
+# Formato de uma estratégia de memória n: tupla com as probabilidades de
+# confessar para cada histórico possível, nível por nível:
+#   nível 0: 1 valor (primeira rodada)
+#   nível 1: 4 valores, indexados pelo resultado da rodada anterior
+#   ...
+#   nível n: 4**n valores, indexados pelos últimos n resultados
+# O resultado de uma rodada, na perspectiva de quem joga, é
+# minha_ação * 2 + ação_do_adversário (CONFESSAR = 0, NEGAR = 1), e num
+# histórico o resultado mais antigo é o dígito mais significativo (base 4).
+# As tuplas de memória um de motor.STRATEGIES (5 valores) já seguem esse formato.
+
+import itertools
+from functools import lru_cache
+
+import numpy as np
+
+from motor import JOINT_PAYOFF_CAP, JOINT_PAYOFF_GAR, resolve_strategy
+
+# Resultado conjunto visto pelo outro jogador: (cap, gar) -> (gar, cap)
+SWAP = (0, 2, 1, 3)
+
+
+def memory_length(strategy):
+    """Memória n de uma estratégia a partir do tamanho da tupla (1, 5, 21, 85, ...)."""
+    size, n = 1, 0
+    while size < len(strategy):
+        n += 1
+        size += 4 ** n
+    if size != len(strategy):
+        raise ValueError(f"Tamanho inválido para estratégia de memória n: {len(strategy)}")
+    return n
+
+
+def _level_offset(level):
+    """Posição do primeiro valor de um nível dentro da tupla."""
+    return sum(4 ** k for k in range(level))
+
+
+def _confess_prob(strategy, n, history, swap=False):
+    """Probabilidade de confessar dado o histórico (lista de resultados conjuntos)."""
+    level = min(len(history), n)
+    index = 0
+    for outcome in history[len(history) - level:]:
+        index = index * 4 + (SWAP[outcome] if swap else outcome)
+    return strategy[_level_offset(level) + index]
+
+
+def _outcome_probs(cap, n_cap, gar, n_gar, history):
+    """Probabilidades dos 4 resultados conjuntos da próxima rodada."""
+    p_cap = _confess_prob(cap, n_cap, history)
+    p_gar = _confess_prob(gar, n_gar, history, swap=True)
+    return (p_cap * p_gar, p_cap * (1 - p_gar), (1 - p_cap) * p_gar, (1 - p_cap) * (1 - p_gar))
+
+
+def _power_sum(matrix, steps):
+    """I + M + M² + ... + M^(steps-1), por duplicação (O(log steps) produtos)."""
+    size = matrix.shape[0]
+    total = np.zeros((size, size))
+    power = np.eye(size)          # M^(termos já somados)
+    block_sum = np.eye(size)      # I + M + ... + M^(2^k - 1)
+    block_power = matrix.copy()   # M^(2^k)
+    while steps:
+        if steps & 1:
+            total += power @ block_sum
+            power = power @ block_power
+        steps >>= 1
+        if steps:
+            block_sum = block_sum + block_sum @ block_power
+            block_power = block_power @ block_power
+    return total
+
+
+def _chain(cap, gar):
+    """Monta a cadeia do par: aberturas, matriz de transição e penas esperadas por estado."""
+    n_cap, n_gar = memory_length(cap), memory_length(gar)
+    memory = max(n_cap, n_gar, 1)
+    payoffs = np.stack([JOINT_PAYOFF_CAP, JOINT_PAYOFF_GAR], axis=1).astype(np.float64)
+
+    # Fase de abertura: rodadas 0 .. memory-1, históricos ainda curtos
+    opening = []  # por rodada: (distribuição sobre históricos, penas esperadas da rodada)
+    distribution = np.ones(1)
+    for length in range(memory):
+        histories = list(itertools.product(range(4), repeat=length))
+        probs = np.array([_outcome_probs(cap, n_cap, gar, n_gar, h) for h in histories])
+        opening.append(distribution @ probs @ payoffs)
+        # Histórico de tamanho length+1: índice = histórico * 4 + novo resultado
+        distribution = (distribution[:, None] * probs).ravel()
+
+    # Regime: estado = últimos `memory` resultados
+    states = list(itertools.product(range(4), repeat=memory))
+    probs = np.array([_outcome_probs(cap, n_cap, gar, n_gar, h) for h in states])
+    transition = np.zeros((len(states), len(states)))
+    for s in range(len(states)):
+        shifted = (s * 4) % len(states)
+        transition[s, shifted:shifted + 4] = probs[s]
+    return opening, distribution, transition, probs @ payoffs
+
+
+@lru_cache(maxsize=65536)
+def _expected_years(cap, gar, max_rounds):
+    opening, distribution, transition, round_payoffs = _chain(cap, gar)
+    total = np.zeros(2)
+    for payoff in opening[:max_rounds]:
+        total += payoff
+    remaining = max_rounds - len(opening)
+    if remaining > 0:
+        total += distribution @ _power_sum(transition, remaining) @ round_payoffs
+    return float(total[0]), float(total[1])
+
+
+@lru_cache(maxsize=65536)
+def _long_run_years(cap, gar):
+    _, distribution, transition, round_payoffs = _chain(cap, gar)
+    size = transition.shape[0]
+    # Distribuição estacionária única: resolve π(M - I) = 0 com Σπ = 1
+    system = np.vstack([(transition - np.eye(size)).T, np.ones(size)])
+    if np.linalg.matrix_rank(system[:-1]) == size - 1:
+        target = np.zeros(size + 1)
+        target[-1] = 1.0
+        stationary = np.linalg.lstsq(system, target, rcond=None)[0]
+    else:
+        # Cadeia redutível: o limite depende do início; usa a média de Cesàro
+        steps = 2 ** 40
+        stationary = distribution @ _power_sum(transition, steps) / steps
+    cap_years, gar_years = stationary @ round_payoffs
+    return float(cap_years), float(gar_years)
+
+
+def _as_tuple(strategy):
+    return tuple(float(p) for p in resolve_strategy(strategy))
+
+
+def expected_years(cap_strategy, gar_strategy, max_rounds=20):
+    """Penas totais esperadas (cap, gar) numa partida de max_rounds rodadas. Exato."""
+    return _expected_years(_as_tuple(cap_strategy), _as_tuple(gar_strategy), max_rounds)
+
+
+def long_run_years(cap_strategy, gar_strategy):
+    """Penas médias por rodada (cap, gar) no longo prazo (partida infinita)."""
+    return _long_run_years(_as_tuple(cap_strategy), _as_tuple(gar_strategy))
+
+
+def expected_matrix(strategies, max_rounds=20):
+    """years[i, j] = pena total esperada da estratégia i jogando contra j."""
+    years = np.empty((len(strategies), len(strategies)))
+    for i, cap in enumerate(strategies):
+        for j, gar in enumerate(strategies):
+            years[i, j] = expected_years(cap, gar, max_rounds)[0]
+    return years
+
+
+def cache_info():
+    """Estatísticas dos caches (acertos, faltas, tamanho)."""
+    return {"expected": _expected_years.cache_info(), "long_run": _long_run_years.cache_info()}
+
+
+def memory_two(first, after_one, after_two):
+    """Monta uma estratégia de memória dois.
+
+    after_one: 4 probabilidades indexadas pelo resultado da 1ª rodada.
+    after_two: 16 probabilidades indexadas por (penúltimo * 4 + último).
+    """
+    strategy = (first,) + tuple(after_one) + tuple(after_two)
+    if len(strategy) != 21:
+        raise ValueError("Memória dois precisa de 1 + 4 + 16 probabilidades")
+    return tuple(float(p) for p in strategy)
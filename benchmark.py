@@ -0,0 +1,276 @@
+# --- Benchmarks com Linha de Base ---
+# Mede os caminhos quentes do jogo e grava os resultados em JSON, para
+# comparar antes e depois de uma otimização:
+#   calculate_result       rodadas por segundo pela lógica de Game.calculate_result
+#   tournament.scripted    torneios de 20 rodadas por segundo (relógio virtual)
+#   tournament.engine      rodadas por segundo do motor vetorizado (motor.play_batch)
+#   render.<estado>.full       tempo de quadro desenhando a tela inteira (_draw_*_screen)
+#   render.<estado>.retained   tempo de quadro com a camada estática em cache (Game.render)
+#   history.append             rodadas por segundo gravadas no histórico (RoundHistory.append)
+#   history.bytes_per_million  memória alocada pelo histórico por 10^6 rodadas (tracemalloc)
+#
+# As telas são desenhadas fora da tela (driver "dummy" do SDL). Cada medida
+# de tempo é o melhor de várias repetições.
+#
+# Uso: python benchmark.py run --output base.json
+#      python benchmark.py compare base.json --threshold 0.1
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import dilema
+from dilema import STATE_NAMES, Game, GameState
+from historico import RoundHistory
+from relogio import ScriptedDriver, VirtualClock, tournament_script
+
+
+def _best_time(function, repeat):
+    """Menor tempo (s) entre `repeat` execuções de function()."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _result(value, unit, better):
+    return {"value": value, "unit": unit, "better": better}
+
+
+# --- Lógica ---
+def bench_calculate_result(scale, repeat):
+    rounds = 100000 * scale
+    game = Game(clock=VirtualClock())
+    game.cap_representative = "Ana"
+    game.gar_representative = "Bia"
+    choices = [("Confessar", "Negar"), ("Negar", "Negar"), ("Confessar", "Confessar"), ("Negar", "Confessar")]
+
+    def run():
+        game.history.clear()
+        for i in range(rounds):
+            game.cap_choice, game.gar_choice = choices[i & 3]
+            game.calculate_result()
+
+    return {"calculate_result": _result(rounds / _best_time(run, repeat), "rodadas/s", "higher")}
+
+
+def bench_tournaments(scale, repeat):
+    script = tournament_script(rounds=20, seed=0)
+    count = 200 * scale
+
+    def scripted():
+        for _ in range(count):
+            ScriptedDriver(Game(clock=VirtualClock())).play(script)
+
+    import motor
+    matches = 10000 * scale
+
+    def engine():
+        motor.play_batch("Olho por Olho", "Aleatório", 20, matches, rng=0)
+
+    return {
+        "tournament.scripted": _result(count / _best_time(scripted, repeat), "torneios/s", "higher"),
+        "tournament.engine": _result(20 * matches / _best_time(engine, repeat), "rodadas/s", "higher"),
+    }
+
+
+# --- Renderização ---
+def _game_in_state(state):
+    """Um Game com dados realistas no estado pedido (montado por roteiro)."""
+    clock = VirtualClock()
+    game = Game(clock=clock)
+    driver = ScriptedDriver(game, clock)
+    if state == GameState.FINAL_RESULT:
+        driver.play(tournament_script(rounds=game.max_rounds, seed=0))
+        return game
+    driver.play(tournament_script(rounds=5, seed=0))  # Algumas rodadas no histórico
+    if state == GameState.REPRESENTATIVE:
+        return game
+    driver.play([("start", "Ana", "Bia"), ("wait", game.round_time / 3)])
+    if state == GameState.RESULT:
+        driver.play([("choose", "cap", "Negar"), ("choose", "gar", "Confessar")])
+    return game
+
+
+def _draw_screen(game, elapsed):
+    if game.current_state == GameState.REPRESENTATIVE:
+        game._draw_representative_screen()
+    elif game.current_state == GameState.FINAL_RESULT:
+        game._draw_final_result_screen()
+    else:
+        game._draw_main_game_screen(elapsed)
+
+
+def bench_render(scale, repeat):
+    dilema.init_display(headless=True)
+    frames = 50 * scale
+    results = {}
+    for state, name in STATE_NAMES.items():
+        game = _game_in_state(state)
+        game.init_display(headless=True)
+        elapsed = game.elapsed()
+        step = game.round_time / 360  # Um grau do arco por quadro na fase de escolha
+
+        def full():
+            for frame in range(frames):
+                _draw_screen(game, elapsed + frame * step)
+
+        def retained():
+            game._layer.invalidate()
+            for frame in range(frames):
+                game.render(elapsed + frame * step)
+
+        results[f"render.{name}.full"] = _result(_best_time(full, repeat) / frames * 1000, "ms/quadro", "lower")
+        results[f"render.{name}.retained"] = _result(_best_time(retained, repeat) / frames * 1000,
+                                                     "ms/quadro", "lower")
+    return results
+
+
+# --- Memória ---
+def bench_history_memory(scale, repeat):
+    rounds = 200000 * scale
+    names = [f"Representante {i}" for i in range(40)]
+    filled = []
+
+    def fill():
+        history = RoundHistory()
+        for i in range(rounds):
+            history.append(i % 20 + 1, names[i % 40], names[(i + 7) % 40], i & 1, (i >> 1) & 1,
+                           3, 3, i, i)
+        filled[:] = [history]
+
+    elapsed = _best_time(fill, repeat)
+    # Memória medida numa execução à parte (o tracemalloc deixa o append bem mais lento):
+    # inclui a sobra de capacidade dos arrays, a tabela de nomes e o dicionário de ids
+    filled.clear()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        fill()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    per_million = allocated * 1000000 // rounds
+    return {
+        "history.append": _result(rounds / elapsed, "rodadas/s", "higher"),
+        "history.bytes_per_million": _result(per_million, "bytes", "lower"),
+    }
+
+
+BENCHMARKS = {
+    "logic": bench_calculate_result,
+    "tournament": bench_tournaments,
+    "render": bench_render,
+    "memory": bench_history_memory,
+}
+
+
+def run(groups=None, scale=1, repeat=5):
+    """Executa os grupos de benchmarks e retorna o documento JSON (dicionário)."""
+    results = {}
+    for group in groups or BENCHMARKS:
+        for name, result in BENCHMARKS[group](scale, repeat).items():
+            result["group"] = group
+            results[name] = result
+    meta = {
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": repeat,
+    }
+    try:
+        import numpy  # Só o grupo "tournament" (motor.py) precisa do NumPy
+        meta["numpy"] = numpy.__version__
+    except ImportError:
+        pass
+    if dilema.pygame is not None:
+        meta["pygame"] = dilema.pygame.version.ver
+    return {"meta": meta, "results": results}
+
+
+def compare(baseline, current, threshold=0.1):
+    """Compara dois documentos.
+
+    Retorna (linhas, ausentes, novas): linhas são (nome, base, atual,
+    variação, regressão) das medidas presentes nos dois; ausentes são as
+    medidas da linha de base que faltam no atual, e novas, as que só o atual tem.
+    """
+    rows = []
+    missing = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            missing.append(name)
+            continue
+        change = (now["value"] - base["value"]) / base["value"] if base["value"] else 0.0
+        worse = -change if base["better"] == "higher" else change
+        rows.append((name, base, now, change, worse > threshold))
+    added = [name for name in current["results"] if name not in baseline["results"]]
+    return rows, missing, added
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do dilema com linhas de base em JSON.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="executa os benchmarks")
+    run_parser.add_argument("--output", default=None, help="grava o resultado neste arquivo JSON")
+    run_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None)
+    run_parser.add_argument("--scale", type=int, default=1, help="multiplica o tamanho de cada medida")
+    run_parser.add_argument("--repeat", type=int, default=5)
+
+    compare_parser = commands.add_parser("compare", help="compara com uma linha de base")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current", nargs="?", default=None,
+                                help="resultado a comparar (padrão: executa os benchmarks agora)")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="piora relativa considerada regressão (padrão: 0.1 = 10%%)")
+    compare_parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        document = run(args.only, args.scale, args.repeat)
+        text = json.dumps(document, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as handle:
+                handle.write(text + "\n")
+        for name, result in document["results"].items():
+            print(f"{name:<32} {result['value']:>14.4g} {result['unit']}")
+        return 0
+
+    baseline = _load(args.baseline)
+    if args.current is not None:
+        current = _load(args.current)
+    else:
+        groups = sorted({result["group"] for result in baseline["results"].values()})
+        current = run(groups, baseline["meta"].get("scale", 1), args.repeat)
+    rows, missing, added = compare(baseline, current, args.threshold)
+    regressions = 0
+    for name, base, now, change, regression in rows:
+        flag = "REGRESSÃO" if regression else ""
+        print(f"{name:<32} {base['value']:>12.4g} -> {now['value']:>12.4g} {base['unit']:<10} {change:+7.1%} {flag}")
+        regressions += regression
+    for name in missing:
+        print(f"{name:<32} AUSENTE (está na linha de base, mas não foi medido)")
+    for name in added:
+        print(f"{name:<32} NOVO (sem linha de base)")
+    if regressions:
+        print(f"{regressions} regressões acima de {args.threshold:.0%}")
+    if missing:
+        print(f"{len(missing)} medidas ausentes")
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,25 @@
-import pygame
+import os
 import sys
 import time
 import math
+from collections import OrderedDict
+from functools import lru_cache
+
+from historico import RoundHistory
+from instrumentacao import Profiler
+from relogio import MonotonicClock
+from regras import ACTIONS, PAYOFF, RESULT_TEXT, RESULT_COLOR_KEY, DEFAULT_CHOICE, choice_code, winner
 
 # --- Configurações Iniciais ---
-# Inicialização do Pygame
-pygame.init()
+# O Pygame só é importado e inicializado em init_display(), chamado por
+# Game.run(). Assim, importar Game ou a lógica de pontuação é instantâneo e
+# não precisa de tela.
+pygame = None
+SCREEN = None
 
 # Dimensões da tela
 WIDTH, HEIGHT = 900, 800
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Dilema do Prisioneiro - Torneio Caprichoso vs Garantido")
+CAPTION = "Dilema do Prisioneiro - Torneio Caprichoso vs Garantido"
 
 # Cores
 COLORS = {
@@ -31,19 +40,199 @@ COLORS = {
     "SCOREBOARD_BG": (230, 230, 240),
 }
 
-# Fontes
-FONTS = {
-    "title": pygame.font.SysFont("Arial", 40, bold=True),
-    "header": pygame.font.SysFont("Arial", 32, bold=True),
-    "option": pygame.font.SysFont("Arial", 28),
-    "result": pygame.font.SysFont("Arial", 34, bold=True),
-    "small": pygame.font.SysFont("Arial", 22),
-    "score": pygame.font.SysFont("Arial", 36, bold=True),
-    "timer": pygame.font.SysFont("Arial", 48, bold=True),
-    "rep": pygame.font.SysFont("Arial", 24),
-    "input": pygame.font.SysFont("Arial", 30),
+# Posição e tamanho do temporizador circular
+TIMER_CENTER = (WIDTH // 2, 180)
+TIMER_RADIUS = 40
+TIMER_RECT = (TIMER_CENTER[0] - TIMER_RADIUS, TIMER_CENTER[1] - TIMER_RADIUS,
+              2 * TIMER_RADIUS + 1, 2 * TIMER_RADIUS + 1)
+
+# Limite de quadros por segundo e espera máxima (ms) por eventos quando a tela
+# só muda com entrada do usuário (representantes, resultado, resultado final)
+FPS = 60
+IDLE_TIMEOUT_MS = 1000
+
+# Fontes: nome -> (tamanho, negrito). Os objetos são criados em init_display().
+FONT_SPECS = {
+    "title": (40, True),
+    "header": (32, True),
+    "option": (28, False),
+    "result": (34, True),
+    "small": (22, False),
+    "score": (36, True),
+    "timer": (48, True),
+    "rep": (24, False),
+    "input": (30, False),
+    "tile": (14, True),
+}
+FONTS = {}
+
+# Retângulos (x, y, largura, altura) dos botões e caixas de input
+BUTTON_LAYOUT = {
+    "cap_confess": (100, 500, 200, 70),
+    "cap_negar": (100, 600, 200, 70),
+    "gar_confess": (600, 500, 200, 70),
+    "gar_negar": (600, 600, 200, 70),
+    "next": (350, 700, 200, 50),
+    "start": (350, 500, 200, 50),
+    "cap_input_box": (150, 340, 300, 50),
+    "gar_input_box": (450, 340, 300, 50),
 }
 
+
+def init_display(headless=False):
+    """Importa e inicializa o Pygame, criando a tela e as fontes.
+
+    Com headless=True (ou DILEMA_HEADLESS=1 no ambiente) usa o driver de vídeo
+    "dummy" do SDL, permitindo desenhar em memória sem monitor.
+    Chamadas repetidas reaproveitam a tela já criada.
+    """
+    global pygame, SCREEN
+    if SCREEN is not None:
+        return SCREEN
+
+    if headless or os.environ.get("DILEMA_HEADLESS") == "1":
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+    import pygame
+    pygame.init()
+    SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
+    for name, (size, bold) in FONT_SPECS.items():
+        FONTS[name] = pygame.font.SysFont("Arial", size, bold=bold)
+    return SCREEN
+
+# --- Cache de Textos Renderizados ---
+class TextCache:
+    """Cache LRU de superfícies de texto, chaveado por (fonte, texto, cor).
+
+    Rótulos fixos são rasterizados uma única vez; textos dinâmicos (placar,
+    dígito do timer) só são renderizados de novo quando o valor muda.
+    As superfícies devolvidas são compartilhadas: apenas faça blit delas.
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font_name, text, color):
+        key = (font_name, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = FONTS[font_name].render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)  # Descarta o menos usado recentemente
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font_name, text, color):
+    """Renderiza (ou reaproveita do cache) um texto com antialiasing."""
+    return TEXT_CACHE.render(font_name, text, color)
+
+# --- Geometria do Timer ---
+# Círculo unitário com um ponto por grau (0 a 360), começando no topo e
+# girando no sentido horário. Calculado uma única vez na importação.
+UNIT_ARC = tuple(
+    (math.cos(math.radians(degree) - math.pi / 2), math.sin(math.radians(degree) - math.pi / 2))
+    for degree in range(361)
+)
+
+
+@lru_cache(maxsize=1024)
+def arc_points(center, radius):
+    """Pontos do contorno (um por grau) para um centro e raio dados.
+
+    O resultado é guardado em cache: cada quadro só precisa recortar os
+    primeiros graus, sem chamar cos/sin.
+    """
+    center_x, center_y = center
+    return tuple((center_x + radius * cos, center_y + radius * sin) for cos, sin in UNIT_ARC)
+
+
+def draw_timer_dial(surface, center, radius, progress, time_left, font_name="timer"):
+    """Desenha um temporizador circular com o arco de progresso e o dígito restante."""
+    pygame.draw.circle(surface, COLORS["TIMER_BG"], center, radius)
+
+    if progress < 1:
+        # Setor de 0 até o grau atual: um recorte dos pontos pré-calculados
+        points = (center,) + arc_points(center, radius)[:int(360 * progress) + 1]
+        if len(points) > 2:
+            pygame.draw.polygon(surface, COLORS["TIMER_PROGRESS"], points)
+
+    pygame.draw.circle(surface, COLORS["TIMER_BORDER"], center, radius, 3)
+
+    timer_text = render_text(font_name, f"{int(time_left)}", COLORS["TIMER_BORDER"])
+    surface.blit(timer_text, (center[0] - timer_text.get_width() // 2,
+                              center[1] - timer_text.get_height() // 2))
+
+
+# --- Renderização Retida (retângulos sujos) ---
+class RetainedLayer:
+    """Guarda a camada estática da tela e a assinatura de cada widget.
+
+    Quando a chave da tela muda, tudo é redesenhado e a camada estática é
+    copiada. Nos demais quadros, só os widgets cuja assinatura mudou são
+    redesenhados sobre o fundo guardado.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.background = None
+        self.signatures = {}
+
+    def invalidate(self):
+        """Força o redesenho completo no próximo quadro."""
+        self.key = None
+
+    def update(self, key, draw_static, widgets):
+        """Retorna None se redesenhou a tela toda, ou a lista de retângulos sujos."""
+        full = key != self.key
+        if full:
+            self.key = key
+            self.signatures.clear()
+            draw_static()
+            self.background = SCREEN.copy()
+
+        dirty = []
+        for name, rect, signature, draw in widgets:
+            if not full and self.signatures.get(name) == signature:
+                continue
+            self.signatures[name] = signature
+            if not full:
+                SCREEN.blit(self.background, rect, rect)  # Apaga o desenho anterior
+            draw()
+            dirty.append(rect)
+        return None if full else dirty
+
+def history_line(entry):
+    """Formato de linha para cada entrada do histórico."""
+    return (
+        f"Rodada {entry['round']}: "
+        f"Cap: {entry['cap_rep']} ({entry['cap_choice']}) | "
+        f"Gar: {entry['gar_rep']} ({entry['gar_choice']}) | "
+        f"Pena: {entry['cap_penalty']}/{entry['gar_penalty']}"
+    )
+
 # --- Estados do Jogo (Enum) ---
 class GameState:
     REPRESENTATIVE = 0  # Coletar nomes dos representantes
@@ -51,9 +240,26 @@ class GameState:
     RESULT = 2          # Mostrar o resultado da rodada
     FINAL_RESULT = 3    # Mostrar o resultado final do torneio
 
+STATE_NAMES = {
+    GameState.REPRESENTATIVE: "representative",
+    GameState.CHOOSING: "choosing",
+    GameState.RESULT: "result",
+    GameState.FINAL_RESULT: "final_result",
+}
+# Nome da fase de desenho de cada tela na instrumentação
+DRAW_PHASES = {state: f"draw.{name}" for state, name in STATE_NAMES.items()}
+
 # --- Classe Principal do Jogo ---
 class Game:
-    def __init__(self):
+    def __init__(self, fps=FPS, idle_timeout_ms=IDLE_TIMEOUT_MS, history_log=None, sessions_dir=None, clock=None,
+                 profiler=None, choosers=None):
+        self.fps = fps  # Limite de quadros por segundo
+        self.clock = clock if clock is not None else MonotonicClock()  # Fonte de tempo (ver relogio.py)
+        # Tempos por fase do loop (ver instrumentacao.py); desligado por padrão
+        self.profiler = profiler if profiler is not None else Profiler.from_env()
+        # Equipes jogadas automaticamente: "cap"/"gar" -> função(game, equipe) que devolve a escolha
+        self.choosers = dict(choosers or {})
+        self.idle_timeout_ms = idle_timeout_ms  # Espera máxima por eventos nas telas paradas
         self.current_state = GameState.REPRESENTATIVE
         self.cap_choice = None
         self.gar_choice = None
@@ -66,7 +272,8 @@ class Game:
 
         self.caprichoso_score = 0
         self.garantido_score = 0
-        self.history = []  # Armazena o histórico de cada rodada
+        self.history = RoundHistory(history_log)  # Armazena o histórico de cada rodada
+        self.sessions_dir = sessions_dir  # Onde salvar cada torneio concluído (CSV)
 
         # Variáveis para input de representantes
         self.cap_representative = ""
@@ -74,17 +281,31 @@ class Game:
         self.cap_input_active = True
         self.gar_input_active = False
 
-        # Retângulos dos botões e caixas de input
-        self.buttons = {
-            "cap_confess": pygame.Rect(100, 500, 200, 70),
-            "cap_negar": pygame.Rect(100, 600, 200, 70),
-            "gar_confess": pygame.Rect(600, 500, 200, 70),
-            "gar_negar": pygame.Rect(600, 600, 200, 70),
-            "next": pygame.Rect(350, 700, 200, 50),
-            "start": pygame.Rect(350, 500, 200, 50),
-            "cap_input_box": pygame.Rect(150, 340, 300, 50),
-            "gar_input_box": pygame.Rect(450, 340, 300, 50),
-        }
+        # Retângulos dos botões e caixas de input (pygame.Rect, criados em init_display)
+        self.buttons = {}
+        self._layer = RetainedLayer()
+
+    def init_display(self, headless=False):
+        """Inicializa o Pygame (se preciso) e cria os retângulos dos botões."""
+        init_display(headless)
+        self.buttons = {name: pygame.Rect(rect) for name, rect in BUTTON_LAYOUT.items()}
+
+    def finish_tournament(self):
+        """Encerra o torneio e salva o histórico em sessions_dir, se configurado.
+
+        Retorna o caminho do arquivo salvo (ou None).
+        """
+        self.current_state = GameState.FINAL_RESULT
+        if self.sessions_dir is None:
+            return None
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        path = os.path.join(self.sessions_dir, time.strftime("sessao-%Y%m%d-%H%M%S.csv"))
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(self.sessions_dir, time.strftime(f"sessao-%Y%m%d-%H%M%S-{suffix}.csv"))
+        self.history.export_csv(path)
+        return path
 
     def reset_game(self):
         """Reinicia todas as variáveis do jogo para um novo torneio."""
@@ -97,7 +318,7 @@ class Game:
         self.current_round = 1
         self.caprichoso_score = 0
         self.garantido_score = 0
-        self.history = []
+        self.history.clear()
         self.cap_representative = ""
         self.gar_representative = ""
         self.cap_input_active = True
@@ -105,44 +326,109 @@ class Game:
 
     def calculate_result(self):
         """Calcula o resultado da rodada com base nas escolhas dos jogadores."""
-        if self.cap_choice == "Confessar" and self.gar_choice == "Negar":
-            self.result_text = "Caprichoso: 1 ano | Garantido: 10 anos"
-            self.result_color = COLORS["BLUE"]
-            cap_penalty = 1
-            gar_penalty = 10
-        elif self.cap_choice == "Negar" and self.gar_choice == "Confessar":
-            self.result_text = "Caprichoso: 10 anos | Garantido: 1 ano"
-            self.result_color = COLORS["RED"]
-            cap_penalty = 10
-            gar_penalty = 1
-        elif self.cap_choice == "Confessar" and self.gar_choice == "Confessar":
-            self.result_text = "Ambos: 3 anos de prisão"
-            self.result_color = COLORS["ORANGE"]
-            cap_penalty = 3
-            gar_penalty = 3
-        else:  # Ambos negaram
-            self.result_text = "Ambos: 2 anos de prisão (pena original)"
-            self.result_color = COLORS["GREEN"]
-            cap_penalty = 2
-            gar_penalty = 2
+        # Consulta direta na matriz de penas (ver regras.py)
+        cap_code = choice_code(self.cap_choice)
+        gar_code = choice_code(self.gar_choice)
+        cap_penalty, gar_penalty = PAYOFF[cap_code][gar_code]
+        self.result_text = RESULT_TEXT[cap_code][gar_code]
+        self.result_color = COLORS[RESULT_COLOR_KEY[cap_code][gar_code]]
 
         self.caprichoso_score += cap_penalty
         self.garantido_score += gar_penalty
 
-        # Adicionar ao histórico
-        self.history.append({
-            "round": self.current_round,
-            "cap_rep": self.cap_representative,
-            "gar_rep": self.gar_representative,
-            "cap_choice": self.cap_choice,
-            "gar_choice": self.gar_choice,
-            "result_text": self.result_text,
-            "result_color": self.result_color, # Adicionar cor para o histórico
-            "cap_penalty": cap_penalty,
-            "gar_penalty": gar_penalty,
-            "cap_score_total": self.caprichoso_score, # Pontuação total até o momento
-            "gar_score_total": self.garantido_score
-        })
+        # Adicionar ao histórico (colunar, ver historico.py)
+        self.history.append(self.current_round, self.cap_representative, self.gar_representative,
+                            cap_code, gar_code, cap_penalty, gar_penalty,
+                            self.caprichoso_score, self.garantido_score)
+
+    # --- Transições de estado (usadas pelos eventos, pelo loop e por roteiros) ---
+    def start_round(self, cap_representative=None, gar_representative=None):
+        """Sai da tela de representantes e inicia o timer da rodada."""
+        if self.current_state != GameState.REPRESENTATIVE:
+            return
+        if cap_representative is not None:
+            self.cap_representative = cap_representative
+        if gar_representative is not None:
+            self.gar_representative = gar_representative
+        # Preenche com nomes padrão se estiverem vazios
+        if not self.cap_representative.strip():
+            self.cap_representative = f"Representante Caprichoso {self.current_round}"
+        if not self.gar_representative.strip():
+            self.gar_representative = f"Representante Garantido {self.current_round}"
+
+        self.start_time = self.clock.now() # Inicia o timer da rodada
+        self.current_state = GameState.CHOOSING # Transiciona para a fase de escolha
+
+    def choose(self, team, choice):
+        """Registra a escolha de uma equipe ("cap" ou "gar"); fecha a rodada quando ambas escolheram."""
+        if choice not in ACTIONS:
+            raise ValueError(f"Escolha inválida: {choice!r}")
+        if self.current_state != GameState.CHOOSING:
+            return
+        if team == "cap":
+            self.cap_choice = choice
+        elif team == "gar":
+            self.gar_choice = choice
+        else:
+            raise ValueError(f"Equipe desconhecida: {team!r}")
+        self._fill_choices(timed_out=False)
+
+    def _fill_choices(self, timed_out):
+        """Completa as escolhas que faltam e fecha a rodada quando ambas existem.
+
+        Uma equipe automática (self.choosers) escolhe quando as equipes humanas
+        já escolheram ou quando o tempo acaba; sem agente, o tempo esgotado
+        vale a escolha padrão (regras.DEFAULT_CHOICE).
+        """
+        humans_waiting = ((self.cap_choice is None and "cap" not in self.choosers)
+                          or (self.gar_choice is None and "gar" not in self.choosers))
+        if self.cap_choice is None:
+            if "cap" in self.choosers and (timed_out or not humans_waiting):
+                self.cap_choice = self.choosers["cap"](self, "cap")
+            elif timed_out:
+                self.cap_choice = DEFAULT_CHOICE
+        if self.gar_choice is None:
+            if "gar" in self.choosers and (timed_out or not humans_waiting):
+                self.gar_choice = self.choosers["gar"](self, "gar")
+            elif timed_out:
+                self.gar_choice = DEFAULT_CHOICE
+
+        # Se ambos escolherem, calcula o resultado e muda de estado
+        if self.cap_choice is not None and self.gar_choice is not None:
+            self.calculate_result()
+            self.current_state = GameState.RESULT
+
+    def elapsed(self):
+        """Segundos desde o início da rodada (0 fora da fase de escolha)."""
+        if self.current_state != GameState.CHOOSING:
+            return 0
+        return self.clock.now() - self.start_time
+
+    def update(self):
+        """Aplica o timeout da rodada e as equipes automáticas. Retorna o tempo decorrido."""
+        elapsed_time = self.elapsed()
+        if self.current_state == GameState.CHOOSING:
+            # Atribuir escolhas padrão (ou do agente) se o tempo acabar
+            self._fill_choices(timed_out=elapsed_time >= self.round_time)
+        return elapsed_time
+
+    def next_round(self):
+        """Passa para a próxima rodada ou, depois da última, para o resultado final."""
+        if self.current_state != GameState.RESULT:
+            return
+        if self.current_round < self.max_rounds:
+            self.current_round += 1
+            self.cap_choice = None
+            self.gar_choice = None
+            self.result_text = ""
+            # Resetar nomes dos representantes para a próxima rodada
+            self.cap_representative = ""
+            self.gar_representative = ""
+            self.cap_input_active = True # Ativar input para a próxima rodada
+            self.gar_input_active = False
+            self.current_state = GameState.REPRESENTATIVE # Volta para a tela de representantes
+        else:
+            self.finish_tournament() # Vai para o resultado final
 
     def _draw_scoreboard(self):
         """Desenha o placar atual na tela."""
@@ -150,116 +436,88 @@ class Game:
         pygame.draw.rect(SCREEN, COLORS["SCOREBOARD_BG"], score_bg, border_radius=15)
         pygame.draw.rect(SCREEN, COLORS["BLACK"], score_bg, 3, border_radius=15)
 
-        cap_text = FONTS["option"].render("CAPRICHOSO", True, COLORS["BLUE"])
-        gar_text = FONTS["option"].render("GARANTIDO", True, COLORS["RED"])
+        cap_text = render_text("option", "CAPRICHOSO", COLORS["BLUE"])
+        gar_text = render_text("option", "GARANTIDO", COLORS["RED"])
         SCREEN.blit(cap_text, (WIDTH // 2 - 150 - cap_text.get_width() // 2, 40))
         SCREEN.blit(gar_text, (WIDTH // 2 + 150 - gar_text.get_width() // 2, 40))
 
-        cap_score = FONTS["score"].render(f"{self.caprichoso_score}", True, COLORS["BLUE"])
-        gar_score = FONTS["score"].render(f"{self.garantido_score}", True, COLORS["RED"])
+        cap_score = render_text("score", f"{self.caprichoso_score}", COLORS["BLUE"])
+        gar_score = render_text("score", f"{self.garantido_score}", COLORS["RED"])
         SCREEN.blit(cap_score, (WIDTH // 2 - 150 - cap_score.get_width() // 2, 70))
         SCREEN.blit(gar_score, (WIDTH // 2 + 150 - gar_score.get_width() // 2, 70))
 
         pygame.draw.line(SCREEN, COLORS["BLACK"], (WIDTH // 2, 30), (WIDTH // 2, 90), 2)
 
     def _draw_timer(self, elapsed_time):
-        """Desenha o círculo do temporizador e o número da rodada."""
-        center_x, center_y = WIDTH // 2, 180
-        radius = 40
-
-        progress = elapsed_time / self.round_time
-        angle = 2 * math.pi * progress
-
-        pygame.draw.circle(SCREEN, COLORS["TIMER_BG"], (center_x, center_y), radius)
-
-        if progress < 1:
-            points = [(center_x, center_y)]
-            for i in range(int(angle * 180 / math.pi) + 1):
-                rad = i * math.pi / 180
-                points.append((
-                    center_x + radius * math.cos(rad - math.pi / 2),
-                    center_y + radius * math.sin(rad - math.pi / 2)
-                ))
-            if len(points) > 2:
-                pygame.draw.polygon(SCREEN, COLORS["TIMER_PROGRESS"], points)
-
-        pygame.draw.circle(SCREEN, COLORS["TIMER_BORDER"], (center_x, center_y), radius, 3)
-
+        """Desenha o círculo do temporizador."""
         time_left = max(0, self.round_time - elapsed_time)
-        timer_text = FONTS["timer"].render(f"{int(time_left)}", True, COLORS["TIMER_BORDER"])
-        SCREEN.blit(timer_text, (center_x - timer_text.get_width() // 2,
-                                  center_y - timer_text.get_height() // 2))
+        draw_timer_dial(SCREEN, TIMER_CENTER, TIMER_RADIUS, elapsed_time / self.round_time, time_left)
 
-        round_text = FONTS["header"].render(f"Rodada {self.current_round}/{self.max_rounds}", True, COLORS["BLACK"])
-        SCREEN.blit(round_text, (center_x - round_text.get_width() // 2, center_y - 100))
+    def _timer_signature(self, elapsed_time):
+        """O que muda no desenho do timer: graus do arco e dígito exibido."""
+        progress = elapsed_time / self.round_time
+        degrees = int(360 * progress) if progress < 1 else -1
+        return degrees, int(max(0, self.round_time - elapsed_time))
 
     def _draw_representative_screen(self):
         """Desenha a tela para coletar os nomes dos representantes."""
+        self._draw_representative_static()
+        self._draw_widgets(0)
+
+    def _draw_representative_static(self):
+        """Partes fixas da tela de representantes (títulos e rótulos)."""
         SCREEN.fill(COLORS["BACKGROUND"])
 
-        title = FONTS["title"].render("Registrar Representantes", True, COLORS["BLACK"])
-        subtitle = FONTS["header"].render(f"Rodada {self.current_round}", True, COLORS["BLACK"])
+        title = render_text("title", "Registrar Representantes", COLORS["BLACK"])
+        subtitle = render_text("header", f"Rodada {self.current_round}", COLORS["BLACK"])
         SCREEN.blit(title, (WIDTH // 2 - title.get_width() // 2, 100))
         SCREEN.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, 160))
 
-        instructions = FONTS["rep"].render("Digite o nome dos representantes para esta rodada:", True, COLORS["BLACK"])
+        instructions = render_text("rep", "Digite o nome dos representantes para esta rodada:", COLORS["BLACK"])
         SCREEN.blit(instructions, (WIDTH // 2 - instructions.get_width() // 2, 220))
 
-        # Campo para Caprichoso
-        cap_label = FONTS["rep"].render("Representante Caprichoso:", True, COLORS["BLUE"])
+        # Rótulos dos campos
+        cap_label = render_text("rep", "Representante Caprichoso:", COLORS["BLUE"])
         SCREEN.blit(cap_label, (150, 300))
-        
-        cap_box = self.buttons["cap_input_box"]
-        color_cap = COLORS["BLUE"] if self.cap_input_active else COLORS["GRAY"]
-        pygame.draw.rect(SCREEN, COLORS["WHITE"], cap_box)
-        pygame.draw.rect(SCREEN, color_cap, cap_box, 3)
-        cap_text = FONTS["input"].render(self.cap_representative, True, COLORS["BLACK"])
-        SCREEN.blit(cap_text, (cap_box.x + 10, cap_box.y + cap_box.height // 2 - cap_text.get_height() // 2))
-
-        # Campo para Garantido
-        gar_label = FONTS["rep"].render("Representante Garantido:", True, COLORS["RED"])
+        gar_label = render_text("rep", "Representante Garantido:", COLORS["RED"])
         SCREEN.blit(gar_label, (450, 300))
-        
-        gar_box = self.buttons["gar_input_box"]
-        color_gar = COLORS["RED"] if self.gar_input_active else COLORS["GRAY"]
-        pygame.draw.rect(SCREEN, COLORS["WHITE"], gar_box)
-        pygame.draw.rect(SCREEN, color_gar, gar_box, 3)
-        gar_text = FONTS["input"].render(self.gar_representative, True, COLORS["BLACK"])
-        SCREEN.blit(gar_text, (gar_box.x + 10, gar_box.y + gar_box.height // 2 - gar_text.get_height() // 2))
-
-        # Botão para iniciar a rodada
-        start_button = self.buttons["start"]
-        pygame.draw.rect(SCREEN, COLORS["LIGHT_BLUE"] if start_button.collidepoint(pygame.mouse.get_pos()) else COLORS["WHITE"],
-                         start_button, border_radius=10)
-        pygame.draw.rect(SCREEN, COLORS["GREEN"], start_button, 3, border_radius=10)
-        start_text = FONTS["option"].render("Iniciar Rodada", True, COLORS["GREEN"])
-        SCREEN.blit(start_text, (start_button.centerx - start_text.get_width() // 2,
-                                  start_button.centery - start_text.get_height() // 2))
-        
-        note = FONTS["small"].render("Pressione TAB para alternar entre os campos ou clique neles", True, COLORS["GRAY"])
+
+        note = render_text("small", "Pressione TAB para alternar entre os campos ou clique neles", COLORS["GRAY"])
         SCREEN.blit(note, (WIDTH//2 - note.get_width()//2, 420))
 
+    def _draw_input_box(self, box, text, active, active_color):
+        """Desenha uma caixa de input com o texto digitado."""
+        pygame.draw.rect(SCREEN, COLORS["WHITE"], box)
+        pygame.draw.rect(SCREEN, active_color if active else COLORS["GRAY"], box, 3)
+        text_surface = render_text("input", text, COLORS["BLACK"])
+        SCREEN.blit(text_surface, (box.x + 10, box.y + box.height // 2 - text_surface.get_height() // 2))
 
     def _draw_main_game_screen(self, elapsed_time):
         """Desenha a tela principal do jogo (fase de escolha e resultado da rodada)."""
+        self._draw_main_game_static()
+        self._draw_widgets(elapsed_time)
+
+    def _draw_main_game_static(self):
+        """Partes da tela principal que não mudam durante o estado atual."""
         SCREEN.fill(COLORS["BACKGROUND"])
         self._draw_scoreboard() # O placar é visível em CHOOSING e RESULT
 
-        title = FONTS["title"].render("Dilema do Prisioneiro", True, COLORS["BLACK"])
-        subtitle = FONTS["option"].render("Caprichoso (Azul) vs Garantido (Vermelho)", True, COLORS["BLACK"])
+        title = render_text("title", "Dilema do Prisioneiro", COLORS["BLACK"])
+        subtitle = render_text("option", "Caprichoso (Azul) vs Garantido (Vermelho)", COLORS["BLACK"])
         SCREEN.blit(title, (WIDTH // 2 - title.get_width() // 2, 120))
         SCREEN.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, 170))
 
         if self.current_state == GameState.CHOOSING:
-            self._draw_timer(elapsed_time)
-        
+            round_text = render_text("header", f"Rodada {self.current_round}/{self.max_rounds}", COLORS["BLACK"])
+            SCREEN.blit(round_text, (TIMER_CENTER[0] - round_text.get_width() // 2, TIMER_CENTER[1] - 100))
+
         # Representantes atuais
         rep_bg = pygame.Rect(50, 220, 800, 60)
         pygame.draw.rect(SCREEN, COLORS["SCOREBOARD_BG"], rep_bg, border_radius=10)
         pygame.draw.rect(SCREEN, COLORS["BLACK"], rep_bg, 2, border_radius=10)
         
-        cap_rep_text = FONTS["rep"].render(f"Caprichoso: {self.cap_representative}", True, COLORS["BLUE"])
-        gar_rep_text = FONTS["rep"].render(f"Garantido: {self.gar_representative}", True, COLORS["RED"])
+        cap_rep_text = render_text("rep", f"Caprichoso: {self.cap_representative}", COLORS["BLUE"])
+        gar_rep_text = render_text("rep", f"Garantido: {self.gar_representative}", COLORS["RED"])
         SCREEN.blit(cap_rep_text, (WIDTH // 4 - cap_rep_text.get_width() // 2, 240))
         SCREEN.blit(gar_rep_text, (3 * WIDTH // 4 - gar_rep_text.get_width() // 2, 240))
 
@@ -275,42 +533,30 @@ class Game:
         ]
 
         for i, rule in enumerate(rules):
-            text = FONTS["small"].render(rule, True, COLORS["BLACK"])
+            text = render_text("small", rule, COLORS["BLACK"])
             SCREEN.blit(text, (70, 320 + i * 35))
 
-        # Botões de escolha - CAPRICHOSO
-        cap_title = FONTS["header"].render("CAPRICHOSO", True, COLORS["BLUE"])
+        # Títulos dos botões de escolha
+        cap_title = render_text("header", "CAPRICHOSO", COLORS["BLUE"])
         SCREEN.blit(cap_title, (200 - cap_title.get_width() // 2, 470))
-
-        self._draw_button(self.buttons["cap_confess"], "CONFESSAR", COLORS["BLUE"], COLORS["LIGHT_BLUE"], self.cap_choice == "Confessar")
-        self._draw_button(self.buttons["cap_negar"], "NEGAR", COLORS["RED"], COLORS["LIGHT_RED"], self.cap_choice == "Negar")
-
-        # Botões de escolha - GARANTIDO
-        gar_title = FONTS["header"].render("GARANTIDO", True, COLORS["RED"])
+        gar_title = render_text("header", "GARANTIDO", COLORS["RED"])
         SCREEN.blit(gar_title, (700 - gar_title.get_width() // 2, 470))
 
-        self._draw_button(self.buttons["gar_confess"], "CONFESSAR", COLORS["BLUE"], COLORS["LIGHT_BLUE"], self.gar_choice == "Confessar")
-        self._draw_button(self.buttons["gar_negar"], "NEGAR", COLORS["RED"], COLORS["LIGHT_RED"], self.gar_choice == "Negar")
-
         # Mostrar resultado da rodada
         if self.current_state == GameState.RESULT:
             pygame.draw.rect(SCREEN, COLORS["SCOREBOARD_BG"], (100, 320, 700, 150), border_radius=12)
             pygame.draw.rect(SCREEN, self.result_color, (100, 320, 700, 150), 3, border_radius=12)
 
-            result_surface = FONTS["result"].render(self.result_text, True, self.result_color)
+            result_surface = render_text("result", self.result_text, self.result_color)
             SCREEN.blit(result_surface, (WIDTH // 2 - result_surface.get_width() // 2, 340))
 
-            cap_choice_text = FONTS["small"].render(f"Caprichoso escolheu: {self.cap_choice}", True, COLORS["BLUE"])
-            gar_choice_text = FONTS["small"].render(f"Garantido escolheu: {self.gar_choice}", True, COLORS["RED"])
+            cap_choice_text = render_text("small", f"Caprichoso escolheu: {self.cap_choice}", COLORS["BLUE"])
+            gar_choice_text = render_text("small", f"Garantido escolheu: {self.gar_choice}", COLORS["RED"])
             SCREEN.blit(cap_choice_text, (WIDTH // 4 - cap_choice_text.get_width() // 2, 380))
             SCREEN.blit(gar_choice_text, (3 * WIDTH // 4 - gar_choice_text.get_width() // 2, 380))
 
-            rep_result_text = FONTS["small"].render(f"Representantes: {self.cap_representative} (Cap) | {self.gar_representative} (Gar)", True, COLORS["BLACK"])
+            rep_result_text = render_text("small", f"Representantes: {self.cap_representative} (Cap) | {self.gar_representative} (Gar)", COLORS["BLACK"])
             SCREEN.blit(rep_result_text, (WIDTH // 2 - rep_result_text.get_width() // 2, 420))
-            
-            # Botão de próxima rodada
-            btn_label = "Próxima Rodada" if self.current_round < self.max_rounds else "Ver Resultado Final"
-            self._draw_button(self.buttons["next"], btn_label, COLORS["BLUE"], COLORS["LIGHT_BLUE"])
 
     def _draw_button(self, rect, text_content, text_color, hover_color, chosen=False):
         """Função auxiliar para desenhar botões."""
@@ -319,19 +565,106 @@ class Game:
         pygame.draw.rect(SCREEN, current_color, rect, border_radius=10)
         pygame.draw.rect(SCREEN, text_color, rect, 3, border_radius=10)
         
-        text_surface = FONTS["option"].render(text_content, True, text_color)
+        text_surface = render_text("option", text_content, text_color)
         SCREEN.blit(text_surface, (rect.centerx - text_surface.get_width() // 2,
                                     rect.centery - text_surface.get_height() // 2))
         
         if chosen: # Indicador visual se a escolha foi feita
             pygame.draw.circle(SCREEN, COLORS["GREEN"], (rect.right - 15, rect.centery), 8)
 
+    def _button_widget(self, name, label, text_color, hover_color, mouse_pos, chosen=False):
+        """Widget de botão: muda quando o mouse entra/sai ou a escolha muda."""
+        rect = self.buttons[name]
+        signature = (label, rect.collidepoint(mouse_pos), chosen)
+        return (name, rect, signature,
+                lambda: self._draw_button(rect, label, text_color, hover_color, chosen))
+
+    def _widgets(self, elapsed_time):
+        """Lista os widgets dinâmicos do estado atual.
+
+        Cada item é (nome, retângulo, assinatura, função de desenho). O widget
+        só é redesenhado quando sua assinatura muda entre um quadro e outro.
+        """
+        mouse_pos = pygame.mouse.get_pos()
+        widgets = []
+
+        if self.current_state == GameState.REPRESENTATIVE:
+            cap_box = self.buttons["cap_input_box"]
+            gar_box = self.buttons["gar_input_box"]
+            widgets.append(("cap_input", cap_box, (self.cap_representative, self.cap_input_active),
+                            lambda: self._draw_input_box(cap_box, self.cap_representative,
+                                                         self.cap_input_active, COLORS["BLUE"])))
+            widgets.append(("gar_input", gar_box, (self.gar_representative, self.gar_input_active),
+                            lambda: self._draw_input_box(gar_box, self.gar_representative,
+                                                         self.gar_input_active, COLORS["RED"])))
+            # Botão para iniciar a rodada
+            widgets.append(self._button_widget("start", "Iniciar Rodada", COLORS["GREEN"],
+                                               COLORS["LIGHT_BLUE"], mouse_pos))
+
+        elif self.current_state in (GameState.CHOOSING, GameState.RESULT):
+            if self.current_state == GameState.CHOOSING:
+                widgets.append(("timer", TIMER_RECT, self._timer_signature(elapsed_time),
+                                lambda: self._draw_timer(elapsed_time)))
+
+            # Botões de escolha - CAPRICHOSO e GARANTIDO
+            widgets.append(self._button_widget("cap_confess", "CONFESSAR", COLORS["BLUE"], COLORS["LIGHT_BLUE"],
+                                               mouse_pos, self.cap_choice == "Confessar"))
+            widgets.append(self._button_widget("cap_negar", "NEGAR", COLORS["RED"], COLORS["LIGHT_RED"],
+                                               mouse_pos, self.cap_choice == "Negar"))
+            widgets.append(self._button_widget("gar_confess", "CONFESSAR", COLORS["BLUE"], COLORS["LIGHT_BLUE"],
+                                               mouse_pos, self.gar_choice == "Confessar"))
+            widgets.append(self._button_widget("gar_negar", "NEGAR", COLORS["RED"], COLORS["LIGHT_RED"],
+                                               mouse_pos, self.gar_choice == "Negar"))
+
+            if self.current_state == GameState.RESULT:
+                # Botão de próxima rodada
+                btn_label = "Próxima Rodada" if self.current_round < self.max_rounds else "Ver Resultado Final"
+                widgets.append(self._button_widget("next", btn_label, COLORS["BLUE"], COLORS["LIGHT_BLUE"],
+                                                   mouse_pos))
+
+        elif self.current_state == GameState.FINAL_RESULT:
+            # Botão para reiniciar
+            widgets.append(self._button_widget("next", "Jogar Novamente", COLORS["BLUE"], COLORS["LIGHT_BLUE"],
+                                               mouse_pos))
+
+        return widgets
+
+    def _draw_widgets(self, elapsed_time):
+        """Desenha todos os widgets dinâmicos do estado atual."""
+        for _, _, _, draw in self._widgets(elapsed_time):
+            draw()
+
+    def _draw_static(self):
+        """Desenha a camada estática da tela do estado atual."""
+        if self.current_state == GameState.REPRESENTATIVE:
+            self._draw_representative_static()
+        elif self.current_state == GameState.CHOOSING or self.current_state == GameState.RESULT:
+            self._draw_main_game_static()
+        elif self.current_state == GameState.FINAL_RESULT:
+            self._draw_final_result_static()
+
+    def render(self, elapsed_time):
+        """Atualiza a tela redesenhando só o que mudou.
+
+        Retorna None quando a tela inteira foi redesenhada, ou a lista de
+        retângulos alterados para pygame.display.update.
+        """
+        # A camada estática só muda quando o estado, a rodada ou o placar mudam
+        screen_key = (self.current_state, self.current_round,
+                      self.caprichoso_score, self.garantido_score, self.result_text)
+        return self._layer.update(screen_key, self._draw_static, self._widgets(elapsed_time))
+
     def _draw_final_result_screen(self):
         """Desenha a tela de resultado final do torneio."""
+        self._draw_final_result_static()
+        self._draw_widgets(0)
+
+    def _draw_final_result_static(self):
+        """Placar final e histórico (tudo, exceto o botão de reiniciar)."""
         SCREEN.fill(COLORS["BACKGROUND"])
 
-        title = FONTS["title"].render("RESULTADO FINAL", True, COLORS["BLACK"])
-        subtitle = FONTS["header"].render(f"{self.max_rounds} Rodadas Completas", True, COLORS["BLACK"])
+        title = render_text("title", "RESULTADO FINAL", COLORS["BLACK"])
+        subtitle = render_text("header", f"{self.max_rounds} Rodadas Completas", COLORS["BLACK"])
         SCREEN.blit(title, (WIDTH // 2 - title.get_width() // 2, 50))
         SCREEN.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, 110))
 
@@ -339,27 +672,28 @@ class Game:
         pygame.draw.rect(SCREEN, COLORS["SCOREBOARD_BG"], (WIDTH // 2 - 250, 180, 500, 150), border_radius=15)
         pygame.draw.rect(SCREEN, COLORS["BLACK"], (WIDTH // 2 - 250, 180, 500, 150), 3, border_radius=15)
 
-        cap_final = FONTS["header"].render(f"Caprichoso: {self.caprichoso_score} anos", True, COLORS["BLUE"])
-        gar_final = FONTS["header"].render(f"Garantido: {self.garantido_score} anos", True, COLORS["RED"])
+        cap_final = render_text("header", f"Caprichoso: {self.caprichoso_score} anos", COLORS["BLUE"])
+        gar_final = render_text("header", f"Garantido: {self.garantido_score} anos", COLORS["RED"])
         SCREEN.blit(cap_final, (WIDTH // 2 - cap_final.get_width() // 2, 210))
         SCREEN.blit(gar_final, (WIDTH // 2 - gar_final.get_width() // 2, 260))
 
         # Determinar o vencedor
-        if self.caprichoso_score < self.garantido_score:
-            winner_text = FONTS["header"].render("CAPRICHOSO VENCEU!", True, COLORS["BLUE"])
-            winner_reason = FONTS["small"].render("(Menor tempo total de prisão)", True, COLORS["BLUE"])
-        elif self.garantido_score < self.caprichoso_score:
-            winner_text = FONTS["header"].render("GARANTIDO VENCEU!", True, COLORS["RED"])
-            winner_reason = FONTS["small"].render("(Menor tempo total de prisão)", True, COLORS["RED"])
+        result_winner = winner(self.caprichoso_score, self.garantido_score)
+        if result_winner == "Caprichoso":
+            winner_text = render_text("header", "CAPRICHOSO VENCEU!", COLORS["BLUE"])
+            winner_reason = render_text("small", "(Menor tempo total de prisão)", COLORS["BLUE"])
+        elif result_winner == "Garantido":
+            winner_text = render_text("header", "GARANTIDO VENCEU!", COLORS["RED"])
+            winner_reason = render_text("small", "(Menor tempo total de prisão)", COLORS["RED"])
         else:
-            winner_text = FONTS["header"].render("EMPATE!", True, COLORS["GREEN"])
-            winner_reason = FONTS["small"].render("(Tempos de prisão iguais)", True, COLORS["GREEN"])
+            winner_text = render_text("header", "EMPATE!", COLORS["GREEN"])
+            winner_reason = render_text("small", "(Tempos de prisão iguais)", COLORS["GREEN"])
 
         SCREEN.blit(winner_text, (WIDTH // 2 - winner_text.get_width() // 2, 360))
         SCREEN.blit(winner_reason, (WIDTH // 2 - winner_reason.get_width() // 2, 410))
 
         # Histórico das rodadas
-        history_title = FONTS["header"].render("Histórico das Rodadas:", True, COLORS["BLACK"])
+        history_title = render_text("header", "Histórico das Rodadas:", COLORS["BLACK"])
         SCREEN.blit(history_title, (WIDTH // 2 - history_title.get_width() // 2, 460))
         
         # Desenha o histórico com rolagem simulada (ou limitado a X itens)
@@ -373,24 +707,19 @@ class Game:
         for i, entry in enumerate(display_history):
             y_pos = history_start_y + i * line_height
             
-            # Formato de linha para cada entrada do histórico
-            history_line = (
-                f"Rodada {entry['round']}: "
-                f"Cap: {entry['cap_rep']} ({entry['cap_choice']}) | "
-                f"Gar: {entry['gar_rep']} ({entry['gar_choice']}) | "
-                f"Pena: {entry['cap_penalty']}/{entry['gar_penalty']}"
-            )
-            history_text = FONTS["small"].render(history_line, True, COLORS["BLACK"])
+            history_text = render_text("small", history_line(entry), COLORS["BLACK"])
             SCREEN.blit(history_text, (50, y_pos))
 
-        # Botão para reiniciar
-        self._draw_button(self.buttons["next"], "Jogar Novamente", COLORS["BLUE"], COLORS["LIGHT_BLUE"])
-
     def _handle_event(self, event, mouse_pos):
         """Processa um evento Pygame."""
         if event.type == pygame.QUIT:
             return False # Sinaliza para sair do loop principal
 
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            if not self.profiler.toggle_overlay():
+                self._layer.invalidate() # Apaga o painel redesenhando a tela
+            return True
+
         if event.type == pygame.KEYDOWN:
             if self.current_state == GameState.REPRESENTATIVE:
                 if self.cap_input_active:
@@ -422,48 +751,24 @@ class Game:
                     self.cap_input_active = False
                     self.gar_input_active = True
                 elif self.buttons["start"].collidepoint(mouse_pos):
-                    # Preenche com nomes padrão se estiverem vazios
-                    if not self.cap_representative.strip():
-                        self.cap_representative = f"Representante Caprichoso {self.current_round}"
-                    if not self.gar_representative.strip():
-                        self.gar_representative = f"Representante Garantido {self.current_round}"
-                    
-                    self.start_time = time.time() # Inicia o timer da rodada
-                    self.current_state = GameState.CHOOSING # Transiciona para a fase de escolha
+                    self.start_round()
 
             elif self.current_state == GameState.CHOOSING:
                 # Escolhas de Caprichoso
                 if self.buttons["cap_confess"].collidepoint(mouse_pos):
-                    self.cap_choice = "Confessar"
+                    self.choose("cap", "Confessar")
                 elif self.buttons["cap_negar"].collidepoint(mouse_pos):
-                    self.cap_choice = "Negar"
+                    self.choose("cap", "Negar")
                 
                 # Escolhas de Garantido
                 if self.buttons["gar_confess"].collidepoint(mouse_pos):
-                    self.gar_choice = "Confessar"
+                    self.choose("gar", "Confessar")
                 elif self.buttons["gar_negar"].collidepoint(mouse_pos):
-                    self.gar_choice = "Negar"
-                
-                # Se ambos escolherem, calcula o resultado e muda de estado
-                if self.cap_choice is not None and self.gar_choice is not None:
-                    self.calculate_result()
-                    self.current_state = GameState.RESULT
+                    self.choose("gar", "Negar")
 
             elif self.current_state == GameState.RESULT:
                 if self.buttons["next"].collidepoint(mouse_pos):
-                    if self.current_round < self.max_rounds:
-                        self.current_round += 1
-                        self.cap_choice = None
-                        self.gar_choice = None
-                        self.result_text = ""
-                        # Resetar nomes dos representantes para a próxima rodada
-                        self.cap_representative = ""
-                        self.gar_representative = ""
-                        self.cap_input_active = True # Ativar input para a próxima rodada
-                        self.gar_input_active = False
-                        self.current_state = GameState.REPRESENTATIVE # Volta para a tela de representantes
-                    else:
-                        self.current_state = GameState.FINAL_RESULT # Vai para o resultado final
+                    self.next_round()
 
             elif self.current_state == GameState.FINAL_RESULT:
                 if self.buttons["next"].collidepoint(mouse_pos):
@@ -471,46 +776,74 @@ class Game:
 
         return True # Sinaliza para continuar no loop principal
 
-    def run(self):
+    def _wait_timeout_ms(self):
+        """Quanto tempo o loop pode dormir esperando eventos.
+
+        Na fase de escolha, acorda quando o arco do timer avança um grau (o
+        dígito e o fim do tempo coincidem com esses instantes); nos outros
+        estados, só a entrada do usuário muda a tela.
+        """
+        if self.current_state != GameState.CHOOSING:
+            return self.idle_timeout_ms
+
+        elapsed_time = self.elapsed()
+        step = self.round_time / 360
+        next_change = (int(elapsed_time / step) + 1) * step
+        return max(1, math.ceil((next_change - elapsed_time) * 1000))
+
+    def _wait_events(self):
+        """Espera pelo próximo evento (com timeout) e retorna todos os pendentes."""
+        event = pygame.event.wait(self._wait_timeout_ms())
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def run(self, headless=False):
         """O loop principal do jogo."""
+        self.init_display(headless)
+        clock = pygame.time.Clock()
+        profiler = self.profiler
         running = True
         while running:
+            # Bloqueia até chegar um evento ou até o timer precisar avançar
+            with profiler.phase("wait"):
+                events = self._wait_events()
+            profiler.begin_frame()
             mouse_pos = pygame.mouse.get_pos()
-            current_time = time.time()
-            elapsed_time = 0
 
             # Lógica do timer, só ativa na fase de escolha
-            if self.current_state == GameState.CHOOSING:
-                elapsed_time = current_time - self.start_time
-                if elapsed_time >= self.round_time:
-                    # Atribuir escolhas padrão se o tempo acabar
-                    if self.cap_choice is None:
-                        self.cap_choice = "Negar"
-                    if self.gar_choice is None:
-                        self.gar_choice = "Negar"
-                    
-                    self.calculate_result()
-                    self.current_state = GameState.RESULT
+            with profiler.phase("update"):
+                elapsed_time = self.update()
 
             # Processamento de eventos
-            for event in pygame.event.get():
-                running = self._handle_event(event, mouse_pos)
-                if not running: # Se _handle_event retornou False (QUIT), sair
-                    break
+            with profiler.phase("events"):
+                for event in events:
+                    if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        self._layer.invalidate() # A janela precisa ser redesenhada por inteiro
+                    running = self._handle_event(event, mouse_pos)
+                    if not running: # Se _handle_event retornou False (QUIT), sair
+                        break
             
             if not running:
                 break # Sair do loop principal
 
-            # Desenha a tela de acordo com o estado atual do jogo
-            if self.current_state == GameState.REPRESENTATIVE:
-                self._draw_representative_screen()
-            elif self.current_state == GameState.CHOOSING or self.current_state == GameState.RESULT:
-                self._draw_main_game_screen(elapsed_time)
-            elif self.current_state == GameState.FINAL_RESULT:
-                self._draw_final_result_screen()
-
-            pygame.display.flip() # Atualiza a tela
-
+            # Redesenha só o que mudou desde o último quadro
+            with profiler.phase(DRAW_PHASES[self.current_state]):
+                dirty = self.render(elapsed_time)
+            if profiler.overlay_visible:
+                overlay = profiler.draw_overlay(SCREEN, FONTS["tile"], 1000 / self.fps)
+                if dirty is not None:
+                    dirty.append(overlay)
+            with profiler.phase("flip"):
+                if dirty is None:
+                    pygame.display.flip() # Tela inteira nova
+                elif dirty:
+                    pygame.display.update(dirty)
+            profiler.end_frame()
+
+            clock.tick(self.fps) # Nunca passa do limite de quadros
+
+        profiler.save()
         pygame.quit()
         sys.exit()
 
@@ -518,5 +851,5 @@ class Game:
 if __name__ == "__main__":
     # O código dentro deste bloco só será executado quando o script for rodado diretamente.
     # É uma boa prática para garantir que o jogo só inicie se for o "main" script.
-    game = Game()
+    game = Game(sessions_dir=os.environ.get("DILEMA_SESSIONS_DIR", "sessoes"))
     game.run()
\ No newline at end of file
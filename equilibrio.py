@@ -0,0 +1,470 @@
+# --- Equilíbrios de Nash de Jogos Bimatriciais ---
+# Analisa a matriz de Game.calculate_result (ou qualquer jogo m x n de dois
+# jogadores) e encontra os equilíbrios de Nash puros e mistos.
+#
+#   1. Eliminação iterada de estratégias estritamente dominadas (pré-passo
+#      rápido: estratégias dominadas nunca aparecem num equilíbrio).
+#   2. Jogos pequenos (após a eliminação): enumeração de suportes, podada por
+#      dominância condicional e resolvida em lote; encontra todos os
+#      equilíbrios de jogos não degenerados.
+#   3. Jogos grandes: Lemke-Howson partindo de alguns rótulos, com pivoteamento
+#      lexicográfico; encontra um ou mais equilíbrios (não necessariamente todos).
+#
+# Os resultados ficam em cache pelo hash das matrizes. EquilibriumSolver
+# permite editar uma célula de cada vez: as melhores respostas puras são
+# atualizadas só na linha e na coluna editadas, os equilíbrios anteriores
+# que não usam a célula continuam válidos sem recálculo e, na enumeração,
+# só os suportes que contêm a linha ou a coluna editada são examinados.
+# Em jogos grandes, os equilíbrios que sobrevivem à edição se somam aos
+# encontrados por um novo Lemke-Howson.
+#
+# Pagamentos aqui são utilidades (maior é melhor): os anos de prisão de
+# regras.PAYOFF entram com o sinal trocado (ver dilemma_matrices).
+#
+# Uso: python equilibrio.py            (equilíbrios do dilema)
+#      python equilibrio.py --random 50
+
+import argparse
+import hashlib
+import itertools
+import math
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from regras import ACTIONS, PAYOFF
+
+# Enumeração de suportes só quando o número de pares de suportes é pequeno
+SUPPORT_LIMIT = 20000
+# Rodadas de Lemke-Howson (rótulos de partida diferentes) em jogos grandes
+LEMKE_HOWSON_RUNS = 4
+TOLERANCE = 1e-9
+CACHE_SIZE = 256
+
+Equilibrium = namedtuple("Equilibrium", "row col row_payoff col_payoff")
+Analysis = namedtuple("Analysis", "pure mixed rows cols exhaustive")
+
+
+def dilemma_matrices(payoff=PAYOFF):
+    """Matrizes de utilidade (linha = Caprichoso, coluna = Garantido): -anos de prisão."""
+    years = np.array(payoff, dtype=np.float64)
+    return -years[..., 0], -years[..., 1]
+
+
+def payoff_key(row_payoffs, col_payoffs):
+    """Hash das duas matrizes (forma e valores), usado como chave do cache."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(row_payoffs.shape, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(row_payoffs, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(col_payoffs, dtype=np.float64).tobytes())
+    return digest.digest()
+
+
+# --- Pré-passo: dominância ---
+def iterated_dominance(row_payoffs, col_payoffs):
+    """Elimina iteradamente estratégias puras estritamente dominadas.
+
+    Retorna (linhas, colunas) que sobrevivem, como arrays de índices.
+    """
+    rows = np.arange(row_payoffs.shape[0])
+    cols = np.arange(row_payoffs.shape[1])
+    while True:
+        a = row_payoffs[np.ix_(rows, cols)]
+        # dominates[p, q]: a linha p é estritamente melhor que q contra toda coluna
+        dominates = (a[:, None, :] > a[None, :, :]).all(axis=2)
+        keep_rows = ~dominates.any(axis=0)
+        b = col_payoffs[np.ix_(rows, cols)].T
+        dominates = (b[:, None, :] > b[None, :, :]).all(axis=2)
+        keep_cols = ~dominates.any(axis=0)
+        if keep_rows.all() and keep_cols.all():
+            return rows, cols
+        rows, cols = rows[keep_rows], cols[keep_cols]
+
+
+# --- Equilíbrios puros ---
+def _pure_mask(row_payoffs, col_payoffs):
+    """mask[i, j] = (i, j) é um par de melhores respostas mútuas."""
+    return (row_payoffs == row_payoffs.max(axis=0)) & (col_payoffs == col_payoffs.max(axis=1, keepdims=True))
+
+
+def _pure_from_mask(mask, row_payoffs, col_payoffs):
+    m, n = mask.shape
+    result = []
+    for i, j in zip(*np.nonzero(mask)):
+        row = tuple(float(k == i) for k in range(m))
+        col = tuple(float(k == j) for k in range(n))
+        result.append(Equilibrium(row, col, float(row_payoffs[i, j]), float(col_payoffs[i, j])))
+    return result
+
+
+def pure_equilibria(row_payoffs, col_payoffs):
+    row_payoffs = np.asarray(row_payoffs, dtype=np.float64)
+    col_payoffs = np.asarray(col_payoffs, dtype=np.float64)
+    return _pure_from_mask(_pure_mask(row_payoffs, col_payoffs), row_payoffs, col_payoffs)
+
+
+# --- Equilíbrios mistos ---
+def _indifferent(payoffs, support_rows, support_cols):
+    """Misturas sobre support_cols que deixam as linhas de support_rows indiferentes.
+
+    Resolve payoffs[I, J] y = v, Σy = 1 para cada par (I, J) de uma vez
+    (support_rows e support_cols: arrays P x k). Retorna (y, v, válidos):
+    sistemas singulares ou com alguma probabilidade negativa ficam de fora.
+    """
+    count, k = support_rows.shape
+    system = np.zeros((count, k + 1, k + 1))
+    system[:, :k, :k] = payoffs[support_rows[:, :, None], support_cols[:, None, :]]
+    system[:, :k, k] = -1.0
+    system[:, k, :k] = 1.0
+    target = np.zeros((count, k + 1, 1))
+    target[:, k] = 1.0
+    valid = np.linalg.cond(system) < 1e10
+    solution = np.zeros((count, k + 1))
+    if valid.any():
+        solution[valid] = np.linalg.solve(system[valid], target[valid])[..., 0]
+    valid &= (solution[:, :k] >= -TOLERANCE).all(axis=1)
+    return solution[:, :k], solution[:, k], valid
+
+
+def _dominated(payoffs, support):
+    """dominated[k] = a estratégia k (linha de payoffs) é estritamente dominada nas colunas `support`."""
+    sub = payoffs[:, list(support)]
+    return (sub[:, None, :] > sub[None, :, :]).all(axis=2).any(axis=0)
+
+
+def _support_pairs(m, n):
+    return sum(math.comb(m, k) * math.comb(n, k) for k in range(1, min(m, n) + 1))
+
+
+def support_enumeration(row_payoffs, col_payoffs, touched=None):
+    """Todos os equilíbrios com suportes de mesmo tamanho (jogos não degenerados).
+
+    Os pares de suportes são podados por dominância condicional: dado o
+    suporte J das colunas, uma linha dominada nas colunas de J nunca é
+    melhor resposta (e o mesmo para as colunas, dado o suporte das linhas).
+    Os sistemas de indiferença de cada tamanho são resolvidos em lote.
+    Com touched=(linhas, colunas), só são examinados os suportes que contêm
+    alguma dessas linhas ou colunas (as células editadas).
+    """
+    m, n = row_payoffs.shape
+    found = []
+    for size in range(1, min(m, n) + 1):
+        pairs_rows, pairs_cols = [], []
+        for support_cols in itertools.combinations(range(n), size):
+            candidates = np.nonzero(~_dominated(row_payoffs, support_cols))[0].tolist()
+            cols_touched = touched is None or not touched[1].isdisjoint(support_cols)
+            for support_rows in itertools.combinations(candidates, size):
+                if cols_touched or not touched[0].isdisjoint(support_rows):
+                    pairs_rows.append(support_rows)
+                    pairs_cols.append(support_cols)
+        if not pairs_rows:
+            continue
+        rows = np.array(pairs_rows, dtype=np.intp)
+        cols = np.array(pairs_cols, dtype=np.intp)
+        # Colunas do suporte dominadas dado o suporte das linhas
+        sub = col_payoffs.T[:, rows]  # (n, pares, size)
+        dominated = (sub[:, None] > sub[None, :]).all(axis=3).any(axis=0).T
+        keep = ~np.take_along_axis(dominated, cols, axis=1).any(axis=1)
+        rows, cols = rows[keep], cols[keep]
+        if not len(rows):
+            continue
+
+        y_support, v, valid = _indifferent(row_payoffs, rows, cols)
+        y = np.zeros((len(rows), n))
+        np.put_along_axis(y, cols, y_support, axis=1)
+        # Nenhuma linha fora do suporte pode ser melhor
+        valid &= (y @ row_payoffs.T).max(axis=1) <= v + TOLERANCE
+        rows, cols, y = rows[valid], cols[valid], y[valid]
+        if not len(rows):
+            continue
+
+        x_support, u, valid = _indifferent(col_payoffs.T, cols, rows)
+        x = np.zeros((len(rows), m))
+        np.put_along_axis(x, rows, x_support, axis=1)
+        valid &= (x @ col_payoffs).max(axis=1) <= u + TOLERANCE
+        found.extend(zip(x[valid], y[valid]))
+    return found
+
+
+def _pivot(tableau, basis, column):
+    """Pivoteia `column` para a base (teste da razão lexicográfico). Retorna o rótulo que sai."""
+    pivots = tableau[:, column]
+    candidates = np.nonzero(pivots > TOLERANCE)[0]
+    ratios = tableau[candidates, -1] / pivots[candidates]
+    candidates = candidates[ratios <= ratios.min() + TOLERANCE]
+    # Empate (jogo degenerado): desempata pelas colunas das folgas iniciais,
+    # uma de cada vez, tratando como iguais valores a menos de TOLERANCE
+    slack = tableau.shape[1] - 1 - len(basis)
+    while len(candidates) > 1 and slack < tableau.shape[1] - 1:
+        ratios = tableau[candidates, slack] / pivots[candidates]
+        candidates = candidates[ratios <= ratios.min() + TOLERANCE]
+        slack += 1
+    row = candidates[0]
+    tableau[row] /= tableau[row, column]
+    pivot_row = tableau[row].copy()
+    tableau -= np.outer(tableau[:, column], pivot_row)
+    tableau[row] = pivot_row
+    leaving = basis[row]
+    basis[row] = column
+    return leaving
+
+
+def lemke_howson(row_payoffs, col_payoffs, label=0, max_pivots=None):
+    """Um equilíbrio pelo algoritmo de Lemke-Howson, deixando de fora o rótulo `label`.
+
+    Rótulos 0 .. m-1 são as linhas, m .. m+n-1 as colunas. Retorna (x, y) ou
+    None se o limite de pivoteamentos for atingido.
+    """
+    m, n = row_payoffs.shape
+    # Pagamentos estritamente positivos (não muda os equilíbrios)
+    a = row_payoffs - row_payoffs.min() + 1.0
+    b = col_payoffs - col_payoffs.min() + 1.0
+    # Tableaux com uma coluna por rótulo e o lado direito por último.
+    # P = {x >= 0 : B'x <= 1}: variáveis x (rótulos das linhas), folgas nos rótulos das colunas.
+    # Q = {y >= 0 : Ay <= 1}: variáveis y (rótulos das colunas), folgas nos rótulos das linhas.
+    # As folgas ficam nas últimas colunas antes do lado direito (usadas no desempate).
+    p_tableau = np.hstack([b.T, np.eye(n), np.ones((n, 1))])
+    q_tableau = np.hstack([np.eye(m), a, np.ones((m, 1))])
+    # Em Q as folgas (rótulos 0 .. m-1) vêm antes; reordena para folgas no fim
+    q_order = list(range(m, m + n)) + list(range(m))
+    q_tableau = q_tableau[:, q_order + [m + n]]
+    q_column = {label_: position for position, label_ in enumerate(q_order)}
+    p_basis = list(range(m, m + n))
+    q_basis = [q_column[i] for i in range(m)]
+
+    max_pivots = max_pivots or 10 * (m + n) ** 2
+    entering = label
+    in_p = label < m
+    for _ in range(max_pivots):
+        if in_p:
+            leaving = _pivot(p_tableau, p_basis, entering)
+        else:
+            leaving = q_order[_pivot(q_tableau, q_basis, q_column[entering])]
+        if leaving == label:
+            break
+        entering = leaving
+        in_p = not in_p
+    else:
+        return None
+
+    x = np.zeros(m)
+    for row, variable in enumerate(p_basis):
+        if variable < m:
+            x[variable] = p_tableau[row, -1]
+    y = np.zeros(n)
+    for row, position in enumerate(q_basis):
+        variable = q_order[position]
+        if variable >= m:
+            y[variable - m] = q_tableau[row, -1]
+    return x / x.sum(), y / y.sum()
+
+
+def is_equilibrium(row_payoffs, col_payoffs, x, y, tolerance=1e-7):
+    """Confere se (x, y) é um equilíbrio: nenhum desvio puro melhora o pagamento."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    return ((row_payoffs @ y).max() <= x @ row_payoffs @ y + tolerance
+            and (x @ col_payoffs).max() <= x @ col_payoffs @ y + tolerance)
+
+
+def _expand(x, y, rows, cols, shape):
+    full_x = np.zeros(shape[0])
+    full_y = np.zeros(shape[1])
+    full_x[rows] = x
+    full_y[cols] = y
+    return full_x, full_y
+
+
+def _equilibrium(row_payoffs, col_payoffs, x, y):
+    x = np.where(np.abs(x) < TOLERANCE, 0.0, x)
+    y = np.where(np.abs(y) < TOLERANCE, 0.0, y)
+    return Equilibrium(tuple(x.tolist()), tuple(y.tolist()),
+                       float(x @ row_payoffs @ y), float(x @ col_payoffs @ y))
+
+
+def _deduplicate(equilibria):
+    unique = []
+    for eq in equilibria:
+        if not any(np.allclose(eq.row, other.row, atol=1e-7) and np.allclose(eq.col, other.col, atol=1e-7)
+                   for other in unique):
+            unique.append(eq)
+    return unique
+
+
+def _mixed_equilibria(row_payoffs, col_payoffs, rows, cols, known=(), touched=None):
+    """Equilíbrios do jogo reduzido, devolvidos no tamanho original. Retorna (lista, exaustivo).
+
+    known: equilíbrios ainda válidos, somados ao resultado. Com touched
+    (linhas e colunas editadas, em índices do jogo reduzido), `known` deve
+    conter todos os equilíbrios cujos suportes não as usam, e só os demais
+    suportes são enumerados.
+    """
+    a = row_payoffs[np.ix_(rows, cols)]
+    b = col_payoffs[np.ix_(rows, cols)]
+    if _support_pairs(len(rows), len(cols)) <= SUPPORT_LIMIT:
+        pairs = support_enumeration(a, b, touched)
+        exhaustive = True
+    else:
+        # Lemke-Howson a partir de alguns rótulos espalhados
+        pairs = []
+        labels = len(rows) + len(cols)
+        for label in range(0, labels, max(1, labels // LEMKE_HOWSON_RUNS)):
+            pair = lemke_howson(a, b, label)
+            if pair is not None:
+                pairs.append(pair)
+        exhaustive = False
+    found = [_equilibrium(row_payoffs, col_payoffs, *_expand(x, y, rows, cols, row_payoffs.shape))
+             for x, y in pairs]
+    if not exhaustive or touched is not None:
+        found = list(known) + found
+    return _deduplicate(found), exhaustive
+
+
+# --- Cache e interface ---
+_CACHE = OrderedDict()
+
+
+def _cache_get(key):
+    analysis = _CACHE.get(key)
+    if analysis is not None:
+        _CACHE.move_to_end(key)
+    return analysis
+
+
+def _cache_put(key, analysis):
+    _CACHE[key] = analysis
+    if len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
+def solve(row_payoffs, col_payoffs):
+    """Analisa o jogo: equilíbrios puros, mistos e estratégias que sobrevivem à dominância."""
+    return EquilibriumSolver(row_payoffs, col_payoffs).solve()
+
+
+class EquilibriumSolver:
+    """Equilíbrios de um jogo cujos pagamentos podem ser editados célula a célula."""
+
+    def __init__(self, row_payoffs, col_payoffs):
+        self.row_payoffs = np.array(row_payoffs, dtype=np.float64)
+        self.col_payoffs = np.array(col_payoffs, dtype=np.float64)
+        if self.row_payoffs.shape != self.col_payoffs.shape or self.row_payoffs.ndim != 2:
+            raise ValueError("As duas matrizes de pagamento devem ter a mesma forma m x n")
+        self._row_best = self.row_payoffs.max(axis=0)
+        self._col_best = self.col_payoffs.max(axis=1)
+        self._pure = _pure_mask(self.row_payoffs, self.col_payoffs)
+        self._known = []  # equilíbrios ainda válidos após edições
+        self._reduced = None  # (linhas, colunas) da última análise exaustiva
+        self._edited = (set(), set())  # linhas e colunas editadas desde então
+
+    def set_cell(self, i, j, row_payoff, col_payoff):
+        """Edita os pagamentos da célula (i, j) e atualiza o que depende dela."""
+        a, b = self.row_payoffs, self.col_payoffs
+        a[i, j] = row_payoff
+        b[i, j] = col_payoff
+        # Melhores respostas: só a coluna j (jogador linha) e a linha i (jogador coluna) mudam
+        self._row_best[j] = a[:, j].max()
+        self._col_best[i] = b[i].max()
+        self._pure[:, j] = (a[:, j] == self._row_best[j]) & (b[:, j] == self._col_best)
+        self._pure[i] = (a[i] == self._row_best) & (b[i] == self._col_best[i])
+        self._edited[0].add(int(i))
+        self._edited[1].add(int(j))
+        # Um equilíbrio com x_i = 0 e y_j = 0 não usa a célula: continua válido.
+        # Os demais são conferidos de novo.
+        kept = []
+        for eq in self._known:
+            if eq.row[i] == 0 and eq.col[j] == 0:
+                kept.append(eq)
+            elif is_equilibrium(a, b, eq.row, eq.col):
+                kept.append(_equilibrium(a, b, np.array(eq.row), np.array(eq.col)))
+        self._known = kept
+
+    def pure(self):
+        return _pure_from_mask(self._pure, self.row_payoffs, self.col_payoffs)
+
+    def solve(self):
+        key = payoff_key(self.row_payoffs, self.col_payoffs)
+        analysis = _cache_get(key)
+        if analysis is None:
+            rows, cols = iterated_dominance(self.row_payoffs, self.col_payoffs)
+            mixed, exhaustive = _mixed_equilibria(self.row_payoffs, self.col_payoffs, rows, cols,
+                                                  self._known, self._touched(rows, cols))
+            pure = self.pure()
+            mixed = [eq for eq in mixed if not any(np.allclose(eq.row, p.row) and np.allclose(eq.col, p.col)
+                                                   for p in pure)]
+            analysis = Analysis(pure, mixed, tuple(rows.tolist()), tuple(cols.tolist()), exhaustive)
+            _cache_put(key, analysis)
+        self._known = list(analysis.mixed) + list(analysis.pure)
+        self._reduced = (analysis.rows, analysis.cols) if analysis.exhaustive else None
+        self._edited = (set(), set())
+        return analysis
+
+    def _touched(self, rows, cols):
+        """Linhas e colunas editadas no jogo reduzido, se a última análise exaustiva ainda vale.
+
+        Com o mesmo jogo reduzido, os equilíbrios cujos suportes não usam
+        nenhuma célula editada não mudam: só os outros suportes são buscados.
+        """
+        if self._reduced != (tuple(rows.tolist()), tuple(cols.tolist())):
+            return None
+        edited_rows, edited_cols = self._edited
+        return ({k for k, row in enumerate(rows) if row in edited_rows},
+                {k for k, col in enumerate(cols) if col in edited_cols})
+
+
+def describe(analysis, row_actions=ACTIONS, col_actions=ACTIONS, row_name="Caprichoso", col_name="Garantido",
+             years=True):
+    """Texto com os equilíbrios.
+
+    Com years=True os pagamentos são mostrados como anos de prisão (o sinal é trocado de volta).
+    """
+    sign, unit = (-1, " anos") if years else (1, "")
+    lines = []
+    for eq in analysis.pure:
+        i, j = eq.row.index(1.0), eq.col.index(1.0)
+        lines.append(f"Puro: {row_name} {row_actions[i]}, {col_name} {col_actions[j]} "
+                     f"({sign * eq.row_payoff:g} e {sign * eq.col_payoff:g}{unit})")
+    for eq in analysis.mixed:
+        row = ", ".join(f"{name} {p:.0%}" for name, p in zip(row_actions, eq.row) if p)
+        col = ", ".join(f"{name} {p:.0%}" for name, p in zip(col_actions, eq.col) if p)
+        lines.append(f"Misto: {row_name} ({row}); {col_name} ({col}) "
+                     f"({sign * eq.row_payoff:.2f} e {sign * eq.col_payoff:.2f}{unit})")
+    if not analysis.exhaustive:
+        lines.append("(jogo grande: a lista pode não conter todos os equilíbrios)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Equilíbrios de Nash do dilema (ou de um jogo aleatório).")
+    parser.add_argument("--random", type=int, default=None, metavar="N", help="jogo aleatório N x N")
+    parser.add_argument("--edits", type=int, default=10, help="edições de célula a cronometrar")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.random is None:
+        print(describe(solve(*dilemma_matrices())))
+        return
+
+    rng = np.random.default_rng(args.seed)
+    n = args.random
+    solver = EquilibriumSolver(rng.integers(0, 100, (n, n)), rng.integers(0, 100, (n, n)))
+    start = time.perf_counter()
+    analysis = solver.solve()
+    print(f"{len(analysis.pure)} puros, {len(analysis.mixed)} mistos "
+          f"em {(time.perf_counter() - start) * 1000:.1f} ms")
+    for _ in range(args.edits):
+        i, j = rng.integers(0, n, 2)
+        start = time.perf_counter()
+        solver.set_cell(i, j, rng.integers(0, 100), rng.integers(0, 100))
+        analysis = solver.solve()
+        print(f"célula ({i}, {j}): {len(analysis.pure)} puros, {len(analysis.mixed)} mistos "
+              f"em {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# --- Exportação de Torneios em Imagens ---
+# Renderiza, fora da tela (driver "dummy" do SDL), as telas de torneios
+# gravados (CSV salvo por finish_tournament, ou JSONL/Parquet como em
+# reprocessar.py):
+#   final.png             placar final (mesma tela de _draw_final_result_screen)
+#   historico-NN.png      histórico completo, paginado
+#   rodada-NN.png         resultado de cada rodada
+#   replay/quadro-NNNNN.png   quadros de um replay do torneio (com --replay; ou .bmp)
+#
+# Cada torneio é reconstruído num Game com relógio virtual pelo
+# ScriptedDriver, e as telas são desenhadas por Game.render: a camada
+# estática de cada tela fica em cache e só o que muda (o timer, no replay) é
+# redesenhado. Quadros repetidos são codificados uma vez e copiados.
+# Vários torneios são renderizados em paralelo, um processo por núcleo.
+#
+# Os quadros do replay podem virar vídeo com, por exemplo:
+#   ffmpeg -framerate 10 -i replay/quadro-%05d.png replay.mp4
+#
+# Uso: python exportar.py sessoes/ --output imagens/ --replay
+
+import argparse
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import dilema
+from dilema import COLORS, WIDTH, Game, history_line, render_text
+from regras import ACTION_CODES, ACTIONS, RESULT_COLOR_KEY, parse_choice
+from relogio import ScriptedDriver, VirtualClock
+from reprocessar import READERS, find_files
+
+HISTORY_PER_PAGE = 20
+HISTORY_TOP = 170
+HISTORY_LINE_HEIGHT = 28
+
+
+def read_sessions(path, chunk_size=10000):
+    """Lê um arquivo e gera (nome, linhas) por torneio (coluna session, se houver)."""
+    reader = READERS[os.path.splitext(path)[1].lower()]
+    base = os.path.splitext(os.path.basename(path))[0]
+    session, rows = None, []
+    for chunk in reader(path, chunk_size):
+        for row in chunk:
+            key = row.get("session")
+            if rows and key != session:
+                yield (base if session is None else f"{base}-{session}"), rows
+                rows = []
+            session = key
+            rows.append(row)
+    if rows:
+        yield (base if session is None else f"{base}-{session}"), rows
+
+
+class _FrameWriter:
+    """Grava quadros numerados; quadros repetidos são copiados, não recodificados."""
+
+    def __init__(self, directory, extension="png"):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.extension = extension
+        self.count = 0
+
+    def save(self, repeat=1):
+        first = None
+        for _ in range(repeat):
+            self.count += 1
+            path = os.path.join(self.directory, f"quadro-{self.count:05d}.{self.extension}")
+            if first is None:
+                dilema.pygame.image.save(dilema.SCREEN, path)
+                first = path
+            else:
+                shutil.copyfile(first, path)
+
+
+def draw_history_page(game, page, per_page=HISTORY_PER_PAGE):
+    """Desenha uma página do histórico completo do torneio."""
+    screen = dilema.SCREEN
+    entries = game.history[page * per_page:(page + 1) * per_page]
+    pages = max(1, -(-len(game.history) // per_page))
+    screen.fill(COLORS["BACKGROUND"])
+
+    title = render_text("title", "HISTÓRICO DAS RODADAS", COLORS["BLACK"])
+    subtitle = render_text("small", f"Página {page + 1} de {pages}  |  Caprichoso {game.caprichoso_score} anos"
+                                    f"  |  Garantido {game.garantido_score} anos", COLORS["BLACK"])
+    screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 50))
+    screen.blit(subtitle, (WIDTH // 2 - subtitle.get_width() // 2, 110))
+
+    for i, entry in enumerate(entries):
+        color = COLORS[RESULT_COLOR_KEY[ACTION_CODES[entry["cap_choice"]]][ACTION_CODES[entry["gar_choice"]]]]
+        text = render_text("small", history_line(entry), color)
+        screen.blit(text, (50, HISTORY_TOP + i * HISTORY_LINE_HEIGHT))
+
+
+def _save(path):
+    dilema.pygame.image.save(dilema.SCREEN, path)
+
+
+def export_session(rows, directory, rounds=True, history=True, replay=False, fps=10,
+                   choose_seconds=2.0, hold_seconds=1.0, frame_format="png"):
+    """Renderiza um torneio (linhas com round, cap_rep, gar_rep, cap_choice, gar_choice).
+
+    frame_format="bmp" grava os quadros do replay sem compressão (bem mais
+    rápido que PNG, ao custo de espaço em disco). Retorna o número de imagens gravadas.
+    """
+    os.makedirs(directory, exist_ok=True)
+    clock = VirtualClock()
+    game = Game(clock=clock)
+    game.max_rounds = len(rows)
+    game.init_display(headless=True)
+    driver = ScriptedDriver(game, clock)
+    frames = _FrameWriter(os.path.join(directory, "replay"), frame_format) if replay else None
+    hold = max(1, round(hold_seconds * fps))
+    images = 0
+
+    for row in rows:
+        cap_rep, gar_rep = str(row["cap_rep"]), str(row["gar_rep"])
+        if frames:
+            game.cap_representative, game.gar_representative = cap_rep, gar_rep
+            game.render(0)
+            frames.save(hold)
+        driver.step(("start", cap_rep, gar_rep))
+        if frames:
+            # O timer anda até o momento da escolha (choose_seconds no replay)
+            for _ in range(round(choose_seconds * fps)):
+                clock.advance(1 / fps)
+                game.render(game.elapsed())
+                frames.save()
+        driver.step(("choose", "cap", ACTIONS[parse_choice(row["cap_choice"])]))
+        driver.step(("choose", "gar", ACTIONS[parse_choice(row["gar_choice"])]))
+        if rounds or frames:
+            game.render(0)
+        if rounds:
+            _save(os.path.join(directory, f"rodada-{game.current_round:02d}.png"))
+            images += 1
+        if frames:
+            frames.save(hold)
+        driver.step(("next",))
+
+    game.render(0)
+    _save(os.path.join(directory, "final.png"))
+    images += 1
+    if frames:
+        frames.save(3 * hold)
+        images += frames.count
+
+    if history:
+        for page in range(max(1, -(-len(game.history) // HISTORY_PER_PAGE))):
+            draw_history_page(game, page)
+            _save(os.path.join(directory, f"historico-{page + 1:02d}.png"))
+            images += 1
+    return images
+
+
+def export_file(path, output, **options):
+    """Exporta todos os torneios de um arquivo. Retorna [(pasta, imagens), ...]."""
+    results = []
+    for name, rows in read_sessions(path):
+        directory = os.path.join(output, name)
+        results.append((directory, export_session(rows, directory, **options)))
+    return results
+
+
+def _init_worker():
+    dilema.init_display(headless=True)
+
+
+def export_all(paths, output, workers=None, **options):
+    """Exporta os torneios de todos os arquivos, em paralelo. Retorna o total de imagens."""
+    files = list(find_files(paths))
+    total = 0
+
+    def consume(results):
+        nonlocal total
+        for file_results in results:
+            for directory, images in file_results:
+                total += images
+                print(f"{directory}: {images} imagens")
+
+    export = partial(export_file, output=output, **options)
+    if workers == 1 or len(files) <= 1:
+        _init_worker()
+        consume(map(export, files))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            consume(executor.map(export, files))
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Renderiza torneios gravados em imagens PNG (sem monitor).")
+    parser.add_argument("paths", nargs="+", help="arquivos ou diretórios de sessões")
+    parser.add_argument("--output", default="imagens", help="pasta de saída (uma subpasta por torneio)")
+    parser.add_argument("--replay", action="store_true", help="grava também os quadros do replay")
+    parser.add_argument("--fps", type=int, default=10, help="quadros por segundo do replay")
+    parser.add_argument("--frame-format", choices=("png", "bmp"), default="png",
+                        help="formato dos quadros do replay (bmp: mais rápido, maior)")
+    parser.add_argument("--no-rounds", action="store_true", help="não grava uma imagem por rodada")
+    parser.add_argument("--no-history", action="store_true", help="não grava o histórico paginado")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    args = parser.parse_args(argv)
+
+    total = export_all(args.paths, args.output, args.workers, rounds=not args.no_rounds,
+                       history=not args.no_history, replay=args.replay, fps=args.fps, frame_format=args.frame_format)
+    print(f"{total} imagens gravadas", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# --- Histórico Colunar de Rodadas ---
+# Cada coluna do histórico é um array compacto (módulo array): códigos de
+# escolha em int8, penas em int16, totais em int32 e representantes como
+# índices de uma tabela de nomes internados. Opcionalmente, cada rodada é
+# gravada num log binário só de acréscimo, de registros de tamanho fixo, que
+# pode ser aberto com numpy.memmap para análise (ver load_log).
+
+import struct
+from array import array
+
+from regras import ACTIONS, PAYOFF, RESULT_TEXT
+
+# Registro do log: sessão, rodada, escolhas, penas, totais e ids dos nomes
+RECORD = struct.Struct("<IHbbhhiiII")
+LOG_MAGIC = b"DILEMA1\n"
+
+# Colunas na mesma ordem do registro: (nome, typecode do array)
+COLUMNS = (
+    ("session", "I"),
+    ("round", "H"),
+    ("cap_choice", "b"),
+    ("gar_choice", "b"),
+    ("cap_penalty", "h"),
+    ("gar_penalty", "h"),
+    ("cap_total", "i"),
+    ("gar_total", "i"),
+    ("cap_rep", "I"),
+    ("gar_rep", "I"),
+)
+
+
+def _names_path(path):
+    """Arquivo auxiliar com os nomes internados, um por linha."""
+    return f"{path}.names"
+
+
+class RoundHistory:
+    """Histórico de rodadas guardado em colunas.
+
+    history[i] e history[a:b] devolvem dicionários com as mesmas chaves do
+    histórico antigo (round, cap_rep, cap_choice, cap_penalty, ...), montados
+    sob demanda a partir das colunas.
+    """
+
+    def __init__(self, log_path=None):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self.names = []
+        self._name_ids = {}
+        self.session = 0
+        self._log = None
+        self._names_log = None
+        if log_path is not None:
+            self.open_log(log_path)
+
+    def intern(self, name):
+        """Retorna o id do nome, registrando-o na primeira vez que aparece."""
+        name = name.replace("\n", " ").replace("\r", " ")
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+            if self._names_log is not None:
+                self._names_log.write(name + "\n")
+        return name_id
+
+    def append(self, round_number, cap_rep, gar_rep, cap_code, gar_code,
+               cap_penalty, gar_penalty, cap_total, gar_total):
+        """Acrescenta uma rodada (escolhas em códigos de regras.ACTIONS)."""
+        values = (self.session, round_number, cap_code, gar_code, cap_penalty, gar_penalty,
+                  cap_total, gar_total, self.intern(cap_rep), self.intern(gar_rep))
+        for (name, _), value in zip(COLUMNS, values):
+            self.columns[name].append(value)
+        if self._log is not None:
+            self._log.write(RECORD.pack(*values))
+
+    def extend_match(self, cap_codes, gar_codes, cap_rep="", gar_rep=""):
+        """Acrescenta uma partida inteira a partir das escolhas de cada rodada.
+
+        Útil para guardar partidas simuladas (por exemplo, motor.play_batch
+        com record=True). A partida ocupa uma sessão própria; as rodadas
+        continuam no histórico em memória.
+        """
+        if len(self) and self.columns["session"][-1] == self.session:
+            self.session += 1  # Não mistura com as rodadas da sessão atual
+        cap_total = gar_total = 0
+        for round_number, (cap_code, gar_code) in enumerate(zip(cap_codes, gar_codes), start=1):
+            cap_code, gar_code = int(cap_code), int(gar_code)
+            cap_penalty, gar_penalty = PAYOFF[cap_code][gar_code]
+            cap_total += cap_penalty
+            gar_total += gar_penalty
+            self.append(round_number, cap_rep, gar_rep, cap_code, gar_code,
+                        cap_penalty, gar_penalty, cap_total, gar_total)
+        self.session += 1
+        self.flush()
+
+    def clear(self):
+        """Esvazia o histórico em memória e inicia uma nova sessão.
+
+        O log em disco é só de acréscimo: as rodadas já gravadas continuam lá.
+        """
+        for column in self.columns.values():
+            del column[:]
+        self.session += 1
+        self.flush()
+
+    def __len__(self):
+        return len(self.columns["round"])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice fora do histórico")
+        return self._row(index)
+
+    def __iter__(self):
+        return (self._row(i) for i in range(len(self)))
+
+    def _row(self, i):
+        columns = self.columns
+        cap_code = columns["cap_choice"][i]
+        gar_code = columns["gar_choice"][i]
+        return {
+            "round": columns["round"][i],
+            "cap_rep": self.names[columns["cap_rep"][i]],
+            "gar_rep": self.names[columns["gar_rep"][i]],
+            "cap_choice": ACTIONS[cap_code],
+            "gar_choice": ACTIONS[gar_code],
+            "result_text": RESULT_TEXT[cap_code][gar_code],
+            "cap_penalty": columns["cap_penalty"][i],
+            "gar_penalty": columns["gar_penalty"][i],
+            "cap_score_total": columns["cap_total"][i],
+            "gar_score_total": columns["gar_total"][i],
+        }
+
+    def nbytes(self):
+        """Memória ocupada pelas colunas (sem contar a tabela de nomes)."""
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def to_numpy(self):
+        """Colunas como arrays NumPy, sem cópia (compartilham o buffer)."""
+        import numpy as np
+        return {name: np.frombuffer(column, dtype=column.typecode) for name, column in self.columns.items()}
+
+    def export_csv(self, file):
+        """Exporta em CSV todas as rodadas em memória (file: caminho ou arquivo aberto).
+
+        No jogo são as do torneio atual: Game.reset_game chama clear().
+        """
+        import csv
+        fieldnames = ["round", "cap_rep", "gar_rep", "cap_choice", "gar_choice",
+                      "cap_penalty", "gar_penalty", "cap_score_total", "gar_score_total"]
+        if isinstance(file, str):
+            with open(file, "w", newline="", encoding="utf-8") as handle:
+                return self.export_csv(handle)
+        writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(self)
+
+    # --- Log binário ---
+    def open_log(self, path):
+        """Passa a gravar cada rodada no log binário (criado se não existir).
+
+        Os ids de nomes do log valem a partir daqui: os nomes das rodadas já
+        em memória são acrescentados à tabela do log e as colunas, remapeadas.
+        """
+        self.close()
+        previous_names = self.names
+        names = []
+        try:
+            with open(_names_path(path), encoding="utf-8") as handle:
+                names = [line.rstrip("\n") for line in handle]
+        except FileNotFoundError:
+            pass
+        self.names = names
+        self._name_ids = {name: i for i, name in enumerate(names)}
+
+        self._log = open(path, "ab+")
+        self._log.seek(0, 2)
+        size = self._log.tell()
+        if size == 0:
+            self._log.write(LOG_MAGIC)
+        else:
+            # Continua a numeração de sessões a partir do último registro completo
+            self._log.seek(0)
+            if self._log.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                raise ValueError(f"{path} não é um log de histórico do dilema")
+            complete = (size - len(LOG_MAGIC)) // RECORD.size
+            # Descarta um registro incompleto (gravação interrompida)
+            self._log.truncate(len(LOG_MAGIC) + complete * RECORD.size)
+            if complete:
+                self._log.seek(len(LOG_MAGIC) + (complete - 1) * RECORD.size)
+                self.session = RECORD.unpack(self._log.read(RECORD.size))[0] + 1
+            self._log.seek(0, 2)
+        self._names_log = open(_names_path(path), "a", encoding="utf-8")
+        if previous_names:
+            remap = [self.intern(name) for name in previous_names]
+            for column in ("cap_rep", "gar_rep"):
+                self.columns[column] = array("I", (remap[i] for i in self.columns[column]))
+
+    def flush(self):
+        if self._log is not None:
+            self._names_log.flush()
+            self._log.flush()
+
+    def close(self):
+        if self._log is not None:
+            self.flush()
+            self._log.close()
+            self._names_log.close()
+            self._log = None
+            self._names_log = None
+
+
+def log_dtype():
+    """dtype NumPy equivalente ao registro do log."""
+    import numpy as np
+    return np.dtype([(name, "<" + typecode) for name, typecode in COLUMNS])
+
+
+def load_log(path):
+    """Abre o log com numpy.memmap, sem carregá-lo na memória.
+
+    Retorna (registros, nomes): um array estruturado com as colunas de
+    COLUMNS e a lista de nomes indexada por cap_rep/gar_rep.
+    """
+    import os
+    import numpy as np
+    dtype = log_dtype()
+    assert dtype.itemsize == RECORD.size
+    with open(path, "rb") as handle:
+        if handle.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} não é um log de histórico do dilema")
+    count = (os.path.getsize(path) - len(LOG_MAGIC)) // RECORD.size
+    if count == 0:
+        records = np.zeros(0, dtype=dtype)
+    else:
+        records = np.memmap(path, dtype=dtype, mode="r", offset=len(LOG_MAGIC), shape=(count,))
+    try:
+        with open(_names_path(path), encoding="utf-8") as handle:
+            names = [line.rstrip("\n") for line in handle]
+    except FileNotFoundError:
+        names = []
+    return records, names
@@ -0,0 +1,186 @@
+# --- Instrumentação do Loop Principal ---
+# Cronometra as fases de cada quadro de Game.run() (espera, eventos, update,
+# desenho de cada tela, flip), mantém uma janela móvel de durações para os
+# percentis p50/p99, desenha um painel sobre a tela (tecla F3) e exporta um
+# trace no formato JSON do Chrome (abre em chrome://tracing ou no Perfetto).
+#
+# Desligado, phase() devolve sempre o mesmo contexto vazio: o custo por fase
+# é uma chamada de método e nenhum relógio é lido.
+#
+# Uso: DILEMA_PROFILE=trace.json python dilema.py   (F3 mostra/esconde o painel)
+
+import json
+import os
+from collections import deque
+from contextlib import nullcontext
+from time import perf_counter
+
+FRAME_WINDOW = 600          # Quadros considerados nos percentis (~10 s a 60 FPS)
+MAX_TRACE_EVENTS = 200000   # Eventos guardados para o trace (os mais antigos saem)
+OVERLAY_REFRESH = 0.5       # Segundos entre atualizações do texto do painel
+OVERLAY_POS = (10, 10)
+OVERLAY_COLORS = {"background": (20, 20, 25), "text": (230, 230, 230), "warning": (255, 150, 80)}
+IDLE_PHASES = ("wait",)     # Fases ociosas: nunca destacadas como lentas
+
+NULL_PHASE = nullcontext()
+
+
+def percentile(sorted_values, fraction):
+    """Percentil por vizinho mais próximo de uma lista já ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class _Phase:
+    """Contexto que mede uma fase e a registra no Profiler ao sair."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """Tempos por fase e por quadro, com percentis móveis e exportação de trace."""
+
+    def __init__(self, enabled=False, window=FRAME_WINDOW, max_events=MAX_TRACE_EVENTS, trace_path=None):
+        self.enabled = enabled
+        self.trace_path = trace_path  # Onde save() grava o trace (None: não grava)
+        self.overlay_visible = False
+        self._overlay_enabled = False  # Medição ligada só por causa do painel
+        self.window = window
+        self.durations = {}                     # fase -> deque das últimas durações (s)
+        self.frames = deque(maxlen=window)      # duração total de cada quadro (s)
+        self.events = deque(maxlen=max_events)  # (fase, início, duração) para o trace
+        self._origin = perf_counter()
+        self._frame_start = None
+        self._overlay_lines = []
+        self._overlay_time = float("-inf")
+        self._overlay_size = (0, 0)
+        self._overlay_rect = None
+
+    @classmethod
+    def from_env(cls):
+        """Ligado se DILEMA_PROFILE estiver definido (o valor é o arquivo do trace)."""
+        trace_path = os.environ.get("DILEMA_PROFILE") or None
+        return cls(enabled=trace_path is not None, trace_path=trace_path)
+
+    def phase(self, name):
+        return _Phase(self, name) if self.enabled else NULL_PHASE
+
+    def record(self, name, start, duration):
+        samples = self.durations.get(name)
+        if samples is None:
+            samples = self.durations[name] = deque(maxlen=self.window)
+        samples.append(duration)
+        self.events.append((name, start, duration))
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_start = perf_counter()
+
+    def end_frame(self):
+        if self.enabled and self._frame_start is not None:
+            duration = perf_counter() - self._frame_start
+            self.frames.append(duration)
+            self.events.append(("frame", self._frame_start, duration))
+            self._frame_start = None
+
+    def stats(self):
+        """{fase: (p50, p99, amostras)} em milissegundos; o quadro inteiro é "frame"."""
+        result = {}
+        for name, samples in [("frame", self.frames)] + sorted(self.durations.items()):
+            values = sorted(samples)
+            result[name] = (percentile(values, 0.5) * 1000, percentile(values, 0.99) * 1000, len(values))
+        return result
+
+    # --- Painel na tela ---
+    def toggle_overlay(self):
+        """Mostra/esconde o painel. Retorna a visibilidade.
+
+        Se a medição estava desligada, ela só fica ligada enquanto o painel
+        estiver visível.
+        """
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self._overlay_enabled = not self.enabled
+            self.enabled = True
+            self._overlay_time = float("-inf")
+        else:
+            if self._overlay_enabled:
+                self.enabled = self._overlay_enabled = False
+            self._overlay_size = (0, 0)
+            self._overlay_rect = None
+        return self.overlay_visible
+
+    def _lines(self, frame_budget_ms):
+        lines = []
+        for name, (p50, p99, count) in self.stats().items():
+            if count:
+                slow = p99 > frame_budget_ms and name not in IDLE_PHASES
+                color = OVERLAY_COLORS["warning"] if slow else OVERLAY_COLORS["text"]
+                lines.append((name, f"p50 {p50:.2f}   p99 {p99:.2f} ms", color))
+        return lines
+
+    def draw_overlay(self, surface, font, frame_budget_ms=1000 / 60):
+        """Desenha o painel no canto da tela. Retorna o retângulo a atualizar.
+
+        O texto só é recalculado a cada OVERLAY_REFRESH segundos. Fases com
+        p99 acima do orçamento de um quadro aparecem destacadas. Enquanto
+        visível, o painel só cresce: nunca deixa restos do desenho anterior
+        fora dele. O retângulo devolvido é a união do anterior com o atual.
+        """
+        now = perf_counter()
+        if now - self._overlay_time >= OVERLAY_REFRESH:
+            self._overlay_time = now
+            self._overlay_lines = [(font.render(name, True, color), font.render(values, True, color))
+                                   for name, values, color in self._lines(frame_budget_ms)]
+        line_height = font.get_linesize()
+        name_width = max([name.get_width() for name, _ in self._overlay_lines] + [0]) + 12
+        width = name_width + max([values.get_width() for _, values in self._overlay_lines] + [120]) + 16
+        height = line_height * max(len(self._overlay_lines), 1) + 12
+        width, height = max(width, self._overlay_size[0]), max(height, self._overlay_size[1])
+        self._overlay_size = (width, height)
+        x, y = OVERLAY_POS
+        rect = surface.fill(OVERLAY_COLORS["background"], (x, y, width, height))
+        for i, (name, values) in enumerate(self._overlay_lines):
+            surface.blit(name, (x + 8, y + 6 + i * line_height))
+            surface.blit(values, (x + 8 + name_width, y + 6 + i * line_height))
+        previous, self._overlay_rect = self._overlay_rect, rect
+        return rect if previous is None else rect.union(previous)
+
+    # --- Trace ---
+    def chrome_trace(self):
+        """Eventos no formato JSON do Chrome tracing (durações completas, "ph": "X")."""
+        events = []
+        for name, start, duration in self.events:
+            events.append({
+                "name": name,
+                "cat": "frame" if name == "frame" else name.split(".")[0],
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 3),
+                "dur": round(duration * 1e6, 3),
+                "pid": os.getpid(),
+                "tid": 1 if name == "frame" else 2,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_trace(self, path):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.chrome_trace(), handle)
+
+    def save(self):
+        """Grava o trace em trace_path, se houver caminho e algo medido."""
+        if self.trace_path and self.events:
+            self.dump_trace(self.trace_path)
@@ -0,0 +1,213 @@
+# --- Jogos com N Jogadores e N Ações ---
+# Generaliza a matriz 2x2 de Game.calculate_result para jogos em forma normal
+# com qualquer número de jogadores e de ações. Todas as representações avaliam
+# lotes inteiros de perfis de ação de uma vez:
+#   game.payoffs(profiles) -> array (lote, n_jogadores)
+# onde profiles é um array de inteiros (lote, n_jogadores) com a ação de cada um.
+#
+#   DenseGame:      tensor NumPy completo (n_jogadores, a_1, ..., a_N), para jogos pequenos
+#   SparseGame:     só os perfis listados; os demais recebem um valor padrão
+#   FunctionalGame: pagamento calculado por uma função vetorizada (ex.: bens públicos)
+#
+# Uso: python jogos.py --players 40 --rounds 20 --batch 1000
+#
+# O dilema Caprichoso vs Garantido é só um caso: prisoners_dilemma().
+# Nos jogos com minimize=True (como o dilema, em anos de prisão) valores
+# menores são melhores.
+
+import argparse
+import math
+
+import numpy as np
+
+from regras import ACTIONS, PAYOFF
+
+
+class NormalFormGame:
+    """Base comum: número de jogadores, ações de cada um e sentido dos pagamentos."""
+
+    def __init__(self, n_actions, action_names=None, minimize=False):
+        self.n_actions = tuple(int(a) for a in n_actions)
+        self.n_players = len(self.n_actions)
+        self.action_names = action_names
+        self.minimize = minimize
+
+    def payoffs(self, profiles):
+        raise NotImplementedError
+
+    def _check(self, profiles):
+        profiles = np.asarray(profiles, dtype=np.intp)
+        if profiles.ndim == 1:
+            profiles = profiles[None, :]
+        if profiles.shape[1] != self.n_players:
+            raise ValueError(f"Perfis com {profiles.shape[1]} jogadores; o jogo tem {self.n_players}")
+        invalid = (profiles < 0) | (profiles >= np.asarray(self.n_actions))
+        if invalid.any():
+            row, player = np.argwhere(invalid)[0]
+            raise ValueError(f"Ação {profiles[row, player]} inválida para o jogador {player} "
+                             f"(deve estar entre 0 e {self.n_actions[player] - 1})")
+        return profiles
+
+    def utilities(self, profiles):
+        """Pagamentos no sentido "maior é melhor" (inverte o sinal se minimize)."""
+        values = self.payoffs(profiles)
+        return -values if self.minimize else values
+
+
+class DenseGame(NormalFormGame):
+    """Tensor completo de pagamentos: payoffs[jogador, ação_1, ..., ação_N]."""
+
+    def __init__(self, tensor, action_names=None, minimize=False):
+        tensor = np.asarray(tensor, dtype=np.float64)
+        super().__init__(tensor.shape[1:], action_names, minimize)
+        if tensor.shape[0] != self.n_players:
+            raise ValueError("A primeira dimensão do tensor deve ser o número de jogadores")
+        self.tensor = tensor
+        self._flat = tensor.reshape(self.n_players, -1).T  # (perfis, jogadores)
+
+    def payoffs(self, profiles):
+        profiles = self._check(profiles)
+        index = np.ravel_multi_index(tuple(profiles.T), self.n_actions)
+        return self._flat[index]
+
+
+class SparseGame(NormalFormGame):
+    """Guarda só alguns perfis; os outros pagam `default` para todos os jogadores.
+
+    entries: dicionário perfil (tupla de ações) -> pagamentos (um por jogador).
+    Os perfis são codificados num inteiro e buscados por busca binária.
+    """
+
+    def __init__(self, n_actions, entries, default=0.0, action_names=None, minimize=False):
+        super().__init__(n_actions, action_names, minimize)
+        if math.prod(self.n_actions) >= 2 ** 63:
+            raise ValueError("Espaço de perfis grande demais para SparseGame; use FunctionalGame")
+        keys = np.array([np.ravel_multi_index(profile, self.n_actions) for profile in entries],
+                        dtype=np.int64)
+        values = np.array(list(entries.values()), dtype=np.float64).reshape(len(keys), self.n_players)
+        order = np.argsort(keys)
+        self._keys = keys[order]
+        self._values = values[order]
+        self.default = default
+
+    def _encode(self, profiles):
+        keys = np.zeros(len(profiles), dtype=np.int64)
+        for player, actions in enumerate(self.n_actions):
+            keys = keys * actions + profiles[:, player]
+        return keys
+
+    def payoffs(self, profiles):
+        profiles = self._check(profiles)
+        keys = self._encode(profiles)
+        result = np.full((len(profiles), self.n_players), self.default, dtype=np.float64)
+        if len(self._keys):
+            position = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+            found = self._keys[position] == keys
+            result[found] = self._values[position[found]]
+        return result
+
+
+class FunctionalGame(NormalFormGame):
+    """Pagamentos dados por uma função vetorizada f(profiles) -> (lote, n_jogadores)."""
+
+    def __init__(self, n_actions, function, action_names=None, minimize=False):
+        super().__init__(n_actions, action_names, minimize)
+        self.function = function
+
+    def payoffs(self, profiles):
+        return np.asarray(self.function(self._check(profiles)), dtype=np.float64)
+
+
+# --- Jogos prontos ---
+def prisoners_dilemma():
+    """O dilema Caprichoso vs Garantido (anos de prisão, de regras.PAYOFF)."""
+    tensor = np.moveaxis(np.array(PAYOFF, dtype=np.float64), -1, 0)
+    return DenseGame(tensor, action_names=ACTIONS, minimize=True)
+
+
+def public_goods(n_players, multiplier=1.6, endowment=1.0, levels=2):
+    """Jogo de bens públicos com N jogadores.
+
+    A ação a (0 .. levels-1) contribui com a / (levels - 1) da dotação; o total
+    é multiplicado e dividido igualmente entre todos.
+    """
+    contributions = np.linspace(0.0, endowment, levels)
+
+    def payoff(profiles):
+        given = contributions[profiles]
+        share = multiplier * given.sum(axis=1, keepdims=True) / n_players
+        return endowment - given + share
+
+    names = tuple(f"Contribuir {c:.0%}" for c in contributions / endowment)
+    return FunctionalGame([levels] * n_players, payoff, action_names=names)
+
+
+# --- Políticas vetorizadas e loop de rodadas ---
+# Uma política recebe (perfis da rodada anterior ou None, rodada, rng) e
+# devolve as ações de todos os jogadores no lote: array (lote, n_jogadores).
+def constant_policy(game, batch, action):
+    """Todos jogam sempre a mesma ação."""
+    actions = np.full((batch, game.n_players), action, dtype=np.intp)
+    return lambda last, round_number, rng: actions
+
+
+def random_policy(game, batch):
+    """Cada jogador sorteia uma ação uniformemente."""
+    n_actions = np.array(game.n_actions)
+    return lambda last, round_number, rng: (rng.random((batch, game.n_players)) * n_actions).astype(np.intp)
+
+
+def conditional_cooperator(game, batch, threshold=0.5, cooperate=1, defect=0):
+    """Coopera se, na rodada anterior, pelo menos `threshold` dos outros cooperaram."""
+    n = game.n_players
+
+    def policy(last, round_number, rng):
+        if last is None:
+            return np.full((batch, n), cooperate, dtype=np.intp)
+        cooperating = last == cooperate
+        others = (cooperating.sum(axis=1, keepdims=True) - cooperating) / max(n - 1, 1)
+        return np.where(others >= threshold, cooperate, defect).astype(np.intp)
+    return policy
+
+
+def play_repeated(game, policy, rounds, rng=None):
+    """Joga `rounds` rodadas em lote; retorna (totais (lote, jogadores), últimos perfis)."""
+    rng = np.random.default_rng(rng)
+    last = None
+    totals = None
+    for round_number in range(rounds):
+        profiles = policy(last, round_number, rng)
+        payoffs = game.payoffs(profiles)
+        totals = payoffs if totals is None else totals + payoffs
+        last = profiles
+    return totals, last
+
+
+POLICIES = ("condicional", "aleatorio", "cooperar", "desertar")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jogo de bens públicos com N jogadores (uma turma inteira).")
+    parser.add_argument("--players", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=1000, help="partidas simuladas em paralelo")
+    parser.add_argument("--multiplier", type=float, default=1.6)
+    parser.add_argument("--policy", choices=POLICIES, default="condicional")
+    parser.add_argument("--threshold", type=float, default=0.5, help="limiar do cooperador condicional")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    game = public_goods(args.players, args.multiplier)
+    policy = {
+        "condicional": lambda: conditional_cooperator(game, args.batch, args.threshold),
+        "aleatorio": lambda: random_policy(game, args.batch),
+        "cooperar": lambda: constant_policy(game, args.batch, 1),
+        "desertar": lambda: constant_policy(game, args.batch, 0),
+    }[args.policy]()
+    totals, last = play_repeated(game, policy, args.rounds, args.seed)
+    print(f"Ganho médio por jogador: {totals.mean():.3f} em {args.rounds} rodadas")
+    print(f"Contribuição na última rodada: {last.mean():.1%}")
+
+
+if __name__ == "__main__":
+    main()
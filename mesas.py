@@ -0,0 +1,336 @@
+# --- Modo Multi-Mesas ---
+# Várias partidas independentes (por exemplo, 30 duplas num laboratório) num
+# único processo: um só loop de eventos e de desenho, e um único agendador de
+# prazos no lugar de uma consulta a time.time() por mesa. As mesas são
+# desenhadas lado a lado numa grade.
+#
+# Uso: python mesas.py --tables 30 --rounds 20 --round-time 10
+
+import argparse
+import heapq
+import math
+import sys
+import time
+
+import dilema
+from dilema import COLORS, WIDTH, HEIGHT, GameState, RetainedLayer, draw_timer_dial, render_text
+from regras import ACTIONS, PAYOFF, RESULT_COLOR_KEY, DEFAULT_CHOICE, choice_code, winner
+
+# Tempo (s) que o resultado de uma rodada fica na tela antes da próxima
+RESULT_TIME = 3
+
+# Botões de cada mesa: nome -> (equipe, escolha, coluna entre 0 e 3)
+TILE_BUTTONS = {
+    "cap_confess": ("cap", "Confessar", 0),
+    "cap_negar": ("cap", "Negar", 1),
+    "gar_confess": ("gar", "Confessar", 2),
+    "gar_negar": ("gar", "Negar", 3),
+}
+
+
+class Table:
+    """Estado compacto de uma partida Caprichoso vs Garantido."""
+
+    __slots__ = ("index", "state", "current_round", "max_rounds", "round_time",
+                 "cap_choice", "gar_choice", "cap_score", "gar_score", "deadline", "result_color")
+
+    def __init__(self, index, max_rounds=20, round_time=10):
+        self.index = index
+        self.state = GameState.REPRESENTATIVE
+        self.current_round = 1
+        self.max_rounds = max_rounds
+        self.round_time = round_time
+        self.cap_choice = None
+        self.gar_choice = None
+        self.cap_score = 0
+        self.gar_score = 0
+        self.deadline = 0.0
+        self.result_color = COLORS["BLACK"]
+
+    def start_round(self, now):
+        """Abre a fase de escolha da rodada atual; retorna o prazo final."""
+        self.state = GameState.CHOOSING
+        self.cap_choice = None
+        self.gar_choice = None
+        self.deadline = now + self.round_time
+        return self.deadline
+
+    def choose(self, team, choice):
+        """Registra a escolha de uma equipe. Retorna True se a rodada terminou."""
+        if choice not in ACTIONS:
+            raise ValueError(f"Escolha inválida: {choice!r}")
+        if self.state != GameState.CHOOSING:
+            return False
+        if team == "cap":
+            self.cap_choice = choice
+        elif team == "gar":
+            self.gar_choice = choice
+        else:
+            raise ValueError(f"Equipe desconhecida: {team!r}")
+        if self.cap_choice is not None and self.gar_choice is not None:
+            self.resolve()
+            return True
+        return False
+
+    def timeout(self):
+        """Fim do tempo: quem não escolheu fica com a escolha padrão."""
+        if self.cap_choice is None:
+            self.cap_choice = DEFAULT_CHOICE
+        if self.gar_choice is None:
+            self.gar_choice = DEFAULT_CHOICE
+        self.resolve()
+
+    def resolve(self):
+        """Aplica as penas da rodada (mesma matriz de Game.calculate_result)."""
+        cap_code = choice_code(self.cap_choice)
+        gar_code = choice_code(self.gar_choice)
+        cap_penalty, gar_penalty = PAYOFF[cap_code][gar_code]
+        self.cap_score += cap_penalty
+        self.gar_score += gar_penalty
+        self.result_color = COLORS[RESULT_COLOR_KEY[cap_code][gar_code]]
+        self.state = GameState.RESULT
+
+    def next_round(self):
+        """Como no Game: volta à tela de representantes da próxima rodada.
+
+        Retorna False se a última rodada já foi jogada (vai ao resultado final).
+        """
+        if self.current_round >= self.max_rounds:
+            self.state = GameState.FINAL_RESULT
+            return False
+        self.current_round += 1
+        self.cap_choice = None
+        self.gar_choice = None
+        self.state = GameState.REPRESENTATIVE
+        return True
+
+    def advance(self, now):
+        """Passa para a próxima rodada ou para o resultado final.
+
+        Retorna o prazo da nova rodada, ou None se o torneio acabou.
+        """
+        if self.current_round < self.max_rounds:
+            self.current_round += 1
+            return self.start_round(now)
+        self.state = GameState.FINAL_RESULT
+        return None
+
+
+class TableManager:
+    """Conduz N mesas com um único agendador de prazos e um único loop."""
+
+    def __init__(self, n_tables, max_rounds=20, round_time=10, result_time=RESULT_TIME, fps=dilema.FPS):
+        self.tables = [Table(i, max_rounds, round_time) for i in range(n_tables)]
+        self.result_time = result_time
+        self.fps = fps
+        # Agendador: heap de (instante, mesa, rodada, estado esperado)
+        self._schedule = []
+        self._layer = RetainedLayer()
+
+        self.columns = math.ceil(math.sqrt(n_tables * WIDTH / HEIGHT)) or 1
+        self.rows = math.ceil(n_tables / self.columns) or 1
+        self.tile_width = WIDTH // self.columns
+        self.tile_height = HEIGHT // self.rows
+
+    def start(self, now):
+        """Inicia a primeira rodada de todas as mesas."""
+        for table in self.tables:
+            self._schedule_timeout(table, table.start_round(now))
+
+    def _schedule_timeout(self, table, deadline):
+        heapq.heappush(self._schedule, (deadline, table.index, table.current_round, GameState.CHOOSING))
+
+    def choose(self, index, team, choice, now):
+        """Registra uma escolha; se a rodada terminar, agenda a próxima."""
+        table = self.tables[index]
+        if table.choose(team, choice):
+            heapq.heappush(self._schedule, (now + self.result_time, index, table.current_round,
+                                            GameState.RESULT))
+
+    def update(self, now):
+        """Dispara todos os prazos vencidos até `now`.
+
+        Entradas antigas (de rodadas já resolvidas por escolha) são ignoradas:
+        só valem se a mesa ainda estiver na mesma rodada e no mesmo estado.
+        """
+        schedule = self._schedule
+        while schedule and schedule[0][0] <= now:
+            when, index, round_number, expected_state = heapq.heappop(schedule)
+            table = self.tables[index]
+            if table.current_round != round_number or table.state != expected_state:
+                continue
+            if expected_state == GameState.CHOOSING:
+                table.timeout()
+                heapq.heappush(schedule, (when + self.result_time, index, round_number, GameState.RESULT))
+            else:
+                deadline = table.advance(when)
+                if deadline is not None:
+                    self._schedule_timeout(table, deadline)
+
+    # --- Layout e desenho ---
+    def tile_rect(self, index):
+        """Retângulo (x, y, largura, altura) da mesa na grade."""
+        row, column = divmod(index, self.columns)
+        return (column * self.tile_width, row * self.tile_height, self.tile_width, self.tile_height)
+
+    def _button_rect(self, tile, column):
+        """Retângulo de um dos quatro botões na base da mesa."""
+        x, y, width, height = tile
+        button_width = (width - 10) // 4
+        button_height = max(12, height // 5)
+        return (x + 5 + column * button_width, y + height - button_height - 4, button_width - 2, button_height)
+
+    def table_at(self, pos):
+        """Retorna (índice da mesa, nome do botão ou None) na posição do clique."""
+        column = pos[0] // self.tile_width
+        row = pos[1] // self.tile_height
+        index = row * self.columns + column
+        if column >= self.columns or index >= len(self.tables):
+            return None, None
+        tile = self.tile_rect(index)
+        pygame = dilema.pygame
+        for name, (_, _, button_column) in TILE_BUTTONS.items():
+            if pygame.Rect(self._button_rect(tile, button_column)).collidepoint(pos):
+                return index, name
+        return index, None
+
+    def _dial(self, table):
+        """Centro e raio do timer da mesa."""
+        x, y, width, height = self.tile_rect(table.index)
+        return (x + width // 2, y + height // 2), max(6, min(width, height) // 6)
+
+    def _dial_rect(self, table):
+        """Retângulo ocupado pelo timer da mesa."""
+        (center_x, center_y), radius = self._dial(table)
+        return (center_x - radius, center_y - radius, 2 * radius + 1, 2 * radius + 1)
+
+    def _body_signature(self, table):
+        """O que muda no desenho da mesa, exceto o arco do timer."""
+        return (table.state, table.current_round, table.cap_choice, table.gar_choice,
+                table.cap_score, table.gar_score)
+
+    def _draw_dial(self, table, now):
+        """Desenha o timer da mesa (só na fase de escolha)."""
+        center, radius = self._dial(table)
+        remaining = max(0.0, table.deadline - now)
+        dial_rect = self._dial_rect(table)
+        dilema.SCREEN.set_clip(dial_rect)
+        dilema.SCREEN.fill(COLORS["SCOREBOARD_BG"], dial_rect)  # Fundo da mesa sob o timer
+        draw_timer_dial(dilema.SCREEN, center, radius, 1 - remaining / table.round_time, remaining, "tile")
+        dilema.SCREEN.set_clip(None)
+
+    def _draw_table(self, table):
+        """Desenha uma mesa compacta: cabeçalho, placar, resultado e botões."""
+        pygame = dilema.pygame
+        screen = dilema.SCREEN
+        tile = self.tile_rect(table.index)
+        x, y, width, height = tile
+        screen.set_clip(tile)  # Textos longos não invadem as mesas vizinhas
+
+        border = table.result_color if table.state in (GameState.RESULT, GameState.FINAL_RESULT) else COLORS["GRAY"]
+        pygame.draw.rect(screen, COLORS["SCOREBOARD_BG"], (x + 2, y + 2, width - 4, height - 4), border_radius=6)
+        pygame.draw.rect(screen, border, (x + 2, y + 2, width - 4, height - 4), 2, border_radius=6)
+
+        header = render_text("tile", f"#{table.index + 1} R{table.current_round}/{table.max_rounds}",
+                             COLORS["BLACK"])
+        screen.blit(header, (x + 6, y + 4))
+        cap_score = render_text("tile", f"{table.cap_score}", COLORS["BLUE"])
+        gar_score = render_text("tile", f"{table.gar_score}", COLORS["RED"])
+        screen.blit(cap_score, (x + 6, y + 6 + header.get_height()))
+        screen.blit(gar_score, (x + width - 6 - gar_score.get_width(), y + 6 + header.get_height()))
+
+        center, radius = self._dial(table)
+        if table.state == GameState.FINAL_RESULT:
+            result_winner = winner(table.cap_score, table.gar_score)
+            if result_winner == "Caprichoso":
+                label, color = "CAP", COLORS["BLUE"]
+            elif result_winner == "Garantido":
+                label, color = "GAR", COLORS["RED"]
+            else:
+                label, color = "EMPATE", COLORS["GREEN"]
+            text = render_text("tile", label, color)
+            screen.blit(text, (center[0] - text.get_width() // 2, center[1] - text.get_height() // 2))
+        elif table.state == GameState.RESULT:
+            pygame.draw.circle(screen, table.result_color, center, radius)
+
+        for name, (team, choice, column) in TILE_BUTTONS.items():
+            rect = self._button_rect(tile, column)
+            team_color = COLORS["BLUE"] if team == "cap" else COLORS["RED"]
+            chosen = (table.cap_choice if team == "cap" else table.gar_choice) == choice
+            pygame.draw.rect(screen, team_color if chosen else COLORS["WHITE"], rect, border_radius=3)
+            pygame.draw.rect(screen, team_color, rect, 1, border_radius=3)
+            label = render_text("tile", choice[0], COLORS["WHITE"] if chosen else team_color)
+            screen.blit(label, (rect[0] + rect[2] // 2 - label.get_width() // 2,
+                                rect[1] + rect[3] // 2 - label.get_height() // 2))
+        screen.set_clip(None)
+
+    def _draw_background(self):
+        dilema.SCREEN.fill(COLORS["BACKGROUND"])
+
+    def render(self, now):
+        """Redesenha só as mesas que mudaram; mesmo contrato de Game.render.
+
+        Cada mesa tem dois widgets: o corpo e o timer. Enquanto só o arco
+        avança, apenas o retângulo do timer é redesenhado; quando o corpo
+        muda, o timer (que fica por cima dele) é redesenhado junto.
+        """
+        widgets = []
+        for table in self.tables:
+            body = self._body_signature(table)
+            widgets.append((("body", table.index), self.tile_rect(table.index), body,
+                            lambda table=table: self._draw_table(table)))
+            if table.state == GameState.CHOOSING:
+                remaining = max(0.0, table.deadline - now)
+                dial = (body, int(360 * (1 - remaining / table.round_time)), int(remaining))
+                widgets.append((("dial", table.index), self._dial_rect(table), dial,
+                                lambda table=table: self._draw_dial(table, now)))
+        return self._layer.update(len(self.tables), self._draw_background, widgets)
+
+    def run(self, headless=False):
+        """Loop único de eventos, agendamento e desenho para todas as mesas."""
+        dilema.init_display(headless)
+        pygame = dilema.pygame
+        pygame.display.set_caption(f"Dilema do Prisioneiro - {len(self.tables)} mesas")
+        clock = pygame.time.Clock()
+
+        self.start(time.monotonic())
+        running = True
+        while running:
+            now = time.monotonic()  # Uma única leitura do relógio por quadro
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self._layer.invalidate()
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    index, button = self.table_at(event.pos)
+                    if button is not None:
+                        team, choice, _ = TILE_BUTTONS[button]
+                        self.choose(index, team, choice, now)
+            self.update(now)
+
+            dirty = self.render(now)
+            if dirty is None:
+                pygame.display.flip()
+            elif dirty:
+                pygame.display.update(dirty)
+            clock.tick(self.fps)
+
+        pygame.quit()
+        sys.exit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Várias partidas simultâneas numa única janela.")
+    parser.add_argument("--tables", type=int, default=30, help="número de mesas")
+    parser.add_argument("--rounds", type=int, default=20, help="rodadas por partida")
+    parser.add_argument("--round-time", type=float, default=10, help="segundos por rodada")
+    parser.add_argument("--result-time", type=float, default=RESULT_TIME, help="segundos exibindo o resultado")
+    args = parser.parse_args(argv)
+
+    manager = TableManager(args.tables, args.rounds, args.round_time, args.result_time)
+    manager.run()
+
+
+if __name__ == "__main__":
+    main()
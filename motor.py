@@ -0,0 +1,115 @@
+# --- Motor de Simulação (sem interface gráfica) ---
+# Joga lotes de partidas iteradas Confessar/Negar com NumPy, sem abrir janela.
+# As escolhas viram códigos inteiros (regras.CONFESSAR = 0, regras.NEGAR = 1)
+# e as penas são lidas da matriz por indexação, sem comparar strings.
+
+from collections import namedtuple
+
+import numpy as np
+
+from regras import PAYOFF, ACTIONS
+
+# Matriz de penas como arrays: PAYOFF_CAP[cap, gar] e PAYOFF_GAR[cap, gar]
+PAYOFF_MATRIX = np.array(PAYOFF, dtype=np.int16)
+PAYOFF_CAP = PAYOFF_MATRIX[..., 0]
+PAYOFF_GAR = PAYOFF_MATRIX[..., 1]
+
+# Tabelas achatadas indexadas pelo resultado conjunto (cap * 2 + gar)
+JOINT_PAYOFF_CAP = PAYOFF_CAP.ravel()
+JOINT_PAYOFF_GAR = PAYOFF_GAR.ravel()
+
+# Estratégias de memória um, na perspectiva de quem joga:
+# (prob. de confessar na 1ª rodada,
+#  prob. de confessar após (eu confessei, ele confessou),
+#  após (eu confessei, ele negou), após (eu neguei, ele confessou),
+#  após (eu neguei, ele negou))
+STRATEGIES = {
+    "Sempre Confessar": (1.0, 1.0, 1.0, 1.0, 1.0),
+    "Sempre Negar": (0.0, 0.0, 0.0, 0.0, 0.0),
+    "Olho por Olho": (0.0, 1.0, 0.0, 1.0, 0.0),
+    "Rancoroso": (0.0, 1.0, 1.0, 1.0, 0.0),
+    "Aleatório": (0.5, 0.5, 0.5, 0.5, 0.5),
+    "Pavlov": (0.0, 0.0, 1.0, 1.0, 0.0),
+}
+
+BatchResult = namedtuple("BatchResult", "cap_total gar_total cap_moves gar_moves")
+
+
+def register_strategy(name, first, after_cc, after_cn, after_nc, after_nn):
+    """Registra uma estratégia de memória um definida pelo usuário."""
+    probs = (first, after_cc, after_cn, after_nc, after_nn)
+    if not all(0.0 <= p <= 1.0 for p in probs):
+        raise ValueError(f"Probabilidades fora de [0, 1] na estratégia {name!r}: {probs}")
+    STRATEGIES[name] = tuple(float(p) for p in probs)
+    return STRATEGIES[name]
+
+
+def resolve_strategy(strategy):
+    """Aceita o nome de uma estratégia registrada ou a tupla de probabilidades."""
+    if isinstance(strategy, str):
+        return STRATEGIES[strategy]
+    return tuple(strategy)
+
+
+def score_rounds(cap_codes, gar_codes):
+    """Calcula as penas de vários pares de escolhas (códigos) de uma vez."""
+    cap_codes = np.asarray(cap_codes, dtype=np.intp)
+    gar_codes = np.asarray(gar_codes, dtype=np.intp)
+    return PAYOFF_CAP[cap_codes, gar_codes], PAYOFF_GAR[cap_codes, gar_codes]
+
+
+def play_batch(cap_strategy, gar_strategy, max_rounds=20, n_matches=1, rng=None, record=False):
+    """Joga n_matches partidas de max_rounds rodadas em paralelo.
+
+    Retorna um BatchResult com as penas totais de cada partida (int32) e,
+    se record=True, as escolhas de cada rodada em arrays (n_matches, max_rounds).
+    """
+    cap = np.asarray(resolve_strategy(cap_strategy), dtype=np.float64)
+    gar = np.asarray(resolve_strategy(gar_strategy), dtype=np.float64)
+    rng = np.random.default_rng(rng)
+
+    cap_total = np.zeros(n_matches, dtype=np.int32)
+    gar_total = np.zeros(n_matches, dtype=np.int32)
+    cap_moves = np.empty((n_matches, max_rounds), dtype=np.int8) if record else None
+    gar_moves = np.empty((n_matches, max_rounds), dtype=np.int8) if record else None
+
+    # Probabilidades de confessar na primeira rodada
+    p_cap = cap[0]
+    p_gar = gar[0]
+    for r in range(max_rounds):
+        # Como CONFESSAR = 0 e NEGAR = 1, "sorteio >= p" já é o código da ação
+        cap_codes = (rng.random(n_matches) >= p_cap).astype(np.int8)
+        gar_codes = (rng.random(n_matches) >= p_gar).astype(np.int8)
+
+        joint = cap_codes * 2 + gar_codes
+        cap_total += JOINT_PAYOFF_CAP[joint]
+        gar_total += JOINT_PAYOFF_GAR[joint]
+
+        if record:
+            cap_moves[:, r] = cap_codes
+            gar_moves[:, r] = gar_codes
+
+        # Cada lado enxerga o resultado da rodada na sua própria perspectiva
+        p_cap = cap[1 + joint]
+        p_gar = gar[1 + gar_codes * 2 + cap_codes]
+
+    return BatchResult(cap_total, gar_total, cap_moves, gar_moves)
+
+
+def sweep(strategy_names, rounds_options, n_matches=1000, seed=None):
+    """Varre pares de estratégias e valores de max_rounds.
+
+    Gera tuplas (cap, gar, max_rounds, pena média cap, pena média gar).
+    """
+    seeds = np.random.SeedSequence(seed)
+    for cap_name in strategy_names:
+        for gar_name in strategy_names:
+            for max_rounds in rounds_options:
+                result = play_batch(cap_name, gar_name, max_rounds, n_matches, seeds.spawn(1)[0])
+                yield (cap_name, gar_name, max_rounds,
+                       float(result.cap_total.mean()), float(result.gar_total.mean()))
+
+
+def moves_to_names(codes):
+    """Converte uma sequência de códigos de ação em "Confessar"/"Negar"."""
+    return [ACTIONS[int(c)] for c in codes]
@@ -0,0 +1,189 @@
+# --- Dinâmica Evolutiva de Populações ---
+# Uma população de agentes, cada um seguindo uma estratégia de motor.STRATEGIES,
+# joga o dilema iterado (penas de Game.calculate_result) e as frequências das
+# estratégias evoluem ao longo das gerações.
+#
+# A matriz de penas esperadas entre pares de estratégias é calculada uma só vez
+# (as estratégias não mudam durante a simulação), de forma exata por
+# analitico.expected_matrix ou por Monte Carlo; depois disso, no replicador
+# e em Wright-Fisher, cada geração custa apenas um produto matriz-vetor e um
+# sorteio sobre k estratégias, sem depender do número de agentes. O processo
+# de Moran exato (--batch 1) faz N eventos por geração, um sorteio por evento:
+# custo O(N) por geração; --batch B agrupa os eventos (O(N/B), aproximado).
+#
+# Uso: python populacao.py --method wright-fisher --population 100000 --generations 10000
+
+import argparse
+
+import numpy as np
+
+from analitico import expected_matrix
+from motor import PAYOFF_MATRIX, STRATEGIES, play_batch
+
+METHODS = ("replicator", "wright-fisher", "moran")
+
+
+def payoff_matrix(strategies, max_rounds=20, repetitions=None, seed=None):
+    """years[i, j] = anos médios de prisão da estratégia i jogando contra j.
+
+    strategies: lista de nomes registrados ou de tuplas de memória n.
+    Com repetitions=None o valor é exato (cadeia de Markov, ver analitico.py);
+    caso contrário é a média de `repetitions` partidas simuladas.
+    """
+    if repetitions is None:
+        return expected_matrix(strategies, max_rounds)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(len(strategies) ** 2)
+    years = np.empty((len(strategies), len(strategies)))
+    for i, cap in enumerate(strategies):
+        for j, gar in enumerate(strategies):
+            batch = play_batch(cap, gar, max_rounds, repetitions, seeds[i * len(strategies) + j])
+            years[i, j] = batch.cap_total.mean()
+    return years
+
+
+def benefit_matrix(years, max_rounds):
+    """Converte anos de prisão em benefício entre 0 (pior pena) e 1 (melhor pena)."""
+    worst = PAYOFF_MATRIX.max() * max_rounds
+    best = PAYOFF_MATRIX.min() * max_rounds
+    return (worst - np.asarray(years, dtype=np.float64)) / (worst - best)
+
+
+def _fitness(benefit, selection):
+    """Aptidão com intensidade de seleção w: 1 - w + w * benefício."""
+    return 1.0 - selection + selection * benefit
+
+
+def replicator(benefit, frequencies, generations, selection=1.0, mutation=0.0, record_every=1):
+    """Dinâmica do replicador em tempo discreto (população infinita, determinística)."""
+    x = np.asarray(frequencies, dtype=np.float64)
+    x = x / x.sum()
+    k = len(x)
+    trajectory = [x.copy()]
+    for generation in range(1, generations + 1):
+        fitness = _fitness(benefit @ x, selection)
+        x = x * fitness
+        x /= x.sum()
+        if mutation:
+            x = (1.0 - mutation) * x + mutation / k
+        if generation % record_every == 0:
+            trajectory.append(x.copy())
+    return np.array(trajectory)
+
+
+def _finite_fitness(benefit, counts, population, selection):
+    """Aptidão numa população finita: cada agente joga contra todos os outros (exceto ele)."""
+    payoff = (benefit @ counts - np.diag(benefit)) / max(population - 1, 1)
+    return _fitness(payoff, selection)
+
+
+def wright_fisher(benefit, counts, generations, selection=1.0, mutation=0.0, rng=None, record_every=1):
+    """Processo de Wright-Fisher: a geração seguinte inteira é sorteada de uma vez.
+
+    Os descendentes são uma amostra multinomial proporcional a contagem x aptidão.
+    """
+    rng = np.random.default_rng(rng)
+    counts = np.asarray(counts, dtype=np.int64)
+    population = int(counts.sum())
+    k = len(counts)
+    trajectory = [counts / population]
+    for generation in range(1, generations + 1):
+        weights = counts * _finite_fitness(benefit, counts, population, selection)
+        probs = weights / weights.sum()
+        if mutation:
+            probs = (1.0 - mutation) * probs + mutation / k
+        counts = rng.multinomial(population, probs)
+        if generation % record_every == 0:
+            trajectory.append(counts / population)
+    return np.array(trajectory)
+
+
+def moran(benefit, counts, generations, selection=1.0, mutation=0.0, rng=None, record_every=1, batch=1):
+    """Processo de Moran (nascimento-morte); uma geração são N eventos.
+
+    Em cada evento, um agente se reproduz com probabilidade proporcional à
+    aptidão e um agente sorteado uniformemente morre. Com batch=1 o processo
+    é exato; com batch > 1, `batch` eventos são sorteados juntos com a mesma
+    aptidão (aproximação útil para populações muito grandes). O custo de
+    uma geração é de N / batch sorteios.
+    """
+    rng = np.random.default_rng(rng)
+    counts = np.asarray(counts, dtype=np.int64)
+    population = int(counts.sum())
+    k = len(counts)
+    batch = max(1, min(int(batch), population))
+    trajectory = [counts / population]
+    for generation in range(1, generations + 1):
+        remaining = population
+        while remaining > 0:
+            events = min(batch, remaining)
+            remaining -= events
+            weights = counts * _finite_fitness(benefit, counts, population, selection)
+            probs = weights / weights.sum()
+            if mutation:
+                probs = (1.0 - mutation) * probs + mutation / k
+            deaths = rng.multivariate_hypergeometric(counts, events)
+            births = rng.multinomial(events, probs)
+            counts = counts - deaths + births
+        if generation % record_every == 0:
+            trajectory.append(counts / population)
+    return np.array(trajectory)
+
+
+def simulate(strategies=None, method="wright-fisher", population=1000, generations=1000,
+             max_rounds=20, selection=1.0, mutation=0.0, repetitions=None, seed=None,
+             record_every=1, batch=1):
+    """Simula a população partindo de frequências iguais.
+
+    Retorna (nomes, trajetória) com as frequências de cada estratégia a cada
+    `record_every` gerações (a primeira linha é a população inicial).
+    """
+    names = list(STRATEGIES if strategies is None else strategies)
+    if method not in METHODS:
+        raise ValueError(f"Método desconhecido: {method!r} (use um de {METHODS})")
+    seeds = np.random.SeedSequence(seed).spawn(2)
+    benefit = benefit_matrix(payoff_matrix(names, max_rounds, repetitions, seeds[0]), max_rounds)
+
+    k = len(names)
+    if method == "replicator":
+        trajectory = replicator(benefit, np.full(k, 1.0 / k), generations, selection, mutation, record_every)
+    else:
+        counts = np.full(k, population // k)
+        counts[:population % k] += 1
+        rng = np.random.default_rng(seeds[1])
+        if method == "wright-fisher":
+            trajectory = wright_fisher(benefit, counts, generations, selection, mutation, rng, record_every)
+        else:
+            trajectory = moran(benefit, counts, generations, selection, mutation, rng, record_every, batch)
+    return names, trajectory
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dinâmica evolutiva das estratégias do dilema.")
+    parser.add_argument("--method", choices=METHODS, default="wright-fisher")
+    parser.add_argument("--population", type=int, default=1000)
+    parser.add_argument("--generations", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20, help="rodadas por partida")
+    parser.add_argument("--selection", type=float, default=1.0, help="intensidade de seleção (0 a 1)")
+    parser.add_argument("--mutation", type=float, default=0.0, help="taxa de mutação por geração")
+    parser.add_argument("--batch", type=int, default=1, help="eventos por sorteio no processo de Moran")
+    parser.add_argument("--repetitions", type=int, default=None,
+                        help="estimar as penas com N partidas simuladas (padrão: cálculo exato)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    names, trajectory = simulate(method=args.method, population=args.population,
+                                 generations=args.generations, max_rounds=args.rounds,
+                                 selection=args.selection, mutation=args.mutation,
+                                 repetitions=args.repetitions, seed=args.seed,
+                                 record_every=max(1, args.generations // 10),
+                                 batch=args.batch)
+    width = max(len(name) for name in names)
+    print(f"{'Estratégia':<{width}}  {'Inicial':>8}  {'Final':>8}")
+    for name, start, end in zip(names, trajectory[0], trajectory[-1]):
+        print(f"{name:<{width}}  {start:>8.3f}  {end:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
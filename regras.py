@@ -0,0 +1,63 @@
+# --- Regras do Dilema do Prisioneiro ---
+# Módulo sem dependências (nem Pygame, nem NumPy): pode ser importado por
+# processos que só precisam pontuar rodadas.
+
+# Códigos das ações. O código é o índice da linha/coluna da matriz de penas.
+CONFESSAR = 0
+NEGAR = 1
+ACTIONS = ("Confessar", "Negar")
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+# Matriz de penas 2x2: PAYOFF[escolha_cap][escolha_gar] = (pena_cap, pena_gar)
+PAYOFF = (
+    ((3, 3), (1, 10)),   # Caprichoso confessa
+    ((10, 1), (2, 2)),   # Caprichoso nega
+)
+
+# Texto e chave de cor (em COLORS) exibidos para cada resultado
+RESULT_TEXT = (
+    ("Ambos: 3 anos de prisão", "Caprichoso: 1 ano | Garantido: 10 anos"),
+    ("Caprichoso: 10 anos | Garantido: 1 ano", "Ambos: 2 anos de prisão (pena original)"),
+)
+RESULT_COLOR_KEY = (
+    ("ORANGE", "BLUE"),
+    ("RED", "GREEN"),
+)
+
+# Escolha atribuída a quem não decidir dentro do tempo da rodada
+DEFAULT_CHOICE = "Negar"
+
+
+def choice_code(choice):
+    """Converte "Confessar"/"Negar" no código numérico da ação."""
+    return ACTION_CODES[choice]
+
+
+def parse_choice(value):
+    """Código da ação a partir do nome ("Confessar"/"Negar") ou do código (0/1, também em texto).
+
+    Usado na leitura de sessões gravadas, que guardam a escolha de uma das duas formas.
+    """
+    if isinstance(value, str) and value in ACTION_CODES:
+        return ACTION_CODES[value]
+    code = int(value)
+    if code not in (CONFESSAR, NEGAR):
+        raise ValueError(f"Escolha inválida: {value!r}")
+    return code
+
+
+def penalties(cap_choice, gar_choice):
+    """Retorna (pena_cap, pena_gar) para um par de escolhas por nome."""
+    return PAYOFF[ACTION_CODES[cap_choice]][ACTION_CODES[gar_choice]]
+
+
+def winner(cap_score, gar_score):
+    """Vencedor do torneio: quem tiver o menor tempo total de prisão.
+
+    Retorna "Caprichoso", "Garantido" ou None em caso de empate.
+    """
+    if cap_score < gar_score:
+        return "Caprichoso"
+    if gar_score < cap_score:
+        return "Garantido"
+    return None
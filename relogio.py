@@ -0,0 +1,105 @@
+# --- Relógios e Roteiros de Entrada ---
+# O Game lê o tempo por um relógio injetável (Game(clock=...)) em vez de
+# chamar time.time() diretamente:
+#   RealClock:      hora do sistema (time.time)
+#   MonotonicClock: relógio monotônico (padrão; não pula com ajustes de hora)
+#   VirtualClock:   só anda quando mandado (advance), para testes e benchmarks
+#
+# ScriptedDriver conduz um Game por um roteiro de ações, sem Pygame e sem
+# esperar: com um VirtualClock, um torneio de 20 rodadas com timeouts é
+# reproduzido em microssegundos, sempre com o mesmo resultado.
+
+import random
+import time
+
+
+class RealClock:
+    """Hora do sistema, em segundos."""
+
+    def now(self):
+        return time.time()
+
+
+class MonotonicClock:
+    """Relógio monotônico do sistema, em segundos."""
+
+    def now(self):
+        return time.monotonic()
+
+
+class VirtualClock:
+    """Relógio controlado manualmente: o tempo só passa com advance()."""
+
+    def __init__(self, start=0.0):
+        self.time = float(start)
+
+    def now(self):
+        return self.time
+
+    def advance(self, seconds):
+        if seconds < 0:
+            raise ValueError("O relógio virtual não volta no tempo")
+        self.time += seconds
+        return self.time
+
+
+class ScriptedDriver:
+    """Executa um roteiro de ações num Game ligado a um VirtualClock.
+
+    Ações do roteiro (tuplas):
+      ("start", cap_rep, gar_rep)   inicia a rodada (nomes vazios usam o padrão)
+      ("choose", team, choice)      team é "cap" ou "gar"; choice é "Confessar" ou "Negar"
+      ("wait", seconds)             avança o relógio e deixa o jogo reagir (timeouts)
+      ("next",)                     próxima rodada (ou resultado final após a última)
+      ("reset",)                    novo torneio
+    """
+
+    def __init__(self, game, clock=None):
+        self.game = game
+        self.clock = clock if clock is not None else game.clock
+        if not isinstance(self.clock, VirtualClock):
+            raise TypeError("ScriptedDriver precisa de um VirtualClock")
+
+    def step(self, action):
+        kind, *args = action
+        game = self.game
+        if kind == "start":
+            game.start_round(*args)
+        elif kind == "choose":
+            game.choose(*args)
+        elif kind == "wait":
+            self.clock.advance(*args)
+            game.update()
+        elif kind == "next":
+            game.next_round()
+        elif kind == "reset":
+            game.reset_game()
+        else:
+            raise ValueError(f"Ação desconhecida no roteiro: {kind!r}")
+
+    def play(self, script):
+        for action in script:
+            self.step(action)
+        return self.game
+
+
+def tournament_script(rounds=20, round_time=10, seed=None, timeout_rate=0.25):
+    """Roteiro de um torneio completo com escolhas sorteadas (reprodutível com `seed`).
+
+    Em cada rodada, cada equipe deixa o tempo esgotar com probabilidade
+    `timeout_rate`; senão escolhe Confessar ou Negar ao acaso.
+    """
+    rng = random.Random(seed)
+    script = []
+    for round_number in range(1, rounds + 1):
+        script.append(("start", f"Cap {round_number}", f"Gar {round_number}"))
+        timed_out = False
+        for team in ("cap", "gar"):
+            if rng.random() < timeout_rate:
+                timed_out = True
+            else:
+                script.append(("choose", team, rng.choice(("Confessar", "Negar"))))
+        if timed_out:
+            script.append(("wait", round_time))
+        script.append(("next",))
+    return script
@@ -0,0 +1,232 @@
+# --- Reprocessamento de Torneios Gravados ---
+# Lê arquivos de sessões (CSV, JSONL ou Parquet) em blocos, sem carregar tudo
+# na memória, e recalcula para cada torneio os totais, o vencedor (mesma regra
+# da tela de resultado final), as taxas de cooperação (Negar) e estatísticas
+# por representante. Vários arquivos são processados em paralelo.
+#
+# Colunas esperadas: round, cap_rep, gar_rep, cap_choice, gar_choice
+# (escolhas por nome ou código) e, opcionalmente, session. Sem a coluna
+# session, cada arquivo é um torneio. As linhas de um mesmo torneio devem
+# estar contíguas: um torneio é fechado assim que a sessão muda.
+#
+# Uso: python reprocessar.py sessoes/ arquivo.jsonl --output resumo.csv --reps-output reps.csv
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from regras import NEGAR, PAYOFF, parse_choice, winner
+
+EXTENSIONS = (".csv", ".jsonl", ".parquet")
+SESSION_FIELDS = ["file", "session", "rounds", "cap_total", "gar_total", "winner",
+                  "cap_cooperation", "gar_cooperation"]
+REP_FIELDS = ["team", "representative", "rounds", "cooperations", "cooperation_rate", "years", "years_per_round"]
+
+
+def _read_csv(path, chunk_size):
+    with open(path, newline="", encoding="utf-8") as handle:
+        chunk = []
+        for row in csv.DictReader(handle):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _read_jsonl(path, chunk_size):
+    with open(path, encoding="utf-8") as handle:
+        chunk = []
+        for line in handle:
+            if line.strip():
+                chunk.append(json.loads(line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+
+def _read_parquet(path, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Ler Parquet requer o pacote pyarrow (pip install pyarrow)") from None
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+READERS = {".csv": _read_csv, ".jsonl": _read_jsonl, ".parquet": _read_parquet}
+
+
+class _Session:
+    """Acumuladores de um torneio em andamento."""
+
+    __slots__ = ("session", "rounds", "cap_total", "gar_total", "cap_coop", "gar_coop")
+
+    def __init__(self, session):
+        self.session = session
+        self.rounds = 0
+        self.cap_total = 0
+        self.gar_total = 0
+        self.cap_coop = 0
+        self.gar_coop = 0
+
+    def summary(self, file):
+        result_winner = winner(self.cap_total, self.gar_total)
+        rounds = self.rounds or 1
+        return {
+            "file": file,
+            "session": self.session,
+            "rounds": self.rounds,
+            "cap_total": self.cap_total,
+            "gar_total": self.gar_total,
+            "winner": result_winner or "Empate",
+            "cap_cooperation": round(self.cap_coop / rounds, 4),
+            "gar_cooperation": round(self.gar_coop / rounds, 4),
+        }
+
+
+def score_file(path, chunk_size=10000):
+    """Reprocessa um arquivo. Retorna (resumos dos torneios, estatísticas por representante).
+
+    As estatísticas por representante são um dicionário
+    (equipe, nome) -> [rodadas, cooperações, anos].
+    """
+    reader = READERS[os.path.splitext(path)[1].lower()]
+    default_session = os.path.basename(path)
+    sessions = []
+    reps = {}
+    current = None
+
+    for chunk in reader(path, chunk_size):
+        for row in chunk:
+            session = row.get("session", default_session)
+            if current is None or session != current.session:
+                if current is not None:
+                    sessions.append(current.summary(path))
+                current = _Session(session)
+
+            cap_code = parse_choice(row["cap_choice"])
+            gar_code = parse_choice(row["gar_choice"])
+            cap_penalty, gar_penalty = PAYOFF[cap_code][gar_code]
+            current.rounds += 1
+            current.cap_total += cap_penalty
+            current.gar_total += gar_penalty
+            current.cap_coop += cap_code == NEGAR
+            current.gar_coop += gar_code == NEGAR
+
+            for team, name, code, penalty in (("cap", row["cap_rep"], cap_code, cap_penalty),
+                                              ("gar", row["gar_rep"], gar_code, gar_penalty)):
+                stats = reps.get((team, name))
+                if stats is None:
+                    stats = reps[(team, name)] = [0, 0, 0]
+                stats[0] += 1
+                stats[1] += code == NEGAR
+                stats[2] += penalty
+
+    if current is not None:
+        sessions.append(current.summary(path))
+    return sessions, reps
+
+
+def find_files(paths):
+    """Expande diretórios em arquivos com extensões suportadas (ordem estável).
+
+    Arquivos passados explicitamente precisam existir e ter uma extensão
+    suportada; senão, ValueError.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in sorted(os.walk(path)):
+                for name in sorted(names):
+                    if name.lower().endswith(EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif not os.path.exists(path):
+            raise ValueError(f"{path}: arquivo não encontrado")
+        elif not path.lower().endswith(EXTENSIONS):
+            raise ValueError(f"{path}: formato não suportado (use {', '.join(EXTENSIONS)})")
+        else:
+            yield path
+
+
+def rescore(paths, output, reps_output=None, workers=None, chunk_size=10000):
+    """Reprocessa todos os arquivos, escrevendo um resumo por torneio em `output`.
+
+    Os resumos são gravados à medida que cada arquivo termina; só as
+    estatísticas por representante ficam acumuladas na memória.
+    Retorna o número de torneios processados.
+    """
+    files = list(find_files(paths))
+    writer = csv.DictWriter(output, fieldnames=SESSION_FIELDS)
+    writer.writeheader()
+    totals = {}
+    count = 0
+
+    def consume(results):
+        nonlocal count
+        for sessions, reps in results:
+            writer.writerows(sessions)
+            count += len(sessions)
+            for key, (rounds, cooperations, years) in reps.items():
+                stats = totals.setdefault(key, [0, 0, 0])
+                stats[0] += rounds
+                stats[1] += cooperations
+                stats[2] += years
+
+    chunk_sizes = [chunk_size] * len(files)
+    if workers == 1 or len(files) <= 1:
+        consume(map(score_file, files, chunk_sizes))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            consume(executor.map(score_file, files, chunk_sizes))
+
+    if reps_output is not None:
+        rep_writer = csv.DictWriter(reps_output, fieldnames=REP_FIELDS)
+        rep_writer.writeheader()
+        for (team, name), (rounds, cooperations, years) in sorted(totals.items()):
+            rep_writer.writerow({
+                "team": team,
+                "representative": name,
+                "rounds": rounds,
+                "cooperations": cooperations,
+                "cooperation_rate": round(cooperations / rounds, 4),
+                "years": years,
+                "years_per_round": round(years / rounds, 4),
+            })
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprocessa torneios gravados (CSV, JSONL, Parquet).")
+    parser.add_argument("paths", nargs="+", help="arquivos ou diretórios de sessões")
+    parser.add_argument("--output", default="-", help="CSV com um resumo por torneio (padrão: saída padrão)")
+    parser.add_argument("--reps-output", default=None, help="CSV com estatísticas por representante")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="linhas lidas por bloco")
+    args = parser.parse_args(argv)
+    try:
+        files = list(find_files(args.paths))
+    except ValueError as error:
+        parser.error(str(error))
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    reps_output = None
+    if args.reps_output:
+        reps_output = open(args.reps_output, "w", newline="", encoding="utf-8")
+    try:
+        count = rescore(files, output, reps_output, args.workers, args.chunk_size)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if reps_output is not None:
+            reps_output.close()
+    print(f"{count} torneios reprocessados", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
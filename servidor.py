@@ -0,0 +1,348 @@
+# --- Servidor de Jogo em Rede (asyncio) ---
+# Cada equipe joga do seu próprio computador. O servidor hospeda várias
+# partidas ao mesmo tempo, usa a mesma máquina de estados do jogo
+# (REPRESENTATIVE -> CHOOSING -> RESULT -> ... -> FINAL_RESULT) e controla o
+# timer de 10 segundos de cada rodada.
+#
+# Protocolo: uma mensagem JSON por linha, sobre TCP.
+#   cliente -> servidor:
+#     {"type": "join", "match": "sala-1", "team": "cap" | "gar", "name": "Ana"}
+#     {"type": "representative", "name": "Bia"}   (troca o representante)
+#     {"type": "choose", "choice": "Confessar" | "Negar"}
+#     {"type": "next"}                             (próxima rodada)
+#   O nome do join (ou o último "representative") continua valendo nas
+#   rodadas seguintes: depois de "next", a rodada começa sozinha.
+#   servidor -> cliente:
+#     {"type": "state", ...}   após qualquer mudança na partida
+#     {"type": "error", "message": "..."}
+#
+# Uso: python servidor.py serve --port 8765
+#      python servidor.py play --match sala-1 --team cap --name Ana
+
+import argparse
+import asyncio
+import json
+
+from dilema import GameState
+from mesas import Table
+from regras import ACTIONS, RESULT_TEXT, choice_code, winner
+
+TEAMS = ("cap", "gar")
+
+
+class Match:
+    """Uma partida hospedada no servidor, com o timer autoritativo da rodada."""
+
+    def __init__(self, match_id, max_rounds=20, round_time=10):
+        self.match_id = match_id
+        self.table = Table(0, max_rounds, round_time)
+        self.writers = {"cap": None, "gar": None}
+        self.representatives = {"cap": "", "gar": ""}  # Representantes da rodada atual
+        self.names = {"cap": None, "gar": None}  # Representante de cada equipe nas próximas rodadas
+        self._timer = None  # asyncio.TimerHandle do fim da rodada
+
+    def set_representative(self, team, name):
+        """Registra o representante da equipe; a rodada começa quando ambos chegarem.
+
+        O nome continua valendo nas rodadas seguintes, até ser trocado.
+        """
+        table = self.table
+        if table.state != GameState.REPRESENTATIVE:
+            raise ValueError("Representantes só podem ser trocados entre as rodadas")
+        self.names[team] = name
+        name = name.strip()[:15] or f"Representante {'Caprichoso' if team == 'cap' else 'Garantido'} {table.current_round}"
+        self.representatives[team] = name
+
+        if all(self.representatives.values()):
+            loop = asyncio.get_running_loop()
+            deadline = table.start_round(loop.time())
+            self._timer = loop.call_at(deadline, self._timeout)
+
+    def choose(self, team, choice):
+        if self.table.state != GameState.CHOOSING:
+            raise ValueError("Não é hora de escolher")
+        if choice not in ACTIONS:
+            raise ValueError(f"Escolha inválida: {choice!r}")
+        if self.table.choose(team, choice):
+            self._cancel_timer()
+
+    def next_round(self):
+        if self.table.state != GameState.RESULT:
+            raise ValueError("A rodada ainda não terminou")
+        self.table.next_round()
+        self.representatives = {"cap": "", "gar": ""}
+        if self.table.state == GameState.REPRESENTATIVE:
+            for team in TEAMS:
+                if self.names[team] is not None:
+                    self.set_representative(team, self.names[team])
+
+    def _timeout(self):
+        """Fim do tempo: o servidor completa as escolhas com o padrão."""
+        self._timer = None
+        if self.table.state == GameState.CHOOSING:
+            self.table.timeout()
+            self.broadcast()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def reset(self):
+        """Novo torneio na mesma partida (revanche): quem continua conectado segue nela.
+
+        Só as equipes conectadas mantêm o representante.
+        """
+        self._cancel_timer()
+        table = self.table
+        self.table = Table(0, table.max_rounds, table.round_time)
+        self.representatives = {"cap": "", "gar": ""}
+        for team in TEAMS:
+            if self.writers[team] is None:
+                self.names[team] = None
+            elif self.names[team] is not None:
+                self.set_representative(team, self.names[team])
+
+    def close(self):
+        self._cancel_timer()
+
+    def state_message(self):
+        """Estado visível para os clientes (a escolha do adversário só aparece no resultado)."""
+        table = self.table
+        message = {
+            "type": "state",
+            "match": self.match_id,
+            "state": table.state,
+            "round": table.current_round,
+            "max_rounds": table.max_rounds,
+            "cap_score": table.cap_score,
+            "gar_score": table.gar_score,
+            "cap_representative": self.representatives["cap"],
+            "gar_representative": self.representatives["gar"],
+            "cap_ready": table.cap_choice is not None,
+            "gar_ready": table.gar_choice is not None,
+            "connected": [team for team in TEAMS if self.writers[team] is not None],
+        }
+        if table.state == GameState.CHOOSING:
+            message["time_left"] = max(0.0, table.deadline - asyncio.get_running_loop().time())
+        if table.state in (GameState.RESULT, GameState.FINAL_RESULT) and table.cap_choice is not None:
+            message["cap_choice"] = table.cap_choice
+            message["gar_choice"] = table.gar_choice
+            message["result_text"] = RESULT_TEXT[choice_code(table.cap_choice)][choice_code(table.gar_choice)]
+        if table.state == GameState.FINAL_RESULT:
+            message["winner"] = winner(table.cap_score, table.gar_score)
+        return message
+
+    def broadcast(self):
+        """Envia o estado para as duas equipes sem bloquear o loop."""
+        data = encode(self.state_message())
+        for writer in self.writers.values():
+            if writer is not None and not writer.is_closing():
+                writer.write(data)
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class PlayServer:
+    """Servidor TCP que hospeda muitas partidas com I/O não bloqueante."""
+
+    def __init__(self, max_rounds=20, round_time=10):
+        self.max_rounds = max_rounds
+        self.round_time = round_time
+        self.matches = {}
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """Começa a aceitar conexões; port=0 escolhe uma porta livre."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        for match in self.matches.values():
+            match.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        match = team = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("Cada mensagem deve ser um objeto JSON")
+                    if match is None:
+                        if message.get("type") != "join":
+                            raise ValueError("Envie join primeiro")
+                        match, team = self._join(message, writer)
+                    else:
+                        self._dispatch(match, team, message)
+                except (ValueError, KeyError, TypeError, asyncio.LimitOverrunError) as error:
+                    writer.write(encode({"type": "error", "message": str(error)}))
+                    continue
+                match.broadcast()
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if match is not None and match.writers[team] is writer:
+                match.writers[team] = None
+                if any(match.writers.values()):
+                    match.broadcast()
+                else:  # As duas equipes saíram: a partida é descartada
+                    match.close()
+                    self.matches.pop(match.match_id, None)
+            writer.close()
+
+    def _join(self, message, writer):
+        team = message["team"]
+        if team not in TEAMS:
+            raise ValueError(f"Equipe inválida: {team!r} (use 'cap' ou 'gar')")
+        match_id = str(message["match"])
+        match = self.matches.get(match_id)
+        if match is None:
+            match = self.matches[match_id] = Match(match_id, self.max_rounds, self.round_time)
+        if match.writers[team] is not None:
+            raise ValueError(f"A equipe {team!r} já está conectada em {match_id!r}")
+        if match.table.state == GameState.FINAL_RESULT:
+            match.reset()  # No mesmo objeto: a outra equipe, se conectada, recebe o novo estado
+
+        match.writers[team] = writer
+        if "name" in message:
+            if match.table.state == GameState.REPRESENTATIVE:
+                match.set_representative(team, str(message["name"]))
+            else:
+                match.names[team] = str(message["name"])  # Vale a partir da próxima rodada
+        return match, team
+
+    def _dispatch(self, match, team, message):
+        kind = message.get("type")
+        if kind == "representative":
+            match.set_representative(team, str(message["name"]))
+        elif kind == "choose":
+            match.choose(team, message["choice"])
+        elif kind == "next":
+            match.next_round()
+        else:
+            raise ValueError(f"Mensagem desconhecida: {kind!r}")
+
+
+class PlayClient:
+    """Cliente simples do protocolo, usado pela linha de comando e em testes locais."""
+
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+
+    async def connect(self, host="127.0.0.1", port=8765):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    async def send(self, message):
+        self.writer.write(encode(message))
+        await self.writer.drain()
+
+    async def receive(self):
+        """Próxima mensagem do servidor (None se a conexão foi fechada)."""
+        line = await self.reader.readline()
+        return json.loads(line) if line else None
+
+    async def wait_for(self, predicate):
+        """Lê mensagens até uma satisfazer predicate(mensagem) e a retorna."""
+        while True:
+            message = await self.receive()
+            if message is None or predicate(message):
+                return message
+
+    async def join(self, match_id, team, name=""):
+        await self.send({"type": "join", "match": match_id, "team": team, "name": name})
+
+    async def representative(self, name):
+        await self.send({"type": "representative", "name": name})
+
+    async def choose(self, choice):
+        await self.send({"type": "choose", "choice": choice})
+
+    async def next_round(self):
+        await self.send({"type": "next"})
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _play_interactive(host, port, match_id, team, name):
+    """Cliente de texto: c = Confessar, n = Negar, p = próxima rodada, r NOME = troca o representante."""
+    client = PlayClient()
+    await client.connect(host, port)
+    await client.join(match_id, team, name)
+    loop = asyncio.get_running_loop()
+
+    async def show_messages():
+        while (message := await client.receive()) is not None:
+            print(message)
+
+    print("Comandos: c = Confessar, n = Negar, p = próxima rodada, r NOME = troca o representante, q = sair")
+    printer = asyncio.create_task(show_messages())
+    try:
+        while True:
+            command = (await loop.run_in_executor(None, input)).strip()
+            if command == "c":
+                await client.choose("Confessar")
+            elif command == "n":
+                await client.choose("Negar")
+            elif command == "p":
+                await client.next_round()
+            elif command.startswith("r "):
+                await client.representative(command[2:])
+            elif command == "q":
+                break
+    finally:
+        printer.cancel()
+        await client.close()
+
+
+async def _serve(host, port, max_rounds, round_time):
+    server = PlayServer(max_rounds, round_time)
+    address = await server.start(host, port)
+    print(f"Servidor ouvindo em {address[0]}:{address[1]}")
+    await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dilema do Prisioneiro em rede.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="inicia o servidor")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--rounds", type=int, default=20)
+    serve.add_argument("--round-time", type=float, default=10)
+
+    play = commands.add_parser("play", help="cliente de texto para uma equipe")
+    play.add_argument("--host", default="127.0.0.1")
+    play.add_argument("--port", type=int, default=8765)
+    play.add_argument("--match", required=True)
+    play.add_argument("--team", choices=TEAMS, required=True)
+    play.add_argument("--name", default="")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "serve":
+            asyncio.run(_serve(args.host, args.port, args.rounds, args.round_time))
+        else:
+            asyncio.run(_play_interactive(args.host, args.port, args.match, args.team, args.name))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Testes dos agentes (agentes.py): salvar e carregar um agente treinado e
+# usá-lo como equipe automática no Game, com o relógio virtual.
+#
+# Uso: python -m pytest test_agentes.py   (ou python -m unittest test_agentes)
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from agentes import AGENTS, N_STATES, PolicyChooser, load_agent, make_agent, save_agent, train
+from dilema import Game, GameState
+from regras import ACTIONS, CONFESSAR, NEGAR
+from relogio import ScriptedDriver, VirtualClock
+
+
+class SaveLoadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_after_training(self):
+        for kind in AGENTS:
+            with self.subTest(kind=kind):
+                agent = make_agent(kind, "gar")
+                train(make_agent("fictitious", "cap"), agent, episodes=3, n_envs=64, max_rounds=5, rng=0)
+                path = os.path.join(self.directory.name, f"{kind}.npz")
+                save_agent(agent, path)
+                loaded = load_agent(path)
+                self.assertIs(type(loaded), type(agent))
+                self.assertEqual((loaded.team, loaded.params()), ("gar", agent.params()))
+                for name in agent.TABLES:
+                    np.testing.assert_array_equal(getattr(loaded, name), getattr(agent, name))
+                self.assertEqual(loaded.policy(), agent.policy())
+                self.assertEqual(len(loaded.policy()), N_STATES)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            make_agent("minimax")
+
+    def test_loaded_policy_plays_as_automatic_team(self):
+        # Q-table de Olho por Olho para Garantido: nega na primeira rodada e
+        # depois repete a última ação de Caprichoso (estado 1 + minha * 2 + dele)
+        agent = make_agent("q", "gar")
+        for state in range(N_STATES):
+            theirs = None if state == 0 else (state - 1) % 2
+            best = CONFESSAR if theirs == CONFESSAR else NEGAR
+            agent.q[state, best] = 1.0
+        path = os.path.join(self.directory.name, "olho.npz")
+        save_agent(agent, path)
+        chooser = PolicyChooser.from_file(path, seed=1)
+        self.assertEqual(chooser.policy, (0.0, 1.0, 0.0, 1.0, 0.0))
+
+        game = Game(clock=VirtualClock(), choosers={"gar": chooser})
+        driver = ScriptedDriver(game)
+        cap_choices = ["Confessar", "Negar", "Negar", "Confessar"]
+        for choice in cap_choices:
+            driver.play([("start", "Ana", ""), ("wait", 1), ("choose", "cap", choice)])
+            self.assertEqual(game.current_state, GameState.RESULT)
+            driver.step(("next",))
+        self.assertEqual([row["gar_choice"] for row in game.history], ["Negar"] + cap_choices[:-1])
+
+        # Sem escolha humana, o agente também joga quando o tempo acaba
+        driver.play([("start", "Ana", ""), ("wait", game.round_time)])
+        self.assertEqual(game.current_state, GameState.RESULT)
+        self.assertEqual(game.gar_choice, cap_choices[-1])
+
+    def test_chooser_rejects_wrong_policy(self):
+        with self.assertRaises(ValueError):
+            PolicyChooser((0.5,) * (N_STATES - 1))
+        chooser = PolicyChooser((0.5,) * N_STATES, seed=3)
+        self.assertIn(chooser(Game(clock=VirtualClock()), "cap"), ACTIONS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+# Testes da solução exata (analitico.py) contra enumeração por força bruta de
+# todos os históricos de uma partida curta.
+#
+# Uso: python -m pytest test_analitico.py   (ou python -m unittest test_analitico)
+
+import itertools
+import random
+import unittest
+
+from analitico import expected_matrix, expected_years, long_run_years, memory_length, memory_two
+from motor import STRATEGIES
+from regras import PAYOFF
+
+
+def _confess_prob(strategy, history):
+    """P(confessar) dado o histórico, na perspectiva de quem joga (meu * 2 + adversário)."""
+    n = memory_length(strategy)
+    level = min(len(history), n)
+    offset = sum(4 ** k for k in range(level))
+    index = 0
+    for mine, theirs in history[len(history) - level:]:
+        index = index * 4 + mine * 2 + theirs
+    return strategy[offset + index]
+
+
+def brute_force_years(cap, gar, rounds):
+    """Penas esperadas somando todas as 4**rounds sequências de resultados."""
+    cap_years = gar_years = 0.0
+    for outcomes in itertools.product(itertools.product((0, 1), repeat=2), repeat=rounds):
+        probability = 1.0
+        cap_total = gar_total = 0
+        for k, (cap_action, gar_action) in enumerate(outcomes):
+            cap_history = [(c, g) for c, g in outcomes[:k]]
+            gar_history = [(g, c) for c, g in outcomes[:k]]
+            p_cap = _confess_prob(cap, cap_history)
+            p_gar = _confess_prob(gar, gar_history)
+            probability *= (p_cap if cap_action == 0 else 1 - p_cap) * (p_gar if gar_action == 0 else 1 - p_gar)
+            cap_penalty, gar_penalty = PAYOFF[cap_action][gar_action]
+            cap_total += cap_penalty
+            gar_total += gar_penalty
+        cap_years += probability * cap_total
+        gar_years += probability * gar_total
+    return cap_years, gar_years
+
+
+def average_years(cap, gar, rounds):
+    """Pena média por rodada ao longo de `rounds` rodadas, propagando a distribuição dos históricos."""
+    memory = max(memory_length(cap), memory_length(gar), 1)
+    distribution = {(): 1.0}
+    totals = [0.0, 0.0]
+    for _ in range(rounds):
+        following = {}
+        for history, probability in distribution.items():
+            p_cap = _confess_prob(cap, list(history))
+            p_gar = _confess_prob(gar, [(g, c) for c, g in history])
+            for cap_action, gar_action in itertools.product((0, 1), repeat=2):
+                p = probability * (p_cap if cap_action == 0 else 1 - p_cap) * (p_gar if gar_action == 0 else 1 - p_gar)
+                if p:
+                    cap_penalty, gar_penalty = PAYOFF[cap_action][gar_action]
+                    totals[0] += p * cap_penalty
+                    totals[1] += p * gar_penalty
+                    key = (history + ((cap_action, gar_action),))[-memory:]
+                    following[key] = following.get(key, 0.0) + p
+        distribution = following
+    return totals[0] / rounds, totals[1] / rounds
+
+
+class ExpectedYearsTest(unittest.TestCase):
+
+    def test_memory_one_against_brute_force(self):
+        names = list(STRATEGIES)
+        for cap, gar in itertools.product(names, repeat=2):
+            with self.subTest(cap=cap, gar=gar):
+                exact = expected_years(cap, gar, max_rounds=5)
+                expected = brute_force_years(STRATEGIES[cap], STRATEGIES[gar], 5)
+                self.assertAlmostEqual(exact[0], expected[0], places=9)
+                self.assertAlmostEqual(exact[1], expected[1], places=9)
+
+    def test_memory_two_and_random_strategies(self):
+        rng = random.Random(4)
+        mixed = tuple(rng.random() for _ in range(5))
+        two = memory_two(rng.random(), [rng.random() for _ in range(4)], [rng.random() for _ in range(16)])
+        for cap, gar in ((two, mixed), (mixed, two), (two, two)):
+            for rounds in (1, 2, 4):
+                exact = expected_years(cap, gar, max_rounds=rounds)
+                expected = brute_force_years(cap, gar, rounds)
+                self.assertAlmostEqual(exact[0], expected[0], places=9)
+                self.assertAlmostEqual(exact[1], expected[1], places=9)
+
+    def test_known_matches(self):
+        self.assertEqual(expected_years("Olho por Olho", "Olho por Olho", 20), (40.0, 40.0))
+        self.assertEqual(expected_years("Sempre Confessar", "Sempre Negar", 20), (20.0, 200.0))
+        # Olho por Olho perde só a primeira rodada contra Sempre Confessar
+        self.assertEqual(expected_years("Olho por Olho", "Sempre Confessar", 20), (10 + 19 * 3, 1 + 19 * 3))
+
+    def test_expected_matrix(self):
+        names = ["Sempre Confessar", "Olho por Olho", "Aleatório"]
+        years = expected_matrix(names, max_rounds=6)
+        for i, cap in enumerate(names):
+            for j, gar in enumerate(names):
+                self.assertAlmostEqual(years[i, j], brute_force_years(STRATEGIES[cap], STRATEGIES[gar], 6)[0])
+
+
+class LongRunYearsTest(unittest.TestCase):
+
+    def test_ergodic_chains_match_long_average(self):
+        rng = random.Random(9)
+        for _ in range(3):
+            cap = tuple(0.05 + 0.9 * rng.random() for _ in range(5))
+            gar = memory_two(0.05 + 0.9 * rng.random(),
+                             [0.05 + 0.9 * rng.random() for _ in range(4)],
+                             [0.05 + 0.9 * rng.random() for _ in range(16)])
+            exact = long_run_years(cap, gar)
+            average = average_years(cap, gar, 3000)
+            self.assertAlmostEqual(exact[0], average[0], places=2)
+            self.assertAlmostEqual(exact[1], average[1], places=2)
+
+    def test_deterministic_chains(self):
+        # Cadeias redutíveis (o limite depende da abertura) ou periódicas
+        for cap, gar in itertools.product(["Olho por Olho", "Rancoroso", "Pavlov", "Sempre Confessar"], repeat=2):
+            with self.subTest(cap=cap, gar=gar):
+                exact = long_run_years(cap, gar)
+                average = average_years(STRATEGIES[cap], STRATEGIES[gar], 2000)
+                self.assertAlmostEqual(exact[0], average[0], places=2)
+                self.assertAlmostEqual(exact[1], average[1], places=2)
+        # Olho por Olho contra si mesmo fica para sempre em (Negar, Negar); contra
+        # Sempre Confessar, Pavlov alterna entre Negar e Confessar
+        self.assertEqual(tuple(round(v, 9) for v in long_run_years("Olho por Olho", "Olho por Olho")), (2.0, 2.0))
+        self.assertEqual(tuple(round(v, 9) for v in long_run_years("Sempre Confessar", "Pavlov")), (2.0, 6.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Testes do EquilibriumSolver (equilibrio.py) em jogos conhecidos e da
+# edição de células seguida de nova análise.
+#
+# Uso: python -m pytest test_equilibrio.py   (ou python -m unittest test_equilibrio)
+
+import unittest
+
+import numpy as np
+
+from equilibrio import EquilibriumSolver, clear_cache, dilemma_matrices, is_equilibrium, solve
+from regras import CONFESSAR
+
+MATCHING_PENNIES = ([[1, -1], [-1, 1]], [[-1, 1], [1, -1]])
+BATTLE_OF_THE_SEXES = ([[2, 0], [0, 1]], [[1, 0], [0, 2]])
+
+
+def _profiles(equilibria):
+    """Perfis (x, y) arredondados e ordenados, para comparar conjuntos de equilíbrios."""
+    return sorted((tuple(np.round(eq.row, 6).tolist()), tuple(np.round(eq.col, 6).tolist())) for eq in equilibria)
+
+
+class KnownGamesTest(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+
+    def test_prisoners_dilemma(self):
+        analysis = solve(*dilemma_matrices())
+        self.assertEqual(len(analysis.pure), 1)
+        self.assertEqual(analysis.mixed, [])
+        eq = analysis.pure[0]
+        self.assertEqual(eq.row[CONFESSAR], 1.0)
+        self.assertEqual(eq.col[CONFESSAR], 1.0)
+        self.assertEqual((eq.row_payoff, eq.col_payoff), (-3.0, -3.0))
+        # Negar é estritamente dominada para os dois
+        self.assertEqual((analysis.rows, analysis.cols), ((CONFESSAR,), (CONFESSAR,)))
+
+    def test_matching_pennies(self):
+        analysis = solve(*MATCHING_PENNIES)
+        self.assertEqual(analysis.pure, [])
+        self.assertEqual(_profiles(analysis.mixed), [((0.5, 0.5), (0.5, 0.5))])
+        self.assertAlmostEqual(analysis.mixed[0].row_payoff, 0.0)
+        self.assertTrue(analysis.exhaustive)
+
+    def test_battle_of_the_sexes(self):
+        analysis = solve(*BATTLE_OF_THE_SEXES)
+        self.assertEqual(_profiles(analysis.pure), [((0.0, 1.0), (0.0, 1.0)), ((1.0, 0.0), (1.0, 0.0))])
+        self.assertEqual(_profiles(analysis.mixed), [((0.666667, 0.333333), (0.333333, 0.666667))])
+        self.assertAlmostEqual(analysis.mixed[0].row_payoff, 2 / 3)
+        self.assertAlmostEqual(analysis.mixed[0].col_payoff, 2 / 3)
+
+
+class EditTest(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+
+    def test_edit_turns_pennies_into_coordination(self):
+        solver = EquilibriumSolver(*MATCHING_PENNIES)
+        solver.solve()
+        # Com (1, 1) na diagonal e (-1, -1) fora dela o jogo vira de coordenação
+        solver.set_cell(0, 0, 1, 1)
+        solver.set_cell(0, 1, -1, -1)
+        solver.set_cell(1, 0, -1, -1)
+        solver.set_cell(1, 1, 1, 1)
+        analysis = solver.solve()
+        self.assertEqual(_profiles(analysis.pure), [((0.0, 1.0), (0.0, 1.0)), ((1.0, 0.0), (1.0, 0.0))])
+        self.assertEqual(_profiles(analysis.mixed), [((0.5, 0.5), (0.5, 0.5))])
+
+    def test_edits_match_fresh_solve(self):
+        rng = np.random.default_rng(11)
+        for _ in range(5):
+            a, b = rng.normal(size=(2, 6, 6))
+            solver = EquilibriumSolver(a, b)
+            solver.solve()
+            for _ in range(4):
+                i, j = rng.integers(6, size=2)
+                rp, cp = rng.normal(size=2)
+                solver.set_cell(i, j, rp, cp)
+                a[i, j], b[i, j] = rp, cp
+                incremental = solver.solve()
+                clear_cache()
+                fresh = solve(a, b)
+                self.assertEqual(_profiles(incremental.pure), _profiles(fresh.pure))
+                self.assertEqual(_profiles(incremental.mixed), _profiles(fresh.mixed))
+                for eq in incremental.mixed:
+                    self.assertTrue(is_equilibrium(a, b, eq.row, eq.col))
+
+    def test_large_game_uses_lemke_howson(self):
+        rng = np.random.default_rng(2)
+        a, b = rng.normal(size=(2, 40, 40))
+        solver = EquilibriumSolver(a, b)
+        analysis = solver.solve()
+        self.assertFalse(analysis.exhaustive)
+        self.assertTrue(analysis.pure or analysis.mixed)
+        for _ in range(3):
+            i, j = rng.integers(40, size=2)
+            solver.set_cell(i, j, *rng.normal(size=2))
+            a, b = solver.row_payoffs, solver.col_payoffs
+            analysis = solver.solve()
+            self.assertTrue(analysis.pure or analysis.mixed)
+            for eq in analysis.pure + analysis.mixed:
+                self.assertTrue(is_equilibrium(a, b, eq.row, eq.col))
+
+    def test_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            EquilibriumSolver(np.zeros((2, 3)), np.zeros((3, 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Testes do histórico colunar e do log binário (historico.py).
+#
+# Uso: python -m pytest test_historico.py   (ou python -m unittest test_historico)
+
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+from historico import RECORD, RoundHistory, load_log
+from regras import CONFESSAR, NEGAR
+
+
+def _round(history, round_number, cap_rep, gar_rep, cap_code, gar_code, cap_total=0, gar_total=0):
+    history.append(round_number, cap_rep, gar_rep, cap_code, gar_code, 3, 3, cap_total, gar_total)
+
+
+class RoundHistoryTest(unittest.TestCase):
+
+    def test_rows_match_appended_rounds(self):
+        history = RoundHistory()
+        _round(history, 1, "Ana", "Bia", CONFESSAR, NEGAR, 1, 10)
+        _round(history, 2, "Ana", "Caio", NEGAR, NEGAR, 3, 12)
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history[-1]["gar_rep"], "Caio")
+        self.assertEqual(history[0]["cap_choice"], "Confessar")
+        self.assertEqual([row["round"] for row in history[0:2]], [1, 2])
+        self.assertEqual(history.names, ["Ana", "Bia", "Caio"])
+
+    def test_extend_match_keeps_rounds_in_own_session(self):
+        history = RoundHistory()
+        _round(history, 1, "Ana", "Bia", CONFESSAR, CONFESSAR)
+        history.extend_match([NEGAR, CONFESSAR], [NEGAR, NEGAR], "Cap", "Gar")
+        self.assertEqual(len(history), 3)
+        self.assertEqual(list(history.columns["session"]), [0, 1, 1])
+        self.assertEqual((history[-1]["cap_score_total"], history[-1]["gar_score_total"]), (3, 12))
+
+    def test_export_csv_writes_every_round_in_memory(self):
+        history = RoundHistory()
+        _round(history, 1, "Ana", "Bia", CONFESSAR, NEGAR)
+        history.extend_match([NEGAR], [NEGAR])
+        output = io.StringIO()
+        history.export_csv(output)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual([row["cap_choice"] for row in rows], ["Confessar", "Negar"])
+
+
+class RoundLogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "historico.log")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_log_round_trip(self):
+        history = RoundHistory(self.path)
+        _round(history, 1, "Ana", "Bia", CONFESSAR, NEGAR, 1, 10)
+        history.clear()
+        _round(history, 1, "Caio", "Bia", NEGAR, NEGAR, 2, 2)
+        _round(history, 2, "Caio", "Dora", CONFESSAR, CONFESSAR, 5, 5)
+        history.close()
+
+        records, names = load_log(self.path)
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records["session"].tolist(), [0, 1, 1])
+        self.assertEqual(records["cap_total"].tolist(), [1, 2, 5])
+        self.assertEqual([names[i] for i in records["cap_rep"]], ["Ana", "Caio", "Caio"])
+        self.assertEqual([names[i] for i in records["gar_rep"]], ["Bia", "Bia", "Dora"])
+
+        # Reabrir continua a numeração de sessões e descarta um registro incompleto
+        with open(self.path, "ab") as handle:
+            handle.write(b"\x00" * (RECORD.size // 2))
+        history = RoundHistory(self.path)
+        self.assertEqual(history.session, 2)
+        _round(history, 1, "Ana", "Eva", NEGAR, CONFESSAR)
+        history.close()
+        records, names = load_log(self.path)
+        self.assertEqual(records["session"].tolist(), [0, 1, 1, 2])
+        self.assertEqual((names[records["cap_rep"][-1]], names[records["gar_rep"][-1]]), ("Ana", "Eva"))
+
+    def test_open_log_keeps_names_of_rounds_in_memory(self):
+        log = RoundHistory(self.path)
+        _round(log, 1, "Zed", "Yan", CONFESSAR, CONFESSAR)
+        log.close()
+
+        history = RoundHistory()
+        _round(history, 1, "Ana", "Bia", NEGAR, NEGAR)
+        history.open_log(self.path)
+        self.assertEqual((history[0]["cap_rep"], history[0]["gar_rep"]), ("Ana", "Bia"))
+
+        _round(history, 2, "Ana", "Zed", CONFESSAR, NEGAR)
+        history.close()
+        self.assertEqual([(row["cap_rep"], row["gar_rep"]) for row in history], [("Ana", "Bia"), ("Ana", "Zed")])
+        records, names = load_log(self.path)
+        self.assertEqual([(names[cap], names[gar]) for cap, gar in zip(records["cap_rep"], records["gar_rep"])],
+                         [("Zed", "Yan"), ("Ana", "Zed")])
+
+    def test_rejects_foreign_file(self):
+        with open(self.path, "wb") as handle:
+            handle.write(b"nao e um log")
+        with self.assertRaises(ValueError):
+            RoundHistory(self.path)
+        with self.assertRaises(ValueError):
+            load_log(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# Testes dos jogos em forma normal (jogos.py): validação das ações e
+# concordância entre as representações densa, esparsa e funcional.
+#
+# Uso: python -m pytest test_jogos.py   (ou python -m unittest test_jogos)
+
+import itertools
+import unittest
+
+import numpy as np
+
+from jogos import (DenseGame, FunctionalGame, SparseGame, conditional_cooperator, constant_policy,
+                   play_repeated, prisoners_dilemma, public_goods)
+from regras import CONFESSAR, NEGAR, PAYOFF
+
+N_ACTIONS = (2, 3, 4)
+
+
+def _three_ways(tensor):
+    """O mesmo jogo nas três representações, a partir do tensor (jogadores, a_1, ..., a_N)."""
+    n_actions = tensor.shape[1:]
+    dense = DenseGame(tensor)
+    entries = {profile: tensor[(slice(None),) + profile] for profile in itertools.product(*map(range, n_actions))}
+    sparse = SparseGame(n_actions, entries)
+    functional = FunctionalGame(n_actions, lambda profiles: tensor[(slice(None),) + tuple(profiles.T)].T)
+    return dense, sparse, functional
+
+
+def _all_profiles(n_actions):
+    return np.array(list(itertools.product(*map(range, n_actions))), dtype=np.intp)
+
+
+class RepresentationsTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.tensor = rng.normal(size=(len(N_ACTIONS),) + N_ACTIONS)
+        self.games = _three_ways(self.tensor)
+
+    def test_representations_agree(self):
+        profiles = _all_profiles(N_ACTIONS)
+        expected = np.array([self.tensor[(slice(None),) + tuple(p)] for p in profiles])
+        for game in self.games:
+            with self.subTest(game=type(game).__name__):
+                np.testing.assert_allclose(game.payoffs(profiles), expected)
+                # Lote embaralhado e perfil único
+                order = np.random.default_rng(1).permutation(len(profiles))
+                np.testing.assert_allclose(game.payoffs(profiles[order]), expected[order])
+                np.testing.assert_allclose(game.payoffs(profiles[7]), expected[7:8])
+
+    def test_sparse_default_for_missing_profiles(self):
+        game = SparseGame(N_ACTIONS, {(1, 2, 3): (1.0, 2.0, 3.0)}, default=-1.0)
+        result = game.payoffs([[1, 2, 3], [0, 0, 0], [1, 2, 2]])
+        np.testing.assert_array_equal(result, [[1, 2, 3], [-1, -1, -1], [-1, -1, -1]])
+        empty = SparseGame(N_ACTIONS, {}, default=4.0)
+        np.testing.assert_array_equal(empty.payoffs([0, 1, 2]), [[4, 4, 4]])
+
+    def test_action_out_of_range(self):
+        for game in self.games:
+            for profile in ([2, 0, 0], [0, 3, 0], [0, 0, 4], [0, -1, 0]):
+                with self.subTest(game=type(game).__name__, profile=profile):
+                    with self.assertRaisesRegex(ValueError, "inválida para o jogador"):
+                        game.payoffs([[0, 0, 0], profile])
+            with self.assertRaises(ValueError):
+                game.payoffs([[0, 0]])
+
+    def test_dense_tensor_shape(self):
+        with self.assertRaises(ValueError):
+            DenseGame(np.zeros((2, 2, 2, 2)))
+
+
+class PresetGamesTest(unittest.TestCase):
+
+    def test_prisoners_dilemma_matches_rules(self):
+        game = prisoners_dilemma()
+        for cap, gar in itertools.product((CONFESSAR, NEGAR), repeat=2):
+            np.testing.assert_array_equal(game.payoffs([cap, gar]), [PAYOFF[cap][gar]])
+            np.testing.assert_array_equal(game.utilities([cap, gar]), [[-v for v in PAYOFF[cap][gar]]])
+
+    def test_public_goods(self):
+        game = public_goods(4, multiplier=2.0)
+        # Todos contribuem: cada um recebe 2 * 4 / 4 = 2
+        np.testing.assert_allclose(game.payoffs([1, 1, 1, 1]), [[2, 2, 2, 2]])
+        # Só o primeiro contribui: perde a dotação e todos ganham 0,5
+        np.testing.assert_allclose(game.payoffs([1, 0, 0, 0]), [[0.5, 1.5, 1.5, 1.5]])
+        with self.assertRaises(ValueError):
+            game.payoffs([2, 0, 0, 0])
+
+    def test_play_repeated(self):
+        game = public_goods(5, multiplier=2.0)
+        totals, last = play_repeated(game, constant_policy(game, 3, 0), 10, rng=0)
+        np.testing.assert_allclose(totals, np.full((3, 5), 10.0))
+        # Cooperadores condicionais começam cooperando e nunca deixam de cooperar
+        totals, last = play_repeated(game, conditional_cooperator(game, 3), 10, rng=0)
+        np.testing.assert_array_equal(last, np.ones((3, 5)))
+        np.testing.assert_allclose(totals, np.full((3, 5), 20.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# Testes dos relógios e do ScriptedDriver (relogio.py) com o Game de dilema.py,
+# sem janela: o relógio virtual só anda quando o roteiro manda.
+#
+# Uso: python -m pytest test_relogio.py   (ou python -m unittest test_relogio)
+
+import unittest
+
+from dilema import Game, GameState
+from regras import DEFAULT_CHOICE, penalties
+from relogio import MonotonicClock, ScriptedDriver, VirtualClock, tournament_script
+
+
+class VirtualClockTest(unittest.TestCase):
+
+    def test_advances_only_when_told(self):
+        clock = VirtualClock(5)
+        self.assertEqual(clock.now(), 5)
+        self.assertEqual(clock.advance(2.5), 7.5)
+        self.assertEqual(clock.now(), 7.5)
+        with self.assertRaises(ValueError):
+            clock.advance(-1)
+
+    def test_driver_requires_virtual_clock(self):
+        with self.assertRaises(TypeError):
+            ScriptedDriver(Game(clock=MonotonicClock()))
+
+
+class ScriptedDriverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.game = Game(clock=self.clock)
+        self.driver = ScriptedDriver(self.game)
+
+    def test_round_resolves_when_both_choose(self):
+        self.driver.play([("start", "Ana", "Bia"), ("wait", 1), ("choose", "cap", "Negar"),
+                          ("choose", "gar", "Confessar")])
+        self.assertEqual(self.game.current_state, GameState.RESULT)
+        self.assertEqual((self.game.caprichoso_score, self.game.garantido_score), penalties("Negar", "Confessar"))
+        self.assertEqual(self.game.history[-1]["cap_rep"], "Ana")
+
+    def test_timeout_fills_default_choice(self):
+        round_time = self.game.round_time
+        self.driver.play([("start", "Ana", "Bia"), ("choose", "cap", "Confessar"), ("wait", round_time - 0.5)])
+        self.assertEqual(self.game.current_state, GameState.CHOOSING)
+        self.assertAlmostEqual(self.game.elapsed(), round_time - 0.5)
+
+        self.driver.step(("wait", 0.5))
+        self.assertEqual(self.game.current_state, GameState.RESULT)
+        self.assertEqual((self.game.cap_choice, self.game.gar_choice), ("Confessar", DEFAULT_CHOICE))
+
+    def test_both_time_out(self):
+        self.driver.play([("start", "", ""), ("wait", self.game.round_time)])
+        self.assertEqual((self.game.cap_choice, self.game.gar_choice), (DEFAULT_CHOICE, DEFAULT_CHOICE))
+
+    def test_scripted_tournament_is_reproducible(self):
+        script = tournament_script(rounds=self.game.max_rounds, round_time=self.game.round_time, seed=3)
+        self.assertEqual(script, tournament_script(rounds=self.game.max_rounds, round_time=self.game.round_time,
+                                                   seed=3))
+        self.driver.play(script)
+        self.assertEqual(self.game.current_state, GameState.FINAL_RESULT)
+        self.assertEqual(len(self.game.history), self.game.max_rounds)
+
+        other = Game(clock=VirtualClock())
+        ScriptedDriver(other).play(script)
+        self.assertEqual(list(other.history), list(self.game.history))
+        self.assertEqual((other.caprichoso_score, other.garantido_score),
+                         (self.game.caprichoso_score, self.game.garantido_score))
+
+        self.driver.step(("reset",))
+        self.assertEqual((self.game.current_state, len(self.game.history)), (GameState.REPRESENTATIVE, 0))
+
+    def test_invalid_actions(self):
+        self.driver.step(("start", "Ana", "Bia"))
+        with self.assertRaises(ValueError):
+            self.game.choose("cap", "Talvez")
+        with self.assertRaises(ValueError):
+            self.game.choose("juiz", "Negar")
+        with self.assertRaises(ValueError):
+            self.driver.step(("pular",))
+        self.assertEqual((self.game.cap_choice, self.game.gar_choice), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
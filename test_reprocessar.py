@@ -0,0 +1,93 @@
+# Testes do reprocessamento de torneios gravados (reprocessar.py), com
+# arquivos CSV (como os salvos pelo jogo) e JSONL.
+#
+# Uso: python -m pytest test_reprocessar.py   (ou python -m unittest test_reprocessar)
+
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from historico import RoundHistory
+from regras import ACTIONS, CONFESSAR, NEGAR, penalties
+from reprocessar import find_files, main, rescore, score_file
+
+# (cap_rep, gar_rep, cap_choice, gar_choice) de cada rodada
+ROUNDS = [
+    ("Ana", "Bia", "Negar", "Negar"),
+    ("Ana", "Bia", "Confessar", "Negar"),
+    ("Caio", "Bia", "Confessar", "Confessar"),
+]
+
+
+def _write_csv(path, rounds):
+    """CSV no formato de Game.finish_tournament (RoundHistory.export_csv)."""
+    history = RoundHistory()
+    cap_total = gar_total = 0
+    for number, (cap_rep, gar_rep, cap_choice, gar_choice) in enumerate(rounds, start=1):
+        cap_penalty, gar_penalty = penalties(cap_choice, gar_choice)
+        cap_total += cap_penalty
+        gar_total += gar_penalty
+        history.append(number, cap_rep, gar_rep, ACTIONS.index(cap_choice), ACTIONS.index(gar_choice),
+                       cap_penalty, gar_penalty, cap_total, gar_total)
+    history.export_csv(path)
+
+
+class RescoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.directory.name, "sessao.csv")
+        _write_csv(self.csv_path, ROUNDS)
+        # JSONL com duas sessões e escolhas por código
+        self.jsonl_path = os.path.join(self.directory.name, "lote.jsonl")
+        with open(self.jsonl_path, "w", encoding="utf-8") as handle:
+            for session, cap, gar in ((7, CONFESSAR, NEGAR), (7, CONFESSAR, NEGAR), (8, NEGAR, NEGAR)):
+                handle.write(json.dumps({"session": session, "round": 1, "cap_rep": "Dora", "gar_rep": "Eva",
+                                         "cap_choice": cap, "gar_choice": gar}) + "\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_score_csv(self):
+        sessions, reps = score_file(self.csv_path, chunk_size=2)
+        self.assertEqual(len(sessions), 1)
+        summary = sessions[0]
+        self.assertEqual((summary["rounds"], summary["cap_total"], summary["gar_total"]), (3, 6, 15))
+        self.assertEqual(summary["winner"], "Caprichoso")
+        self.assertEqual((summary["cap_cooperation"], summary["gar_cooperation"]), (0.3333, 0.6667))
+        self.assertEqual(reps[("cap", "Ana")], [2, 1, 3])
+        self.assertEqual(reps[("gar", "Bia")], [3, 2, 15])
+
+    def test_score_jsonl_sessions(self):
+        sessions, _ = score_file(self.jsonl_path)
+        self.assertEqual([(s["session"], s["cap_total"], s["gar_total"]) for s in sessions], [(7, 2, 20), (8, 2, 2)])
+        self.assertEqual([s["winner"] for s in sessions], ["Caprichoso", "Empate"])
+
+    def test_rescore_directory(self):
+        output, reps_output = io.StringIO(), io.StringIO()
+        count = rescore([self.directory.name], output, reps_output, workers=1)
+        self.assertEqual(count, 3)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual([row["file"] for row in rows], [self.jsonl_path, self.jsonl_path, self.csv_path])
+        reps = {(row["team"], row["representative"]): row for row in csv.DictReader(io.StringIO(reps_output.getvalue()))}
+        self.assertEqual((reps[("gar", "Eva")]["rounds"], reps[("gar", "Eva")]["years"]), ("3", "22"))
+
+    def test_explicit_unsupported_file_is_a_usage_error(self):
+        path = os.path.join(self.directory.name, "notas.txt")
+        open(path, "w").close()
+        with self.assertRaises(ValueError):
+            list(find_files([self.csv_path, path]))
+        with self.assertRaises(ValueError):
+            list(find_files([os.path.join(self.directory.name, "falta.csv")]))
+        # O diretório ignora o .txt
+        self.assertEqual(list(find_files([self.directory.name])), [self.jsonl_path, self.csv_path])
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main([path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# Testes do servidor em rede: servidor e clientes reais em localhost, numa
+# porta livre escolhida pelo sistema.
+#
+# Uso: python -m pytest test_servidor.py   (ou python -m unittest test_servidor)
+
+import asyncio
+import unittest
+
+from dilema import GameState
+from servidor import PlayClient, PlayServer
+
+TIMEOUT = 5
+
+
+class PlayServerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = PlayServer(max_rounds=2, round_time=0.2)
+        self.host, self.port = await self.server.start("127.0.0.1", 0)
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            if not client.writer.is_closing():
+                await client.close()
+        await self.server.close()
+
+    async def connect(self, team=None, name="", match="sala"):
+        client = PlayClient()
+        await client.connect(self.host, self.port)
+        self.clients.append(client)
+        if team is not None:
+            await client.join(match, team, name)
+        return client
+
+    async def wait_for(self, client, predicate):
+        return await asyncio.wait_for(client.wait_for(predicate), TIMEOUT)
+
+    async def play_round(self, cap, gar, cap_choice="Negar", gar_choice="Confessar"):
+        await cap.choose(cap_choice)
+        await gar.choose(gar_choice)
+        return await self.wait_for(cap, lambda m: m.get("state") == GameState.RESULT)
+
+    async def test_tournament_reuses_join_names(self):
+        cap = await self.connect("cap", "Ana")
+        gar = await self.connect("gar", "Bia")
+        state = await self.wait_for(cap, lambda m: m.get("state") == GameState.CHOOSING)
+        self.assertEqual((state["cap_representative"], state["gar_representative"]), ("Ana", "Bia"))
+
+        result = await self.play_round(cap, gar)
+        self.assertEqual((result["cap_choice"], result["gar_choice"]), ("Negar", "Confessar"))
+        self.assertEqual((result["cap_score"], result["gar_score"]), (10, 1))
+
+        await cap.next_round()
+        state = await self.wait_for(gar, lambda m: m.get("round") == 2)
+        self.assertEqual(state["state"], GameState.CHOOSING)
+        self.assertEqual(state["cap_representative"], "Ana")
+
+        await cap.next_round()  # Ainda não: a segunda rodada está em andamento
+        error = await self.wait_for(cap, lambda m: m["type"] == "error")
+        self.assertIn("não terminou", error["message"])
+
+        await self.play_round(cap, gar, "Confessar", "Confessar")
+        await gar.next_round()
+        final = await self.wait_for(cap, lambda m: m.get("state") == GameState.FINAL_RESULT)
+        self.assertEqual((final["cap_score"], final["gar_score"]), (13, 4))
+        self.assertEqual(final["winner"], "Garantido")
+
+    async def test_timeout_fills_default_choice(self):
+        cap = await self.connect("cap", "Ana")
+        await self.connect("gar", "Bia")
+        await cap.choose("Confessar")
+        result = await self.wait_for(cap, lambda m: m.get("state") == GameState.RESULT)
+        self.assertEqual((result["cap_choice"], result["gar_choice"]), ("Confessar", "Negar"))
+
+    async def test_invalid_messages_get_error_reply(self):
+        client = await self.connect()
+        for line in (b"[1, 2]\n", b"nao e json\n", b"x" * 70000 + b"\n", b'{"type": "choose"}\n'):
+            client.writer.write(line)
+            error = await self.wait_for(client, lambda m: True)
+            self.assertEqual(error["type"], "error")
+        await client.join("sala", "cap", "Ana")
+        state = await self.wait_for(client, lambda m: m["type"] == "state")
+        self.assertEqual(state["connected"], ["cap"])
+
+    async def test_match_removed_when_both_teams_leave(self):
+        cap = await self.connect("cap", "Ana")
+        gar = await self.connect("gar", "Bia")
+        await self.wait_for(gar, lambda m: m.get("connected") == ["cap", "gar"])
+        await cap.close()
+        await self.wait_for(gar, lambda m: m.get("connected") == ["gar"])
+        self.assertIn("sala", self.server.matches)
+        await gar.close()
+        for _ in range(100):
+            if "sala" not in self.server.matches:
+                break
+            await asyncio.sleep(0.01)
+        self.assertNotIn("sala", self.server.matches)
+
+    async def test_rematch_keeps_connected_peer(self):
+        cap = await self.connect("cap", "Ana")
+        gar = await self.connect("gar", "Bia")
+        await self.play_round(cap, gar)
+        await cap.next_round()
+        await self.wait_for(cap, lambda m: m.get("round") == 2)
+        await self.play_round(cap, gar)
+        await cap.next_round()
+        await self.wait_for(gar, lambda m: m.get("state") == GameState.FINAL_RESULT)
+        match = self.server.matches["sala"]
+
+        await gar.close()
+        gar = await self.connect("gar", "Carla")
+        state = await self.wait_for(cap, lambda m: m.get("state") == GameState.CHOOSING)
+        self.assertIs(self.server.matches["sala"], match)
+        self.assertEqual((state["round"], state["cap_score"], state["gar_score"]), (1, 0, 0))
+        self.assertEqual((state["cap_representative"], state["gar_representative"]), ("Ana", "Carla"))
+
+        result = await self.play_round(cap, gar, "Confessar", "Negar")
+        self.assertEqual((result["cap_score"], result["gar_score"]), (1, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# --- Torneio Round-Robin de Estratégias (estilo Axelrod) ---
+# Cada par de estratégias joga `repetitions` partidas de `max_rounds` rodadas,
+# com penas calculadas pela mesma matriz de Game.calculate_result (regras.py).
+# Os pares são divididos em blocos e distribuídos num ProcessPoolExecutor.
+#
+# Uso: python torneio.py --rounds 20 --repetitions 1000 --workers 4
+#      python torneio.py --strategy "Generoso:0,1,0.1,1,0"
+
+import argparse
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from motor import STRATEGIES, play_batch, register_strategy
+
+
+def _play_chunk(chunk):
+    """Joga um bloco de pares. Executado dentro de um processo de trabalho."""
+    results = []
+    for i, j, cap, gar, max_rounds, repetitions, seed in chunk:
+        batch = play_batch(cap, gar, max_rounds, repetitions, np.random.default_rng(seed))
+        results.append((i, j, int(batch.cap_total.sum()), int(batch.gar_total.sum())))
+    return results
+
+
+def _chunks(tasks, chunk_size):
+    """Divide a lista de tarefas em blocos de tamanho chunk_size."""
+    for start in range(0, len(tasks), chunk_size):
+        yield tasks[start:start + chunk_size]
+
+
+def round_robin(strategies=None, max_rounds=20, repetitions=100, seed=None,
+                workers=None, chunk_size=None):
+    """Joga todos os pares de estratégias (incluindo cada uma contra si mesma).
+
+    strategies: dicionário nome -> tupla de memória um (padrão: motor.STRATEGIES).
+    workers=1 joga tudo no processo atual, sem criar o pool.
+    Retorna o ranking como lista de (posição, nome, anos totais, anos por partida),
+    do menor para o maior tempo de prisão.
+    """
+    strategies = dict(STRATEGIES if strategies is None else strategies)
+    names = list(strategies)
+    pairs = list(itertools.combinations_with_replacement(range(len(names)), 2))
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+    tasks = [
+        (i, j, strategies[names[i]], strategies[names[j]], max_rounds, repetitions, pair_seed)
+        for (i, j), pair_seed in zip(pairs, seeds)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # Alguns blocos por processo equilibram a carga sem excesso de comunicação
+        chunk_size = max(1, math.ceil(len(tasks) / (workers * 4)))
+    chunks = list(_chunks(tasks, chunk_size))
+
+    if workers == 1:
+        chunk_results = map(_play_chunk, chunks)
+        totals = _accumulate(chunk_results, len(names))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            totals = _accumulate(executor.map(_play_chunk, chunks), len(names))
+
+    # Cada estratégia joga contra todas as outras e contra si mesma
+    matches = len(names) * repetitions
+    order = sorted(range(len(names)), key=lambda k: (totals[k], names[k]))
+    return [
+        (position, names[k], totals[k], totals[k] / matches)
+        for position, k in enumerate(order, start=1)
+    ]
+
+
+def _accumulate(chunk_results, n_strategies):
+    """Soma os anos de prisão de cada estratégia a partir dos blocos jogados."""
+    totals = [0] * n_strategies
+    for results in chunk_results:
+        for i, j, cap_years, gar_years in results:
+            totals[i] += cap_years
+            if i != j:
+                totals[j] += gar_years
+    return totals
+
+
+def format_ranking(ranking):
+    """Formata o ranking como uma tabela de texto."""
+    width = max([len("Estratégia")] + [len(name) for _, name, _, _ in ranking])
+    lines = [f"{'#':>3}  {'Estratégia':<{width}}  {'Anos totais':>12}  {'Anos/partida':>12}"]
+    for position, name, total, per_match in ranking:
+        lines.append(f"{position:>3}  {name:<{width}}  {total:>12}  {per_match:>12.2f}")
+    return "\n".join(lines)
+
+
+def _parse_strategy(spec):
+    """Lê e registra uma estratégia no formato "Nome:primeira,cc,cn,nc,nn".
+
+    Erros viram ArgumentTypeError, que o argparse mostra como erro de uso.
+    """
+    name, _, probs = spec.rpartition(":")
+    try:
+        values = [float(p) for p in probs.split(",")]
+        if not name or len(values) != 5:
+            raise ValueError("use Nome:primeira,cc,cn,nc,nn")
+        register_strategy(name, *values)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"Estratégia inválida {spec!r}: {error}") from None
+    return name, values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Torneio round-robin de estratégias do dilema.")
+    parser.add_argument("--rounds", type=int, default=20, help="rodadas por partida")
+    parser.add_argument("--repetitions", type=int, default=100, help="partidas por par")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="pares por bloco")
+    parser.add_argument("--strategy", type=_parse_strategy, action="append", default=[],
+                        help='estratégia extra de memória um, ex.: "Generoso:0,1,0.1,1,0"')
+    args = parser.parse_args(argv)
+
+    ranking = round_robin(max_rounds=args.rounds, repetitions=args.repetitions, seed=args.seed,
+                          workers=args.workers, chunk_size=args.chunk_size)
+    print(format_ranking(ranking))
+
+
+if __name__ == "__main__":
+    main()